@@ -1,77 +1,138 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from ttkthemes import ThemedTk
-import json
 import os
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
+from datetime import datetime
+from autocomplete import AutocompleteIndex
+from columns import BULK_EXTEND_ROWS
+from core import (CAREER_OPTIONS, CITY_OPTIONS, COMPANY_SECTORS, COMPANY_STAGES, COMPANY_TYPES, JOB_TITLE_OPTIONS,
+                  RELATIONSHIP_TYPE_OPTIONS, US_STATES, ContactBook, is_lead)
+from exporter import BUSINESS_FIELDS, CONTACT_FIELDS, export_records, export_rows
+from importer import plan_import
+from jobs import Executor
+from profiling import TRACER, LoopLagMonitor
+from reminders import ReminderEngine
+from startup import StartupTimer
+from widgets import MappedRows, TableController, VirtualTreeview
 
 CONTACTS_FILE = "contacts.json"
+CONTACTS_DB = "contacts.db"
+# "json" keeps contacts.json + journal; "sqlite" uses contacts.db (see `python storage.py migrate`)
+STORAGE_BACKEND = os.environ.get("NETWORKING_RECORDER_BACKEND", "json")
+# Format new contacts.json snapshots are written in: "json", "jsonl" or "jsonl.gz" (any is read back)
+SNAPSHOT_FORMAT = os.environ.get("NETWORKING_RECORDER_FORMAT", "json")
+# Edits made within this many seconds of each other are written to disk together
+SAVE_WINDOW = float(os.environ.get("NETWORKING_RECORDER_SAVE_WINDOW", "0.5"))
+# Set NETWORKING_RECORDER_STARTUP_REPORT=1 to print startup timings to stderr
+STARTUP = StartupTimer(enabled=os.environ.get("NETWORKING_RECORDER_STARTUP_REPORT") == "1")
+# Set NETWORKING_RECORDER_TRACE=1 to record timings from startup on (see Diagnostics)
+TRACER.enabled = os.environ.get("NETWORKING_RECORDER_TRACE") == "1"
 
 class ContactManager:
+    # Task lists at least this long are sorted on a worker thread behind the overlay
+    BACKGROUND_RENDER_ROWS = 50000
+    # Imported contacts are added this many at a time, so the window keeps repainting; a batch
+    # this size rebuilds Data Search's bitmaps once while it is a large share of the book
+    IMPORT_BATCH = BULK_EXTEND_ROWS
+
     def __init__(self, root):
         self.root = root
         self.root.title("Contact Manager")
-        self.contacts = []
-        self.companies = []
+        self.startup = STARTUP
+        self.executor = Executor(root)
+        self.lag_monitor = LoopLagMonitor(root)
+        self.diagnostics_window = None
+        self._diagnostics_after_id = None
+        # All data and its logic lives in the book; this class is the Tk client over it
+        self.book = ContactBook.open(CONTACTS_DB if STORAGE_BACKEND == "sqlite" else CONTACTS_FILE,
+                                     STORAGE_BACKEND, SNAPSHOT_FORMAT, SAVE_WINDOW)
         self.filtered_contacts = []
-        self.selected_contact_index = None
-        self.selected_company_index = None
+        self.selected_contact_id = None
+        self.selected_company_id = None
         self.current_page = "dashboard"
+        # What each page last rendered from, and how long its last render took (ms)
+        self.page_keys = {}
+        self.page_render_times = {}
+        self.reminders = None
+        # Company id -> the name it contributes to the company autocomplete
+        self.company_option_names = {}
+        self._due_notifications_after_id = None
+        self._search_after_id = None
+        self._save_status_after_id = None
+        self._autocomplete_after_ids = {}
         
-        # Define relationship types and their follow-up rules
-        self.RELATIONSHIP_TYPES = {
-            "Passive Friendship": None,  # No reminders
-            "Lead": {
-                "stages": {
-                    "First Outreach": 0,  # Immediate
-                    "First Follow-up": 7,  # 7 days
-                    "Second Follow-up": 7,  # 7 days after previous
-                    "Third Follow-up": 7   # 7 days after previous (optional)
-                }
-            },
-            "Professional Relationship": {
-                "maintenance": 120,  # 120 days (4 months)
-                "recurring": True  # This will keep recurring every 4 months
-            }
+        # Data derived from the book last session stands in until the book is loaded
+        derived = self.book.derived
+        self.autocomplete = {
+            "company": AutocompleteIndex(derived["company_names"] if derived else []),
+            "job_title": AutocompleteIndex(JOB_TITLE_OPTIONS),
+            "career": AutocompleteIndex(CAREER_OPTIONS),
+            "relationship": AutocompleteIndex(RELATIONSHIP_TYPE_OPTIONS),
+            "state": AutocompleteIndex(US_STATES),
+            "city": AutocompleteIndex(CITY_OPTIONS),
         }
-        
-        self.JOB_TITLE_OPTIONS = [
-            "Intern", "Analyst", "Associate", "Senior Associate", "Vice President", "VP", "Director", "Senior Director", "Executive Director", "Managing Director", "MD", "Partner", "Principal", "CEO", "CFO", "COO", "CTO", "CIO", "CMO", "Chairman", "President", "Owner", "Founder", "Co-Founder", "Boss", "Manager", "Team Lead", "Head of", "Consultant", "Advisor", "Board Member", "Staff", "Engineer", "Developer", "Designer", "Product Manager", "Project Manager", "Business Development", "Sales", "Marketing", "Operations", "HR", "Legal", "Other"
-        ]
-        self.CAREER_OPTIONS = [
-            "Entrepreneur", "Investment Banker", "Private Equity", "Venture Capital", "Startup Founder", "Corporate Executive", "Family Office", "Hedge Fund Manager", "Consultant", "Management Consultant", "Strategy Consultant", "Accountant", "Auditor", "Lawyer", "Attorney", "Engineer", "Software Engineer", "Product Manager", "Project Manager", "Sales", "Marketing", "Operations", "Human Resources", "Recruiter", "Real Estate", "Insurance", "Healthcare", "Doctor", "Nurse", "Pharmacist", "Scientist", "Researcher", "Professor", "Teacher", "Student", "Government", "Nonprofit", "Philanthropy", "Artist", "Musician", "Writer", "Designer", "Other"
-        ]
-        self.US_STATES = [
-            "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming", "International", "Global"
-        ]
-        self.COMPANY_STAGES = [
-            "Pre-Seed", "Seed", "Series A", "Series B", "Series C", "Series D", "Public", "Private"
-        ]
-        self.COMPANY_TYPES = [
-            "Investment Bank", "Private Equity", "Venture Capital", "Startup", "Corporate", "Family Office", "Hedge Fund", "Real Estate", "Other"
-        ]
-        self.COMPANY_SECTORS = [
-            "Technology", "Healthcare", "Finance", "Real Estate", "Consumer", "Energy", "Industrial", "Telecom", "Education", "Other"
-        ]
-        self.CITY_OPTIONS = [
-            "New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose", "Austin", "Jacksonville", "Fort Worth", "Columbus", "Charlotte", "San Francisco", "Indianapolis", "Seattle", "Denver", "Washington", "Boston", "El Paso", "Nashville", "Detroit", "Oklahoma City", "Portland", "Las Vegas", "Memphis", "Louisville", "Baltimore", "Milwaukee", "Albuquerque", "Tucson", "Fresno", "Mesa", "Sacramento", "Atlanta", "Kansas City", "Colorado Springs", "Miami", "Raleigh", "Omaha", "Long Beach", "Virginia Beach", "Oakland", "Minneapolis", "Tulsa", "Arlington", "Tampa", "New Orleans", "Wichita", "Cleveland", "Bakersfield", "Aurora", "Anaheim", "Honolulu", "Santa Ana", "Riverside", "Corpus Christi", "Lexington", "Stockton", "Henderson", "Saint Paul", "St. Louis", "Cincinnati", "Pittsburgh", "Greensboro", "Anchorage", "Plano", "Lincoln", "Orlando", "Irvine", "Newark", "Toledo", "Durham", "Chula Vista", "Fort Wayne", "Jersey City", "St. Petersburg", "Laredo", "Madison", "Chandler", "Buffalo", "Lubbock", "Scottsdale", "Reno", "Glendale", "Gilbert", "Winston–Salem", "North Las Vegas", "Norfolk", "Chesapeake", "Garland", "Irving", "Hialeah", "Fremont", "Boise", "Richmond"
-        ]
-        
-        # Define relationship options
-        self.RELATIONSHIP_TYPE_OPTIONS = [
-            "Lead",
-            "Passive Friendship",
-            "Lead - First Outreach",
-            "Lead - First Follow-up",
-            "Lead - Second Follow-up",
-            "Lead - Third Follow-up",
-            "Professional Relationship",
-            "Dead Lead"
-        ]
-        
-        self.load_data()
         self.setup_ui()
-        self.refresh_contacts()
+        if derived:
+            self._update_tasks_badge(derived["overdue_count"])
+        self.book.changes.subscribe(self._on_data_changed)
+        self.due_notifications = queue.Queue()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.startup.mark("window built")
+        self.root.after_idle(self.startup.mark, "window visible")
+        if TRACER.enabled:
+            self.lag_monitor.start()
+        self.load_data()
+
+    @TRACER.traced("data_changed")
+    def _on_data_changed(self, change):
+        # Pages that have not been built yet read the current data when they are
+        if change.kind == "contacts":
+            if "contacts" in self.pages:
+                self.contacts_table.apply(change)
+            if "companies" in self.pages:
+                # Company rows show lead/professional counts, so redraw the visible ones
+                self.companies_tree.refresh_visible()
+        else:
+            if "companies" in self.pages:
+                self.companies_table.apply(change)
+            self._update_company_options(change)
+
+    def _update_company_options(self, change):
+        # Only the names that changed are re-indexed
+        options = self.autocomplete["company"]
+        for company in change.inserted + change.updated:
+            old = self.company_option_names.get(company["id"])
+            new = self.company_option_names[company["id"]] = company.get("name")
+            if new != old:
+                if old:
+                    options.remove(old)
+                if new:
+                    options.add(new)
+        for company_id in change.deleted:
+            old = self.company_option_names.pop(company_id, None)
+            if old:
+                options.remove(old)
+
+    def on_close(self):
+        if self.reminders is not None:
+            self.reminders.stop()
+        if self._due_notifications_after_id is not None:
+            self.root.after_cancel(self._due_notifications_after_id)
+        self.lag_monitor.stop()
+        # Lets a job that is running (e.g. an export) finish before the store is closed
+        self.executor.shutdown()
+        if not self.book.close():
+            messagebox.showerror("Error", f"Some changes could not be saved: {self.book.writer.error}")
+        self.root.destroy()
+
+    def _still_loading(self):
+        # Edits wait for the whole book (and its journal) to be loaded
+        if not self.book.loaded:
+            messagebox.showinfo("Loading", "Contacts are still loading. Please try again in a moment.")
+        return not self.book.loaded
 
     def setup_ui(self):
         # Create main container
@@ -81,7 +142,9 @@ class ContactManager:
         # Loading overlay
         self.loading_overlay = tk.Frame(self.root, bg="white")
         self.loading_label = tk.Label(self.loading_overlay, text="Loading...", font=("Helvetica", 18, "bold"), bg="white", fg="black")
-        self.loading_label.pack(expand=True)
+        self.loading_label.pack(expand=True, side=tk.TOP, anchor=tk.S)
+        self.loading_progress = ttk.Progressbar(self.loading_overlay, mode="indeterminate", length=200)
+        self.loading_progress.pack(expand=True, side=tk.TOP, anchor=tk.N, pady=10)
         self.loading_overlay.place_forget()
         
         # Create navigation buttons
@@ -101,20 +164,26 @@ class ContactManager:
         self.nav_buttons["tasks"].pack(side=tk.LEFT, padx=5)
         self.nav_buttons["analytics"] = ttk.Button(nav_frame, text="Data Search", command=lambda: self.show_page("analytics"), style="InactiveNav.TButton")
         self.nav_buttons["analytics"].pack(side=tk.LEFT, padx=5)
+        ttk.Button(nav_frame, text="Diagnostics", command=self.open_diagnostics).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(nav_frame, text="Save Now", command=self.flush_writes).pack(side=tk.RIGHT, padx=5)
+        self.save_status_label = ttk.Label(nav_frame, text="", font=("Helvetica", 9))
+        self.save_status_label.pack(side=tk.RIGHT, padx=5)
         
-        # Create pages
-        self.setup_dashboard_ui()
-        self.setup_contacts_ui()
-        self.setup_companies_ui()
-        self.setup_tasks_ui()
-        self.analytics_frame = ttk.Frame(self.root)
-        self.setup_analytics_ui()
+        # Only the dashboard is built up front; the other pages are built on first visit
+        self.page_builders = {
+            "dashboard": self.setup_dashboard_ui,
+            "contacts": self.setup_contacts_ui,
+            "companies": self.setup_companies_ui,
+            "tasks": self.setup_tasks_ui,
+            "analytics": self.setup_analytics_ui,
+        }
+        self.pages = {}
+        self.root.bind_all('<Return>', self._handle_enter_key)
+        self.root.bind_all('<Control-s>', lambda event: self.flush_writes())
+        self.fix_treeview_style()
         
         # Show initial page
-        self.show_page("dashboard")
-        
-        # Fix treeview style after all frames are created
-        self.fix_treeview_style()
+        self._show_page("dashboard")
 
     def setup_dashboard_ui(self):
         self.dashboard_frame = ttk.Frame(self.root)
@@ -123,49 +192,74 @@ class ContactManager:
         # Placeholder for dashboard content
         summary_label = ttk.Label(self.dashboard_frame, text="Welcome to your Analytics Dashboard!", font=("Helvetica", 12))
         summary_label.pack(pady=10)
+        self.render_times_label = ttk.Label(self.dashboard_frame, text="", font=("Helvetica", 10))
+        self.render_times_label.pack(pady=10)
 
-    def show_loading(self):
+    def show_loading(self, message="Loading..."):
+        self.loading_label.config(text=message)
         self.loading_overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
         self.loading_overlay.lift()
+        self.loading_progress.start(10)
         self.root.update_idletasks()
 
     def hide_loading(self):
+        self.loading_progress.stop()
         self.loading_overlay.place_forget()
         self.root.update_idletasks()
 
     def show_page(self, page_name):
-        self.show_loading()
-        self.root.after(100, lambda: self._show_page(page_name))
+        self._show_page(page_name)
+
+    def _job_failed(self, action):
+        def error(exception):
+            self.hide_loading()
+            messagebox.showerror("Error", f"Could not {action}: {exception}")
+        return error
+
+    def _page_key(self, page_name):
+        """What a page's content depends on beyond the live-updated tables, or None."""
+        if page_name == "tasks":
+            # Rolling entries that came due bumps the version, so roll before reading it
+            self.book.overdue_count()
+            return self.book.follow_ups.version, datetime.now().date()
+        return None
 
+    def _page_rendered(self, page_name, started):
+        self.page_render_times[page_name] = (time.perf_counter() - started) * 1000
+
+    def _build_page(self, page_name):
+        if page_name not in self.pages:
+            self.page_builders[page_name]()
+            frame = getattr(self, f"{page_name}_frame")
+            if page_name != "dashboard":
+                frame.configure(style="White.TFrame")
+            self.pages[page_name] = frame
+        return self.pages[page_name]
+
+    @TRACER.traced("show_page")
     def _show_page(self, page_name):
+        started = time.perf_counter()
         # Hide all pages
-        if hasattr(self, 'dashboard_frame'):
-            self.dashboard_frame.pack_forget()
-        self.contacts_frame.pack_forget()
-        self.companies_frame.pack_forget()
-        self.tasks_frame.pack_forget()
-        if hasattr(self, 'analytics_frame'):
-            self.analytics_frame.pack_forget()
+        for frame in self.pages.values():
+            frame.pack_forget()
+        frame = self._build_page(page_name)
         # Update nav button styles
         for key, btn in self.nav_buttons.items():
             if key == page_name:
                 btn.config(style="ActiveNav.TButton")
             else:
                 btn.config(style="InactiveNav.TButton")
-        if page_name == "dashboard":
-            self.dashboard_frame.pack(fill=tk.BOTH, expand=True)
-        elif page_name == "contacts":
-            self.contacts_frame.pack(fill=tk.BOTH, expand=True)
-        elif page_name == "companies":
-            self.companies_frame.pack(fill=tk.BOTH, expand=True)
-            self.refresh_companies()  # Always refresh companies when showing the page
-        elif page_name == "tasks":
-            self.tasks_frame.pack(fill=tk.BOTH, expand=True)
-            self.refresh_tasks()
-        elif page_name == "analytics":
-            self.analytics_frame.pack(fill=tk.BOTH, expand=True)
+        frame.pack(fill=tk.BOTH, expand=True)
         self.current_page = page_name
-        self.hide_loading()
+        # Contacts and companies are kept current by their TableControllers; other pages
+        # re-render only when what they were rendered from has changed
+        if page_name == "tasks" and self.page_keys.get(page_name) != self._page_key(page_name):
+            self.refresh_tasks(lambda: self._page_rendered(page_name, started))
+            return
+        if page_name == "dashboard":
+            self.render_times_label.config(text="Last page render: " + ", ".join(
+                f"{name} {ms:.1f} ms" for name, ms in sorted(self.page_render_times.items())))
+        self._page_rendered(page_name, started)
 
     def setup_tasks_ui(self):
         self.tasks_frame = ttk.Frame(self.root)
@@ -180,14 +274,20 @@ class ContactManager:
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         columns = ("Contact", "Type", "Due Date", "Days Left", "Status", "Notes")
-        self.tasks_tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=10)
+        self.tasks_tree = VirtualTreeview(table_frame, columns=columns, show="headings", height=10)
         
         for col in columns:
             self.tasks_tree.heading(col, text=col)
             self.tasks_tree.column(col, width=120)
         
+        yscroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.tasks_tree.yview)
+        self.tasks_tree.configure(yscrollcommand=yscroll.set)
+        yscroll.pack(fill=tk.Y, side=tk.RIGHT)
         self.tasks_tree.pack(fill=tk.BOTH, expand=True)
-        self.tasks_tree.bind("<ButtonRelease-1>", self.on_task_select)
+        self.tasks_tree.bind("<<TreeviewSelect>>", self.on_task_select)
+        self.tasks_tree.tag_configure("Overdue", background="#ffcccc", foreground="#000000")
+        self.tasks_tree.tag_configure("Upcoming", background="#fff2cc", foreground="#000000")
+        self.tasks_tree.tag_configure("Done", background="#ccffcc", foreground="#000000")
         
         # Mark as Done button
         self.mark_done_btn = ttk.Button(self.tasks_frame, text="Mark as Done", command=self.mark_task_done, state=tk.DISABLED)
@@ -201,36 +301,25 @@ class ContactManager:
         self.notification_label.pack(pady=2)
 
     def on_task_select(self, event):
-        selection = self.tasks_tree.selection()
-        if selection:
+        if self.tasks_tree.selected_index() is not None:
             self.mark_done_btn.config(state=tk.NORMAL)
         else:
             self.mark_done_btn.config(state=tk.DISABLED)
 
     def mark_task_done(self):
-        selection = self.tasks_tree.selection()
-        if not selection:
+        if self._still_loading():
             return
-        item = self.tasks_tree.item(selection[0])
-        contact_name = item['values'][0]
-        task_type = item['values'][1]
-        # Find the contact
-        for contact in self.contacts:
-            if contact.get("name") == contact_name:
-                break
-        else:
+        index = self.tasks_tree.selected_index()
+        if index is None:
+            return
+        entry = self.task_entries[index]
+        contact = self.book.contacts_by_id.get(entry.contact_id)
+        if contact is None:
             return
+        contact_name = contact.get("name", "")
+        task_type = entry.task_type
         # Lead follow-up workflow
-        if contact.get("relationship_type", "").startswith("Lead"):
-            stages = list(self.RELATIONSHIP_TYPES["Lead"]["stages"].keys())
-            # Determine the current stage from the relationship_type
-            for stage in stages:
-                if stage in contact.get("relationship_type", ""):
-                    current_stage = stage
-                    break
-            else:
-                current_stage = stages[0]
-            idx = stages.index(current_stage)
+        if is_lead(contact):
             response = messagebox.askyesnocancel(
                 "Follow-up Response",
                 f"Did you get a response from {contact_name}?",
@@ -238,103 +327,87 @@ class ContactManager:
             )
             if response is None:
                 return
-            elif response:
-                contact["relationship_type"] = "Professional Relationship"
-                contact.pop("lead_stage", None)
-                contact["last_contact"] = datetime.now().strftime("%Y-%m-%d")
+            contact = self.book.complete_task(contact["id"], response)
+            if contact["relationship_type"] == "Professional Relationship":
                 messagebox.showinfo("Status Updated", f"{contact_name} has been converted to a Professional Relationship.")
+            elif contact["relationship_type"] == "Dead Lead":
+                messagebox.showinfo("Status Updated", f"{contact_name} has been marked as a Dead Lead after no response.")
             else:
-                if idx + 1 < len(stages):
-                    next_stage = stages[idx + 1]
-                    contact["relationship_type"] = f"Lead - {next_stage}"
-                    contact["lead_stage"] = next_stage
-                    contact["last_contact"] = datetime.now().strftime("%Y-%m-%d")
-                    messagebox.showinfo("Status Updated", f"{contact_name} will be moved to {next_stage}.")
-                else:
-                    contact["relationship_type"] = "Dead Lead"
-                    contact.pop("lead_stage", None)
-                    contact["last_contact"] = datetime.now().strftime("%Y-%m-%d")
-                    messagebox.showinfo("Status Updated", f"{contact_name} has been marked as a Dead Lead after no response.")
-        self.save_data()
+                messagebox.showinfo("Status Updated", f"{contact_name} will be moved to {contact['lead_stage']}.")
+            self._update_save_status()
+        else:
+            self.book.complete_task(contact["id"])
         self.refresh_tasks()
-        self.refresh_contacts()
         self.mark_done_btn.config(state=tk.DISABLED)
         messagebox.showinfo("Task Completed", f"Marked {task_type} for {contact_name} as done.")
 
-    def refresh_tasks(self):
-        # Clear existing tasks
-        for item in self.tasks_tree.get_children():
-            self.tasks_tree.delete(item)
+    @TRACER.traced("refresh_tasks")
+    def refresh_tasks(self, done=None):
+        now = datetime.now()
+        key = self._page_key("tasks")
+        def compute():
+            # Entries come back earliest due first: Overdue (red), Upcoming (yellow), Done (green)
+            return self.book.tasks(now), self.book.overdue_count(now)
+        def render(result):
+            self._render_tasks(*result, now)
+            self.page_keys["tasks"] = key
+            if done is not None:
+                done()
+        # ordered() is cached until the version changes; only a fresh sort of a big book is slow
+        if len(self.book.follow_ups) < self.BACKGROUND_RENDER_ROWS or self.page_keys.get("tasks", (None,))[0] == key[0]:
+            # Anything still sorting on a worker is older than this
+            if self.executor.cancel("tasks"):
+                self.hide_loading()
+            render(compute())
+            return
+        self.show_loading("Updating tasks...")
+        def finish(result):
+            self.hide_loading()
+            render(result)
+        self.executor.submit("tasks", compute, finish, self._job_failed("update tasks"))
+
+    @TRACER.traced("render_tasks")
+    def _render_tasks(self, entries, overdue_count, now):
         self.notification_label.config(text="")
-        overdue_count = 0
-        tasks = []
-        for contact in self.contacts:
-            last_contact = contact.get("last_contact")
-            if not last_contact:
-                continue
-            relationship_type = contact.get("relationship_type", "Passive Friendship")
-            if relationship_type == "Passive Friendship":
-                continue
-            try:
-                last_contact_date = datetime.strptime(last_contact, "%Y-%m-%d")
-            except Exception:
-                continue
-            history = contact.get("history", [])
-            done_stages = [h.get("stage") for h in history]
-            # Treat any relationship_type that starts with 'Lead' as a lead
-            if relationship_type.startswith("Lead"):
-                stages = list(self.RELATIONSHIP_TYPES["Lead"]["stages"].keys())
-                # Determine the current stage from the relationship_type
-                for stage in stages:
-                    if stage in relationship_type:
-                        current_stage = stage
-                        break
-                else:
-                    current_stage = stages[0]  # Default to First Outreach
-                # Due date is always 7 days after last_contact for the current stage
-                due_date = last_contact_date + timedelta(days=7)
-                days_left = (due_date - datetime.now()).days
-                if due_date < datetime.now():
-                    status = "Overdue"
-                elif days_left <= 2:
-                    status = "Upcoming"
-                else:
-                    status = "Done"
-                tasks.append((status, days_left, contact["name"], current_stage, due_date.strftime("%Y-%m-%d"), status, f"{current_stage} for {contact['name']}"))
-                if status == "Overdue":
-                    overdue_count += 1
-            elif relationship_type == "Professional Relationship":
-                maintenance_interval = self.RELATIONSHIP_TYPES["Professional Relationship"]["maintenance"]
-                next_maintenance = last_contact_date
-                while next_maintenance <= datetime.now():
-                    next_maintenance += timedelta(days=maintenance_interval)
-                days_left = (next_maintenance - datetime.now()).days
-                if next_maintenance < datetime.now():
-                    status = "Overdue"
-                elif days_left <= 2:
-                    status = "Upcoming"
-                else:
-                    status = "Done"
-                tasks.append((status, days_left, contact["name"], "Maintenance", next_maintenance.strftime("%Y-%m-%d"), status, f"Regular check-in with {contact['name']}"))
-                if status == "Overdue":
-                    overdue_count += 1
-        # Sort: Overdue (red), Upcoming (yellow), Done (green)
-        status_order = {"Overdue": 0, "Upcoming": 1, "Done": 2}
-        tasks.sort(key=lambda x: (status_order.get(x[0], 3), x[1]))
-        columns = ("Contact", "Type", "Due Date", "Days Left", "Status", "Notes")
-        self.tasks_tree["columns"] = columns
-        for col in columns:
-            self.tasks_tree.heading(col, text=col)
-            self.tasks_tree.column(col, width=120)
-        for t in tasks:
-            self.tasks_tree.insert("", tk.END, values=(t[2], t[3], t[4], t[1], t[5], t[6]), tags=(t[0],))
-        self.tasks_tree.tag_configure("Overdue", background="#ffcccc", foreground="#000000")
-        self.tasks_tree.tag_configure("Upcoming", background="#fff2cc", foreground="#000000")
-        self.tasks_tree.tag_configure("Done", background="#ccffcc", foreground="#000000")
+        self.task_entries = entries
+        self.tasks_tree.set_rows(MappedRows(entries, lambda entry: self._task_row(entry, now)), row_tags=lambda i: (entries[i].status(now)[0],))
         if overdue_count > 0:
             self.notification_label.config(text=f"You have {overdue_count} overdue follow-up task(s)!", foreground="red")
         else:
             self.notification_label.config(text="All tasks are up to date!", foreground="green")
+        self._update_tasks_badge(overdue_count)
+
+    def _update_tasks_badge(self, overdue_count):
+        self.nav_buttons["tasks"].config(text=f"Tasks ({overdue_count})" if overdue_count else "Tasks")
+
+    def _queue_due_notifications(self, entries):
+        # Called on the reminder thread: only hand the entries over, _show_due_notifications picks them up
+        self.due_notifications.put(entries)
+
+    def _show_due_notifications(self):
+        self._due_notifications_after_id = self.root.after(250, self._show_due_notifications)
+        entries = []
+        while True:
+            try:
+                entries.extend(self.due_notifications.get_nowait())
+            except queue.Empty:
+                break
+        if not entries:
+            return
+        if self.current_page == "tasks":
+            self.refresh_tasks()
+        else:
+            self._update_tasks_badge(self.book.overdue_count())
+        if "tasks" not in self.pages:
+            return
+        names = ", ".join(entry.name for entry in entries[:3])
+        if len(entries) > 3:
+            names += f" and {len(entries) - 3} more"
+        self.notification_label.config(text=f"{len(entries)} follow-up task(s) just came due: {names}", foreground="red")
+
+    def _task_row(self, entry, now):
+        status, days_left = entry.status(now)
+        return (entry.name, entry.task_type, entry.due.strftime("%Y-%m-%d"), days_left, status, entry.notes)
 
     # Fix font color for all Treeviews
     def fix_treeview_style(self):
@@ -345,8 +418,6 @@ class ContactManager:
         style.map("Treeview", background=[('selected', '#cce5ff')], foreground=[('selected', '#000000')])
         # Set default background for frames and labels
         self.root.configure(bg="#ffffff")
-        for frame in [self.contacts_frame, self.companies_frame, self.tasks_frame]:
-            frame.configure(style="White.TFrame")
         style.configure("White.TFrame", background="#ffffff")
         style.configure("TLabel", background="#ffffff", foreground="#000000")
         style.configure("TEntry", fieldbackground="#ffffff", foreground="#000000")
@@ -375,7 +446,7 @@ class ContactManager:
                 self.company_var = tk.StringVar()
                 self.company_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_var)
                 self.company_dropdown.grid(row=row, column=col*2+1, sticky="ew", padx=5, pady=2)
-                self.company_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.company_dropdown, self.get_company_names()))
+                self.company_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.company_dropdown, self.autocomplete["company"]))
                 entry = self.company_dropdown
             else:
                 entry = ttk.Entry(entry_frame)
@@ -384,22 +455,22 @@ class ContactManager:
         # Job Title
         ttk.Label(entry_frame, text="Job Title:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
         self.job_title_var = tk.StringVar()
-        self.job_title_dropdown = ttk.Combobox(entry_frame, textvariable=self.job_title_var, values=self.JOB_TITLE_OPTIONS)
+        self.job_title_dropdown = ttk.Combobox(entry_frame, textvariable=self.job_title_var, values=JOB_TITLE_OPTIONS)
         self.job_title_dropdown.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=2)
-        self.job_title_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.job_title_dropdown, self.JOB_TITLE_OPTIONS))
+        self.job_title_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.job_title_dropdown, self.autocomplete["job_title"]))
         # Career
         ttk.Label(entry_frame, text="Career:").grid(row=2, column=2, sticky=tk.W, padx=5, pady=2)
         self.career_var = tk.StringVar()
-        self.career_dropdown = ttk.Combobox(entry_frame, textvariable=self.career_var, values=self.CAREER_OPTIONS)
+        self.career_dropdown = ttk.Combobox(entry_frame, textvariable=self.career_var, values=CAREER_OPTIONS)
         self.career_dropdown.grid(row=2, column=3, sticky=tk.W+tk.E, padx=5, pady=2)
-        self.career_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.career_dropdown, self.CAREER_OPTIONS))
+        self.career_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.career_dropdown, self.autocomplete["career"]))
         # Relationship Type
         ttk.Label(entry_frame, text="Relationship:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
         self.relationship_var = tk.StringVar()
-        self.relationship_dropdown = ttk.Combobox(entry_frame, textvariable=self.relationship_var, values=self.RELATIONSHIP_TYPE_OPTIONS)
+        self.relationship_dropdown = ttk.Combobox(entry_frame, textvariable=self.relationship_var, values=RELATIONSHIP_TYPE_OPTIONS)
         self.relationship_dropdown.grid(row=3, column=1, sticky="ew", padx=5, pady=2)
-        self.relationship_dropdown['values'] = self.RELATIONSHIP_TYPE_OPTIONS
-        self.relationship_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.relationship_dropdown, self.RELATIONSHIP_TYPE_OPTIONS))
+        self.relationship_dropdown['values'] = RELATIONSHIP_TYPE_OPTIONS
+        self.relationship_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.relationship_dropdown, self.autocomplete["relationship"]))
         self.relationship_dropdown.bind('<<ComboboxSelected>>', self._on_relationship_change)
         # Relationship Level
         ttk.Label(entry_frame, text="Relationship Level:").grid(row=3, column=2, sticky=tk.W, padx=5, pady=2)
@@ -409,15 +480,15 @@ class ContactManager:
         # State
         ttk.Label(entry_frame, text="State:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
         self.state_var = tk.StringVar()
-        self.state_dropdown = ttk.Combobox(entry_frame, textvariable=self.state_var, values=self.US_STATES)
+        self.state_dropdown = ttk.Combobox(entry_frame, textvariable=self.state_var, values=US_STATES)
         self.state_dropdown.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=2)
-        self.state_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.state_dropdown, self.US_STATES))
+        self.state_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.state_dropdown, self.autocomplete["state"]))
         # City
         ttk.Label(entry_frame, text="City:").grid(row=4, column=2, sticky=tk.W, padx=5, pady=2)
         self.city_var = tk.StringVar()
         self.city_dropdown = ttk.Combobox(entry_frame, textvariable=self.city_var)
         self.city_dropdown.grid(row=4, column=3, sticky="ew", padx=5, pady=2)
-        self.city_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.city_dropdown, self.CITY_OPTIONS))
+        self.city_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.city_dropdown, self.autocomplete["city"]))
         # Last Contact
         ttk.Label(entry_frame, text="Last Contact:").grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
         self.last_contact_var = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
@@ -439,42 +510,47 @@ class ContactManager:
         self.delete_contact_btn.pack(side=tk.LEFT, padx=5)
         self.clear_contact_btn = ttk.Button(btn_frame, text="Clear Form", command=self.clear_contact_form)
         self.clear_contact_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Import...", command=self.import_contacts).pack(side=tk.RIGHT, padx=5)
         # Bind Enter key to focused button
         for btn in [self.add_contact_btn, self.update_contact_btn, self.delete_contact_btn, self.clear_contact_btn]:
             btn.bind('<Return>', lambda e, b=btn: b.invoke())
-        self.contacts_frame.bind_all('<Return>', self._handle_enter_key)
+        # Search
+        search_frame = ttk.Frame(self.contacts_frame)
+        search_frame.pack(fill=tk.X, padx=10, pady=(5, 0))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=5)
+        self.contact_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.contact_search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        search_entry.bind('<KeyRelease>', self._on_contact_search)
         # Table
         table_frame = ttk.Frame(self.contacts_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         columns = ("Name", "Email", "Phone", "Company", "Job Title", "Career", "Relationship", "Relationship Level", "State", "City", "Birthday", "Last Contact", "Tags", "Notes")
-        self.contacts_tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=10)
+        self.contacts_tree = VirtualTreeview(table_frame, columns=columns, show="headings", height=10)
         for col in columns:
             self.contacts_tree.heading(col, text=col)
             self.contacts_tree.column(col, width=120, minwidth=120, stretch=False)
-        # Add horizontal scrollbar
+        # Add scrollbars
         xscroll = ttk.Scrollbar(table_frame, orient="horizontal", command=self.contacts_tree.xview)
-        self.contacts_tree.configure(xscrollcommand=xscroll.set)
-        self.contacts_tree.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
+        yscroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.contacts_tree.yview)
+        self.contacts_tree.configure(xscrollcommand=xscroll.set, yscrollcommand=yscroll.set)
         xscroll.pack(fill=tk.X, side=tk.BOTTOM)
+        yscroll.pack(fill=tk.Y, side=tk.RIGHT)
+        self.contacts_tree.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
         self.contacts_tree.bind("<<TreeviewSelect>>", self.on_contact_select)
+        self.contacts_table = TableController(self.contacts_tree, self.filtered_contacts, self._contact_row, "contacts")
 
-    def get_company_names(self):
-        return sorted(list(set([c.get("name", "") for c in self.companies if c.get("name")])) or [])
+    def _improved_autocomplete(self, event, combobox, index):
+        # Debounced per combobox; the lookup itself goes through the precomputed index
+        after_id = self._autocomplete_after_ids.pop(combobox, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        self._autocomplete_after_ids[combobox] = self.root.after(50, lambda: self._apply_autocomplete(combobox, index))
 
-    def _improved_autocomplete(self, event, combobox, options):
-        value = combobox.get().lower()
-        if not value:
-            combobox['values'] = options
-            return
-        exact_matches = [opt for opt in options if opt.lower() == value]
-        if exact_matches:
-            combobox['values'] = exact_matches
-            return
-        matches = [opt for opt in options if value in opt.lower()]
-        if matches:
-            combobox['values'] = matches
-        else:
-            combobox['values'] = options
+    @TRACER.traced("autocomplete")
+    def _apply_autocomplete(self, combobox, index):
+        self._autocomplete_after_ids.pop(combobox, None)
+        combobox['values'] = index.lookup(combobox.get())
 
     def _on_relationship_change(self, event=None):
         relationship = self.relationship_var.get()
@@ -490,7 +566,7 @@ class ContactManager:
             value = contact.get(key.lower(), "")
             if key == "Company":
                 self.company_var.set(value)
-                self.company_dropdown['values'] = self.get_company_names()
+                self.company_dropdown['values'] = self.autocomplete["company"].lookup("")
             else:
                 entry.delete(0, tk.END)
                 entry.insert(0, value)
@@ -504,12 +580,12 @@ class ContactManager:
         self.notes_text.delete("1.0", tk.END)
         self.notes_text.insert(tk.END, contact.get("notes", ""))
         # Update dropdown values to ensure they're visible
-        self.job_title_dropdown['values'] = self.JOB_TITLE_OPTIONS
-        self.career_dropdown['values'] = self.CAREER_OPTIONS
-        self.relationship_dropdown['values'] = self.RELATIONSHIP_TYPE_OPTIONS
-        self.state_dropdown['values'] = self.US_STATES
-        self.city_dropdown['values'] = self.CITY_OPTIONS
-        self.company_dropdown['values'] = self.get_company_names()
+        self.job_title_dropdown['values'] = JOB_TITLE_OPTIONS
+        self.career_dropdown['values'] = CAREER_OPTIONS
+        self.relationship_dropdown['values'] = RELATIONSHIP_TYPE_OPTIONS
+        self.state_dropdown['values'] = US_STATES
+        self.city_dropdown['values'] = CITY_OPTIONS
+        self.company_dropdown['values'] = self.autocomplete["company"].lookup("")
 
     def clear_contact_form(self):
         for entry in self.entries.values():
@@ -525,166 +601,294 @@ class ContactManager:
         self.city_var.set("")
         self.last_contact_var.set(datetime.now().strftime("%Y-%m-%d"))
         self.notes_text.delete("1.0", tk.END)
-        self.selected_contact_index = None
+        self.selected_contact_id = None
+        self.contacts_tree.clear_selection()
         # Reset dropdown values
-        self.job_title_dropdown['values'] = self.JOB_TITLE_OPTIONS
-        self.career_dropdown['values'] = self.CAREER_OPTIONS
-        self.relationship_dropdown['values'] = self.RELATIONSHIP_TYPE_OPTIONS
-        self.state_dropdown['values'] = self.US_STATES
-        self.city_dropdown['values'] = self.CITY_OPTIONS
-        self.company_dropdown['values'] = self.get_company_names()
+        self.job_title_dropdown['values'] = JOB_TITLE_OPTIONS
+        self.career_dropdown['values'] = CAREER_OPTIONS
+        self.relationship_dropdown['values'] = RELATIONSHIP_TYPE_OPTIONS
+        self.state_dropdown['values'] = US_STATES
+        self.city_dropdown['values'] = CITY_OPTIONS
+        self.company_dropdown['values'] = self.autocomplete["company"].lookup("")
 
+    @TRACER.traced("refresh_contacts")
     def refresh_contacts(self):
-        for item in self.contacts_tree.get_children():
-            self.contacts_tree.delete(item)
-        for contact in self.filtered_contacts:
-            self.contacts_tree.insert("", tk.END, values=(
-                contact.get("name", ""),
-                contact.get("email", ""),
-                contact.get("phone", ""),
-                contact.get("company", ""),
-                contact.get("job_title", ""),
-                contact.get("career", ""),
-                contact.get("relationship_type", ""),
-                contact.get("relationship_level", ""),
-                contact.get("state", ""),
-                contact.get("city", ""),
-                contact.get("birthday", ""),
-                contact.get("last_contact", ""),
-                contact.get("tags", ""),
-                contact.get("notes", "")
-            ))
+        if "contacts" not in self.pages:
+            return
+        self.contacts_table.reset(self.filtered_contacts)
 
-    def show_contacts_page(self):
-        self.companies_frame.pack_forget()
-        self.tasks_frame.pack_forget()
-        self.contacts_frame.pack(fill=tk.BOTH, expand=True)
-        self.current_page = "contacts"
+    def _on_contact_search(self, event=None):
+        # Debounce so a burst of keystrokes runs one query
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._apply_contact_search)
+
+    @TRACER.traced("contact_search")
+    def _apply_contact_search(self):
+        self._search_after_id = None
+        query = self.contact_search_var.get().strip()
+        self.filtered_contacts = self.book.search_contacts(query)
+        if self.book.search_index.can_search(query):
+            self.contacts_table.filter = lambda contact: self.book.search_index.matches(contact["id"], query)
+        else:
+            self.contacts_table.filter = None
+        self.selected_contact_id = None
         self.refresh_contacts()
 
+    def _contact_row(self, contact):
+        return (
+            contact.get("name", ""),
+            contact.get("email", ""),
+            contact.get("phone", ""),
+            contact.get("company", ""),
+            contact.get("job_title", ""),
+            contact.get("career", ""),
+            contact.get("relationship_type", ""),
+            contact.get("relationship_level", ""),
+            contact.get("state", ""),
+            contact.get("city", ""),
+            contact.get("birthday", ""),
+            contact.get("last_contact", ""),
+            contact.get("tags", ""),
+            contact.get("notes", "")
+        )
+
+    def show_contacts_page(self):
+        self._show_page("contacts")
+
     def show_companies_page(self):
-        self.contacts_frame.pack_forget()
-        self.tasks_frame.pack_forget()
-        self.companies_frame.pack(fill=tk.BOTH, expand=True)
-        self.current_page = "companies"
-        self.refresh_companies()
+        self._show_page("companies")
 
     def load_data(self):
-        if os.path.exists(CONTACTS_FILE):
-            with open(CONTACTS_FILE, "r") as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    self.contacts = data
-                    self.companies = []
-                    self.save_data()
+        # Replays snapshot + journal on a worker thread; legacy contacts.json files are migrated
+        # in place. Contacts are shown batch by batch as the snapshot is parsed.
+        self.root.title("Contact Manager - Loading...")
+        self.loaded_batches = queue.Queue()
+        threading.Thread(target=self._load_in_background, daemon=True).start()
+        self._poll_loader()
+
+    @TRACER.traced("load_data")
+    def _load_in_background(self):
+        try:
+            contacts, companies = self.book.read(on_contacts=lambda batch: self.loaded_batches.put(("contacts", batch)))
+            self.startup.mark("book loaded")
+            indexes = self.book.build_indexes(contacts)
+            self.startup.mark("indexes built")
+        except Exception as e:
+            self.loaded_batches.put(("error", e))
+            return
+        self.loaded_batches.put(("done", (contacts, companies, indexes)))
+
+    def _poll_loader(self):
+        try:
+            while True:
+                kind, payload = self.loaded_batches.get_nowait()
+                if kind == "contacts":
+                    if not self.book.contacts:
+                        self.startup.mark("first contacts")
+                    # Shown while the rest loads; install() then swaps in the final list
+                    self.book.contacts.extend(payload)
+                    if "contacts" in self.pages:
+                        self.contacts_table.extend(payload)
+                    else:
+                        self.filtered_contacts.extend(payload)
+                elif kind == "done":
+                    self._finish_loading(*payload)
+                    return
                 else:
-                    self.contacts = data.get("contacts", [])
-                    # Convert old company format (list of strings) to new format (list of dicts)
-                    companies = data.get("companies", [])
-                    self.companies = [{"name": c} if isinstance(c, str) else c for c in companies]
+                    # Stay in the loading state so nothing overwrites the unreadable book
+                    self.root.title("Contact Manager")
+                    messagebox.showerror("Error", f"Could not load contacts: {payload}")
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(50, self._poll_loader)
+
+    @TRACER.traced("finish_loading")
+    def _finish_loading(self, contacts, companies, indexes):
+        self.book.install(contacts, companies, indexes)
+        self.reminders = ReminderEngine(self.book.follow_ups, self._queue_due_notifications)
+        self.reminders.start()
+        self._show_due_notifications()
+        # One entry per company, so a name stays an option until its last company is gone
+        self.company_option_names = {company["id"]: company.get("name") for company in self.book.companies}
+        self.autocomplete["company"].set_options(sorted(name for name in self.company_option_names.values() if name))
+        # The journal may have changed records shown while loading, so redraw from the final book
+        if "contacts" in self.pages:
+            self._apply_contact_search()
         else:
-            self.contacts = []
-            self.companies = []
-            
-        self.filtered_contacts = self.contacts.copy()
+            self.filtered_contacts = self.book.contacts.copy()
+        self.refresh_companies()
+        if "analytics" in self.pages:
+            self.update_analytics()
+        if self.current_page == "tasks":
+            self.refresh_tasks()
+        else:
+            self._update_tasks_badge(self.book.overdue_count())
+        self.root.title("Contact Manager")
+        self.startup.mark("ready")
+        self.startup.report()
 
-    def save_data(self):
-        data = {
-            "contacts": self.contacts,
-            "companies": self.companies
-        }
-        with open(CONTACTS_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+    def flush_writes(self):
+        self.book.flush()
+        self._update_save_status()
+
+    def _update_save_status(self):
+        # Polled while writes are queued: the writer thread never touches Tk
+        if self._save_status_after_id is not None:
+            self.root.after_cancel(self._save_status_after_id)
+            self._save_status_after_id = None
+        pending = self.book.writer.pending()
+        if self.book.writer.error is not None:
+            self.save_status_label.config(text=f"Save failed, retrying: {self.book.writer.error}", foreground="red")
+        elif pending:
+            self.save_status_label.config(text=f"Saving {pending} change(s)...", foreground="gray")
+        else:
+            self.save_status_label.config(text="All changes saved", foreground="green")
+        if pending:
+            self._save_status_after_id = self.root.after(200, self._update_save_status)
+
+    def open_diagnostics(self):
+        if self.diagnostics_window is not None:
+            self.diagnostics_window.lift()
+            return
+        window = self.diagnostics_window = tk.Toplevel(self.root)
+        window.title("Diagnostics")
+        window.protocol("WM_DELETE_WINDOW", self._close_diagnostics)
+        controls = ttk.Frame(window, padding="5")
+        controls.pack(fill=tk.X)
+        self.tracing_var = tk.BooleanVar(value=TRACER.enabled)
+        ttk.Checkbutton(controls, text="Record timings", variable=self.tracing_var, command=self._toggle_tracing).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Clear", command=self._clear_diagnostics).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Export Trace...", command=self.export_trace).pack(side=tk.LEFT)
+        self.lag_label = ttk.Label(window, text="", padding="5")
+        self.lag_label.pack(fill=tk.X)
+        columns = ("Span", "Calls", "Total (ms)", "Mean (ms)", "Max (ms)", "Last (ms)")
+        self.diagnostics_tree = VirtualTreeview(window, columns=columns, show="headings", height=20)
+        for col in columns:
+            self.diagnostics_tree.heading(col, text=col)
+            self.diagnostics_tree.column(col, width=180 if col == "Span" else 90, anchor=tk.W if col == "Span" else tk.E)
+        self.diagnostics_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        self._refresh_diagnostics()
+
+    def _refresh_diagnostics(self):
+        # Polled while the window is open; spans are recorded from any thread
+        self.diagnostics_tree.set_rows([
+            (name, count, f"{total:.1f}", f"{mean:.2f}", f"{longest:.1f}", f"{last:.2f}")
+            for name, count, total, mean, longest, last in TRACER.summary()
+        ], keep_view=True)
+        if TRACER.enabled:
+            self.lag_label.config(text=f"Event loop lag: {self.lag_monitor.last_lag_ms:.1f} ms now, "
+                                       f"{self.lag_monitor.max_lag_ms:.1f} ms max")
+        else:
+            self.lag_label.config(text="Recording is off")
+        self._diagnostics_after_id = self.root.after(500, self._refresh_diagnostics)
+
+    def _close_diagnostics(self):
+        self.root.after_cancel(self._diagnostics_after_id)
+        self._diagnostics_after_id = None
+        self.diagnostics_window.destroy()
+        self.diagnostics_window = None
+
+    def _toggle_tracing(self):
+        TRACER.enabled = self.tracing_var.get()
+        if TRACER.enabled:
+            self.lag_monitor.start()
+        else:
+            self.lag_monitor.stop()
+
+    def _clear_diagnostics(self):
+        TRACER.clear()
+        self.lag_monitor.reset()
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(parent=self.diagnostics_window, title="Export Trace",
+                                            initialfile="trace.json", defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if not path:
+            return
+        def done(count):
+            messagebox.showinfo("Trace Exported", f"Wrote {count} events to {path}.\n"
+                                "Open it in chrome://tracing or ui.perfetto.dev.", parent=self.diagnostics_window)
+        self.executor.submit("export-trace", lambda: TRACER.export(path), done, self._job_failed("export the trace"))
 
     def on_contact_select(self, event):
-        selection = self.contacts_tree.selection()
-        if selection:
-            index = self.contacts_tree.index(selection[0])
-            self.selected_contact_index = index
-            self.fill_contact_form(self.filtered_contacts[index])
+        contact = self.contacts_table.selected_record()
+        if contact is not None:
+            self.selected_contact_id = contact["id"]
+            self.fill_contact_form(contact)
 
     def add_contact(self):
-        data = self.get_contact_form_data()
-        if not data["name"]:
-            messagebox.showerror("Error", "Name is required")
+        if self._still_loading():
+            return
+        try:
+            self.book.add_contact(self.get_contact_form_data())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
-        self.contacts.append(data)
-        self.save_data()
-        self.update_tasks()
+        self._update_save_status()
         self.clear_contact_form()
-        self.filtered_contacts = self.contacts.copy()
-        self.refresh_contacts()
-        self.display_tasks()
         messagebox.showinfo("Success", "Contact added successfully")
 
-    def update_tasks(self):
-        """Update tasks based on contacts and their last contact dates"""
-        self.tasks = []
-        today = datetime.now()
-        
-        for contact in self.contacts:
-            if contact.get("last_contact"):
-                try:
-                    last_contact = datetime.strptime(contact["last_contact"], "%Y-%m-%d")
-                    days_since = (today - last_contact).days
-                    
-                    # Add task if it's been more than 30 days
-                    if days_since > 30:
-                        self.tasks.append({
-                            "type": "contact",
-                            "description": f"Follow up with {contact['name']}",
-                            "due_date": (last_contact + timedelta(days=30)).strftime("%Y-%m-%d"),
-                            "priority": "medium"
-                        })
-                except ValueError:
-                    continue
-        
-        self.save_data()
-        self.display_tasks()  # Use display_tasks instead of refresh_tasks
-
-    def display_tasks(self):
-        """Display tasks in the tasks treeview"""
-        # Clear existing items
-        for item in self.tasks_tree.get_children():
-            self.tasks_tree.delete(item)
-            
-        # Add tasks
-        for task in self.tasks:
-            self.tasks_tree.insert("", "end", values=(
-                task["type"],
-                task["description"],
-                task["due_date"],
-                task["priority"]
-            ))
+    def import_contacts(self):
+        if self._still_loading():
+            return
+        path = filedialog.askopenfilename(title="Import Contacts", filetypes=[
+            ("CSV or vCard", "*.csv *.vcf *.vcard"), ("CSV", "*.csv"), ("vCard", "*.vcf *.vcard"), ("All files", "*")])
+        if not path:
+            return
+        # The file is parsed and checked for duplicates on a worker; only adding to the book happens here
+        existing = list(self.book.contacts)
+        progress = {"rows": 0}
+        def show_progress():
+            if self.executor.pending("import"):
+                self.loading_label.config(text=f"Reading contacts... {progress['rows']:,} rows")
+                self.root.after(100, show_progress)
+        self.show_loading("Reading contacts...")
+        self.executor.submit("import", lambda: plan_import(path, existing, lambda rows: progress.update(rows=rows)),
+                             lambda result: self._add_imported(*result), self._job_failed("import contacts"))
+        show_progress()
+
+    @TRACER.traced("import_batch")
+    def _add_imported(self, contacts, stats, start=0):
+        # One bulk add (one table update, one queued write batch) per IMPORT_BATCH contacts
+        end = min(start + self.IMPORT_BATCH, len(contacts))
+        self.book.add_contacts(contacts[start:end])
+        if end < len(contacts):
+            self.loading_label.config(text=f"Importing contacts... {end:,} of {len(contacts):,}")
+            self.root.after(1, self._add_imported, contacts, stats, end)
+            return
+        self.hide_loading()
+        self._update_save_status()
+        self._update_tasks_badge(self.book.overdue_count())
+        messagebox.showinfo("Import Complete", f"Imported {len(contacts):,} of {stats['rows']:,} contacts.\n"
+                            f"Skipped {stats['duplicates']:,} duplicates and {stats['skipped']:,} rows without a name.")
 
     def update_contact(self):
-        if self.selected_contact_index is None:
+        if self._still_loading():
+            return
+        if self.selected_contact_id not in self.book.contacts_by_id:
             messagebox.showerror("Error", "No contact selected")
             return
-        data = self.get_contact_form_data()
-        if not data["name"]:
-            messagebox.showerror("Error", "Name is required")
+        try:
+            self.book.update_contact(self.selected_contact_id, self.get_contact_form_data())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
-        self.contacts[self.selected_contact_index] = data
-        self.save_data()
-        self.update_tasks()
+        self._update_save_status()
         self.clear_contact_form()
-        self.filtered_contacts = self.contacts.copy()
-        self.refresh_contacts()
-        self.display_tasks()
         messagebox.showinfo("Success", "Contact updated successfully")
-        self.selected_contact_index = None
 
     def delete_contact(self):
-        if self.selected_contact_index is None:
+        if self._still_loading():
+            return
+        if self.selected_contact_id not in self.book.contacts_by_id:
             messagebox.showerror("Error", "Please select a contact to delete!")
             return
             
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this contact?"):
-            del self.contacts[self.selected_contact_index]
-            self.filtered_contacts = self.contacts.copy()
-            self.save_data()
-            self.refresh_contacts()
+            self.book.delete_contact(self.selected_contact_id)
+            self._update_save_status()
             self.clear_contact_form()
             messagebox.showinfo("Success", "Contact deleted successfully!")
 
@@ -705,28 +909,28 @@ class ContactManager:
         # Location
         ttk.Label(entry_frame, text="Location:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
         self.company_location_var = tk.StringVar()
-        self.company_location_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_location_var, values=self.CITY_OPTIONS, state="readonly")
+        self.company_location_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_location_var, values=CITY_OPTIONS, state="readonly")
         self.company_location_dropdown.grid(row=0, column=3, sticky=tk.W, padx=5, pady=2)
         # State
         ttk.Label(entry_frame, text="State:").grid(row=0, column=4, sticky=tk.W, padx=5, pady=2)
         self.company_state_var = tk.StringVar()
-        self.company_state_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_state_var, values=self.US_STATES)
+        self.company_state_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_state_var, values=US_STATES)
         self.company_state_dropdown.grid(row=0, column=5, sticky=tk.W, padx=5, pady=2)
-        self.company_state_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.company_state_dropdown, self.US_STATES))
+        self.company_state_dropdown.bind('<KeyRelease>', lambda e: self._improved_autocomplete(e, self.company_state_dropdown, self.autocomplete["state"]))
         # Stage
         ttk.Label(entry_frame, text="Stage:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
         self.company_stage_var = tk.StringVar()
-        self.company_stage_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_stage_var, values=self.COMPANY_STAGES, state="readonly")
+        self.company_stage_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_stage_var, values=COMPANY_STAGES, state="readonly")
         self.company_stage_dropdown.grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
         # Type
         ttk.Label(entry_frame, text="Type:").grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
         self.company_type_var = tk.StringVar()
-        self.company_type_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_type_var, values=self.COMPANY_TYPES, state="readonly")
+        self.company_type_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_type_var, values=COMPANY_TYPES, state="readonly")
         self.company_type_dropdown.grid(row=1, column=3, sticky=tk.W, padx=5, pady=2)
         # Sector
         ttk.Label(entry_frame, text="Sector:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
         self.company_sector_var = tk.StringVar()
-        self.company_sector_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_sector_var, values=self.COMPANY_SECTORS, state="readonly")
+        self.company_sector_dropdown = ttk.Combobox(entry_frame, textvariable=self.company_sector_var, values=COMPANY_SECTORS, state="readonly")
         self.company_sector_dropdown.grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
         # Website
         ttk.Label(entry_frame, text="Website:").grid(row=2, column=2, sticky=tk.W, padx=5, pady=2)
@@ -749,7 +953,7 @@ class ContactManager:
         table_frame = ttk.Frame(self.companies_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         columns = ("Name", "Location", "State", "Stage", "Type", "Sector", "Website", "Description")
-        self.companies_tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=10)
+        self.companies_tree = VirtualTreeview(table_frame, columns=columns, show="headings", height=10)
         for col in columns:
             if col == "Description":
                 self.companies_tree.heading(col, text=col)
@@ -759,10 +963,13 @@ class ContactManager:
                 self.companies_tree.column(col, width=120, minwidth=100, stretch=False)
         # Add horizontal scrollbar
         xscroll = ttk.Scrollbar(table_frame, orient="horizontal", command=self.companies_tree.xview)
-        self.companies_tree.configure(xscrollcommand=xscroll.set)
-        self.companies_tree.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
+        yscroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.companies_tree.yview)
+        self.companies_tree.configure(xscrollcommand=xscroll.set, yscrollcommand=yscroll.set)
         xscroll.pack(fill=tk.X, side=tk.BOTTOM)
+        yscroll.pack(fill=tk.Y, side=tk.RIGHT)
+        self.companies_tree.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
         self.companies_tree.bind("<<TreeviewSelect>>", self.on_company_select)
+        self.companies_table = TableController(self.companies_tree, list(self.book.companies), self.book.company_row, "companies")
 
     def get_company_form_data(self):
         return {
@@ -798,78 +1005,58 @@ class ContactManager:
         self.company_sector_var.set("")
         self.company_website_entry.delete(0, tk.END)
         self.company_desc_text.delete("1.0", tk.END)
-        self.selected_company_index = None
+        self.selected_company_id = None
+        self.companies_tree.clear_selection()
 
+    @TRACER.traced("refresh_companies")
     def refresh_companies(self):
-        for item in self.companies_tree.get_children():
-            self.companies_tree.delete(item)
-        for company in self.companies:
-            # Calculate stats for this company-location
-            leads = 0
-            professionals = 0
-            for contact in self.contacts:
-                contact_company = (contact.get("company") or "").strip().lower()
-                contact_location = (contact.get("city") or contact.get("location") or "").strip().lower()
-                company_name = (company.get("name") or "").strip().lower()
-                company_location = (company.get("location") or "").strip().lower()
-                if contact_company == company_name and contact_location == company_location:
-                    if contact.get("relationship_type") and "lead" in contact.get("relationship_type", "").lower():
-                        leads += 1
-                    elif contact.get("relationship_type") == "Professional Relationship":
-                        professionals += 1
-            stats = f"Leads: {leads}, Professional Relationships: {professionals}"
-            self.companies_tree.insert("", tk.END, values=(
-                company.get("name", ""),
-                company.get("location", ""),
-                company.get("state", ""),
-                company.get("stage", ""),
-                company.get("type", ""),
-                company.get("sector", ""),
-                company.get("website", ""),
-                stats
-            ))
+        if "companies" not in self.pages:
+            return
+        self.companies_table.reset(list(self.book.companies))
 
     def on_company_select(self, event):
-        selection = self.companies_tree.selection()
-        if selection:
-            index = self.companies_tree.index(selection[0])
-            self.selected_company_index = index
-            self.fill_company_form(self.companies[index])
+        company = self.companies_table.selected_record()
+        if company is not None:
+            self.selected_company_id = company["id"]
+            self.fill_company_form(company)
 
     def add_company(self):
-        data = self.get_company_form_data()
-        if not data["name"]:
-            messagebox.showerror("Error", "Company name is required!")
+        if self._still_loading():
             return
-        self.companies.append(data)
-        self.save_data()
-        self.refresh_companies()
+        try:
+            self.book.add_company(self.get_company_form_data())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self._update_save_status()
         self.clear_company_form()
         messagebox.showinfo("Success", "Company added successfully!")
 
     def update_company(self):
-        if self.selected_company_index is None:
+        if self._still_loading():
+            return
+        if self.selected_company_id not in self.book.companies_by_id:
             messagebox.showerror("Error", "Please select a company to update!")
             return
-        data = self.get_company_form_data()
-        if not data["name"]:
-            messagebox.showerror("Error", "Company name is required!")
+        try:
+            self.book.update_company(self.selected_company_id, self.get_company_form_data())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
-        self.companies[self.selected_company_index] = data
-        self.save_data()
-        self.refresh_companies()
+        self._update_save_status()
         self.clear_company_form()
         messagebox.showinfo("Success", "Company updated successfully!")
 
     def delete_company(self):
-        if self.selected_company_index is None:
+        if self._still_loading():
+            return
+        if self.selected_company_id not in self.book.companies_by_id:
             messagebox.showerror("Error", "Please select a company to delete!")
             return
             
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this company?"):
-            del self.companies[self.selected_company_index]
-            self.save_data()
-            self.refresh_companies()
+            self.book.delete_company(self.selected_company_id)
+            self._update_save_status()
             self.clear_company_form()
             messagebox.showinfo("Success", "Company deleted successfully!")
 
@@ -879,6 +1066,7 @@ class ContactManager:
             widget.invoke()
 
     def setup_analytics_ui(self):
+        self.analytics_frame = ttk.Frame(self.root)
         # Create main container with padding
         main_container = ttk.Frame(self.analytics_frame, padding="10")
         main_container.pack(fill=tk.BOTH, expand=True)
@@ -901,6 +1089,8 @@ class ContactManager:
         # Search button
         search_btn = ttk.Button(left_panel, text="Search", command=self.update_analytics)
         search_btn.pack(pady=10)
+        self.export_btn = ttk.Button(left_panel, text="Export...", command=self.export_analytics)
+        self.export_btn.pack()
         
         # Right panel for data display
         right_panel = ttk.Frame(main_container)
@@ -919,11 +1109,17 @@ class ContactManager:
         
         self.analytics_data_frame = data_frame
         self.analytics_tree = None  # Will be created in update_analytics
+        self.analytics_filters = []
+        # (mode, rows or contacts) of the search on screen, for Export
+        self.analytics_results = None
         
         # Initialize analytics
         self.update_analytics()
 
+    @TRACER.traced("update_analytics")
     def update_analytics(self, event=None):
+        # The filter widgets are rebuilt below; carry the chosen values over
+        previous_filters = {name: var.get() for name, var in self.analytics_filters}
         # Clear filter frame
         for widget in self.analytics_filter_frame.winfo_children():
             widget.destroy()
@@ -934,7 +1130,6 @@ class ContactManager:
             if isinstance(widget, ttk.Scrollbar):
                 widget.destroy()
         mode = self.analytics_mode_var.get()
-        data = []
         columns = []
         filter_widgets = []
         # --- Businesses Mode ---
@@ -942,119 +1137,60 @@ class ContactManager:
             columns = ("Company Name", "State", "City", "Sector", "Type", "Stage", "Website", "# of Contacts", "Leads", "Professionals")
             # Filters
             ttk.Label(self.analytics_filter_frame, text="State:").pack(anchor=tk.W)
-            state_var = tk.StringVar(value="All")
-            state_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=state_var, values=["All"] + self.US_STATES)
+            state_var = tk.StringVar(value=previous_filters.get("state", "All"))
+            state_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=state_var, values=["All"] + US_STATES)
             state_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("state", state_var))
             
             ttk.Label(self.analytics_filter_frame, text="Sector:").pack(anchor=tk.W)
-            sector_var = tk.StringVar(value="All")
-            sector_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=sector_var, values=["All"] + self.COMPANY_SECTORS)
+            sector_var = tk.StringVar(value=previous_filters.get("sector", "All"))
+            sector_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=sector_var, values=["All"] + COMPANY_SECTORS)
             sector_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("sector", sector_var))
             
             ttk.Label(self.analytics_filter_frame, text="Type:").pack(anchor=tk.W)
-            type_var = tk.StringVar(value="All")
-            type_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=type_var, values=["All"] + self.COMPANY_TYPES)
+            type_var = tk.StringVar(value=previous_filters.get("type", "All"))
+            type_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=type_var, values=["All"] + COMPANY_TYPES)
             type_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("type", type_var))
             
             ttk.Label(self.analytics_filter_frame, text="Stage:").pack(anchor=tk.W)
-            stage_var = tk.StringVar(value="All")
-            stage_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=stage_var, values=["All"] + self.COMPANY_STAGES)
+            stage_var = tk.StringVar(value=previous_filters.get("stage", "All"))
+            stage_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=stage_var, values=["All"] + COMPANY_STAGES)
             stage_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("stage", stage_var))
             
-            # Collect data
-            for company in self.companies:
-                if state_var.get() != "All" and company.get("state", "") != state_var.get():
-                    continue
-                if sector_var.get() != "All" and company.get("sector", "") != sector_var.get():
-                    continue
-                if type_var.get() != "All" and company.get("type", "") != type_var.get():
-                    continue
-                if stage_var.get() != "All" and company.get("stage", "") != stage_var.get():
-                    continue
-                
-                # Count contacts and categorize them
-                leads = 0
-                professionals = 0
-                total_contacts = 0
-                for contact in self.contacts:
-                    if contact.get("company", "").lower() == company.get("name", "").lower():
-                        total_contacts += 1
-                        if contact.get("relationship_type") and "lead" in contact.get("relationship_type", "").lower():
-                            leads += 1
-                        elif contact.get("relationship_type") == "Professional Relationship":
-                            professionals += 1
-                
-                data.append((
-                    company.get("name", ""),
-                    company.get("state", ""),
-                    company.get("location", ""),
-                    company.get("sector", ""),
-                    company.get("type", ""),
-                    company.get("stage", ""),
-                    company.get("website", ""),
-                    total_contacts,
-                    leads,
-                    professionals
-                ))
         # --- Individuals Mode ---
         else:
             columns = ("Name", "Company", "State", "City", "Relationship", "Job Title", "Career", "Last Contact", "Tags", "Notes")
             # Filters
             ttk.Label(self.analytics_filter_frame, text="State:").pack(anchor=tk.W)
-            state_var = tk.StringVar(value="All")
-            state_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=state_var, values=["All"] + self.US_STATES)
+            state_var = tk.StringVar(value=previous_filters.get("state", "All"))
+            state_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=state_var, values=["All"] + US_STATES)
             state_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("state", state_var))
             
             ttk.Label(self.analytics_filter_frame, text="Relationship:").pack(anchor=tk.W)
-            rel_var = tk.StringVar(value="All")
-            rel_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=rel_var, values=["All"] + self.RELATIONSHIP_TYPE_OPTIONS)
+            rel_var = tk.StringVar(value=previous_filters.get("relationship", "All"))
+            rel_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=rel_var, values=["All"] + RELATIONSHIP_TYPE_OPTIONS)
             rel_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("relationship", rel_var))
             
             ttk.Label(self.analytics_filter_frame, text="Company:").pack(anchor=tk.W)
-            company_var = tk.StringVar(value="All")
-            company_names = sorted(list(set([c.get("company", "") for c in self.contacts if c.get("company")])))
-            company_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=company_var, values=["All"] + company_names)
+            company_var = tk.StringVar(value=previous_filters.get("company", "All"))
+            company_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=company_var,
+                                            values=["All"] + self.book.contact_company_names())
             company_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("company", company_var))
             
             ttk.Label(self.analytics_filter_frame, text="Career:").pack(anchor=tk.W)
-            career_var = tk.StringVar(value="All")
-            career_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=career_var, values=["All"] + self.CAREER_OPTIONS)
+            career_var = tk.StringVar(value=previous_filters.get("career", "All"))
+            career_dropdown = ttk.Combobox(self.analytics_filter_frame, textvariable=career_var, values=["All"] + CAREER_OPTIONS)
             career_dropdown.pack(fill=tk.X, pady=(0, 10))
             filter_widgets.append(("career", career_var))
-            
-            # Collect data
-            for contact in self.contacts:
-                if state_var.get() != "All" and contact.get("state", "") != state_var.get():
-                    continue
-                if rel_var.get() != "All" and contact.get("relationship_type", "") != rel_var.get():
-                    continue
-                if company_var.get() != "All" and contact.get("company", "") != company_var.get():
-                    continue
-                if career_var.get() != "All" and contact.get("career", "") != career_var.get():
-                    continue
-                
-                data.append((
-                    contact.get("name", ""),
-                    contact.get("company", ""),
-                    contact.get("state", ""),
-                    contact.get("city", ""),
-                    contact.get("relationship_type", ""),
-                    contact.get("job_title", ""),
-                    contact.get("career", ""),
-                    contact.get("last_contact", ""),
-                    contact.get("tags", ""),
-                    contact.get("notes", "")
-                ))
         
         # Create new treeview
-        self.analytics_tree = ttk.Treeview(self.analytics_data_frame, columns=columns, show="headings", height=12)
+        self.analytics_tree = VirtualTreeview(self.analytics_data_frame, columns=columns, show="headings", height=12)
         for col in columns:
             self.analytics_tree.heading(col, text=col)
             self.analytics_tree.column(col, width=140, minwidth=100, stretch=True)
@@ -1066,19 +1202,88 @@ class ContactManager:
         self.analytics_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         yscroll.pack(side=tk.RIGHT, fill=tk.Y)
         xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.analytics_filters = filter_widgets
         
-        # Insert data
-        for row in data:
-            self.analytics_tree.insert("", tk.END, values=row)
-        
-        # Update summary
-        summary = f"Mode: {mode}\nTotal Results: {len(data)}\n"
+        filters = {name: None if var.get() == "All" else var.get() for name, var in filter_widgets}
         if mode == "Businesses":
-            total_leads = sum(row[8] for row in data)
-            total_professionals = sum(row[9] for row in data)
-            summary += f"Total Leads: {total_leads}\nTotal Professional Relationships: {total_professionals}"
+            # Rows are collected on a worker; a newer search drops the result of an older one
+            companies = list(self.book.companies)
+            def render(data):
+                self.analytics_results = (mode, data)
+                total_leads = sum(row[8] for row in data)
+                total_professionals = sum(row[9] for row in data)
+                self._render_analytics(mode, data, f"Total Leads: {total_leads}\nTotal Professional Relationships: {total_professionals}")
+            self.summary_text.delete("1.0", tk.END)
+            self.summary_text.insert("1.0", f"Mode: {mode}\nSearching...")
+            self.executor.submit("analytics", lambda: self.book.business_rows(filters, companies), render)
+        else:
+            def search():
+                return self.book.filter_contacts(
+                    state=filters["state"],
+                    relationship_type=filters["relationship"],
+                    company=filters["company"],
+                    career=filters["career"],
+                )
+            def render(result):
+                contacts, by_type = result
+                self.analytics_results = (mode, contacts)
+                self._render_analytics(mode, MappedRows(contacts, self._analytics_contact_row),
+                                       "By Relationship: " + ", ".join(f"{name or 'None'}: {count}" for name, count in sorted(by_type.items())))
+            if self.book.filters_in_store:
+                # SQLite answers from its indexes once pending edits are written, so off the Tk thread
+                self.summary_text.delete("1.0", tk.END)
+                self.summary_text.insert("1.0", f"Mode: {mode}\nSearching...")
+                self.executor.submit("analytics", search, render)
+            else:
+                # One mask per filter over the contact columns, ANDed together; fast enough to stay on the Tk thread
+                self.executor.cancel("analytics")
+                render(search())
+
+    @TRACER.traced("render_analytics")
+    def _render_analytics(self, mode, data, details):
+        self.analytics_tree.set_rows(data)
         self.summary_text.delete("1.0", tk.END)
-        self.summary_text.insert("1.0", summary)
+        self.summary_text.insert("1.0", f"Mode: {mode}\nTotal Results: {len(data)}\n{details}")
+
+    def export_analytics(self):
+        if self.analytics_results is None:
+            messagebox.showinfo("Export", "Nothing to export yet; run a search first.")
+            return
+        mode, results = self.analytics_results
+        path = filedialog.asksaveasfilename(title="Export Results", initialfile=f"{mode.lower()}.csv",
+                                            defaultextension=".csv", filetypes=[
+                                                ("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Excel workbook", "*.xlsx")])
+        if not path:
+            return
+        # Rows are written straight from the search results on a worker, one at a time
+        if mode == "Businesses":
+            work = lambda: export_rows(path, BUSINESS_FIELDS, results)
+        else:
+            work = lambda: export_records(path, CONTACT_FIELDS, results)
+        self.export_btn.config(state=tk.DISABLED, text="Exporting...")
+        def finished():
+            self.export_btn.config(state=tk.NORMAL, text="Export...")
+        def done(count):
+            finished()
+            messagebox.showinfo("Export Complete", f"Exported {count:,} {mode.lower()} to {path}")
+        def failed(exception):
+            finished()
+            self._job_failed("export the results")(exception)
+        self.executor.submit("export", work, done, failed)
+
+    def _analytics_contact_row(self, contact):
+        return (
+            contact.get("name", ""),
+            contact.get("company", ""),
+            contact.get("state", ""),
+            contact.get("city", ""),
+            contact.get("relationship_type", ""),
+            contact.get("job_title", ""),
+            contact.get("career", ""),
+            contact.get("last_contact", ""),
+            contact.get("tags", ""),
+            contact.get("notes", "")
+        )
 
     def get_contact_form_data(self):
         data = {k.lower(): self.entries[k].get().strip() for k in self.entries}
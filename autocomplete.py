@@ -0,0 +1,139 @@
+import bisect
+
+# Shorter queries match inside an option only among the first SHORT_SCAN_FACTOR * limit options;
+# prefix matches are always complete
+SHORT_SCAN_FACTOR = 10
+
+
+class AutocompleteIndex:
+    """Precomputed lookup for a Combobox's options.
+
+    Options are lowercased once and kept sorted for prefix matches (two
+    bisects), with a trigram index for matches inside an option. Lookups return at most ``limit`` options: the
+    exact match if there is one, otherwise prefix matches followed by other
+    substring matches. add/remove keep the index current one option at a
+    time; an option added n times stays until it is removed n times.
+    """
+
+    def __init__(self, options=(), limit=100):
+        self.limit = limit
+        self.set_options(options)
+
+    def set_options(self, options):
+        # Removed options leave a None behind, so the others keep their place (and order)
+        self.options = []
+        self._lowered = []
+        self._slots = {}
+        self._refs = {}
+        self._exact = {}
+        self._sorted = []
+        self._trigrams = {}
+        self._removed = 0
+        for option in options:
+            if option in self._slots:
+                self._refs[option] += 1
+            else:
+                self._append(option)
+        self._sorted.sort()
+
+    def _append(self, option):
+        i = len(self.options)
+        lowered = option.lower()
+        self.options.append(option)
+        self._lowered.append(lowered)
+        self._slots[option] = i
+        self._refs[option] = 1
+        self._exact.setdefault(lowered, i)
+        self._sorted.append((lowered, i))
+        for start in range(len(lowered) - 2):
+            self._trigrams.setdefault(lowered[start:start + 3], set()).add(i)
+        return i
+
+    def add(self, option):
+        if option in self._slots:
+            self._refs[option] += 1
+            return
+        i = self._append(option)
+        # _append put it last; move it to its sorted place
+        self._sorted.pop()
+        bisect.insort(self._sorted, (self._lowered[i], i))
+
+    def remove(self, option):
+        refs = self._refs.get(option)
+        if refs is None:
+            return
+        if refs > 1:
+            self._refs[option] = refs - 1
+            return
+        del self._refs[option]
+        i = self._slots.pop(option)
+        lowered = self._lowered[i]
+        self.options[i] = self._lowered[i] = None
+        position = bisect.bisect_left(self._sorted, (lowered, i))
+        del self._sorted[position]
+        if self._exact[lowered] == i:
+            # The first option differing from this one only in case, if any, now sorts in its place
+            if position < len(self._sorted) and self._sorted[position][0] == lowered:
+                self._exact[lowered] = self._sorted[position][1]
+            else:
+                del self._exact[lowered]
+        for trigram in {lowered[start:start + 3] for start in range(len(lowered) - 2)}:
+            rows = self._trigrams[trigram]
+            rows.discard(i)
+            if not rows:
+                del self._trigrams[trigram]
+        self._removed += 1
+        if self._removed > len(self._slots):
+            self.set_options([option for option in self.options if option is not None
+                              for _ in range(self._refs[option])])
+
+    def lookup(self, text):
+        value = text.lower()
+        if not value:
+            return self._first(range(len(self.options)), self.limit)
+        if value in self._exact:
+            return [self.options[self._exact[value]]]
+        matches = self._prefix_matches(value)
+        if len(matches) < self.limit:
+            seen = set(matches)
+            for i in self._substring_matches(value, self.limit - len(matches), seen):
+                matches.append(i)
+        if not matches:
+            return self._first(range(len(self.options)), self.limit)
+        return [self.options[i] for i in matches]
+
+    def _first(self, rows, limit):
+        options = []
+        for i in rows:
+            if self.options[i] is not None:
+                options.append(self.options[i])
+                if len(options) >= limit:
+                    break
+        return options
+
+    def _prefix_matches(self, value):
+        start = bisect.bisect_left(self._sorted, (value,))
+        matches = []
+        for lowered, i in self._sorted[start:start + self.limit]:
+            if not lowered.startswith(value):
+                break
+            matches.append(i)
+        matches.sort()
+        return matches
+
+    def _substring_matches(self, value, limit, seen):
+        if len(value) >= 3:
+            # Candidates must contain every trigram of the query; confirm each with a substring test
+            grams = sorted((self._trigrams.get(value[i:i + 3], set()) for i in range(len(value) - 2)), key=len)
+            candidates = sorted(set.intersection(*grams)) if grams[0] else []
+        else:
+            # Too short for the trigrams: a bounded scan keeps a keystroke cheap on a long list
+            candidates = range(min(len(self._lowered), SHORT_SCAN_FACTOR * self.limit))
+        found = 0
+        for i in candidates:
+            lowered = self._lowered[i]
+            if i not in seen and lowered is not None and value in lowered:
+                yield i
+                found += 1
+                if found >= limit:
+                    return
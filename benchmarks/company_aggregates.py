@@ -0,0 +1,54 @@
+"""Compare per-row company stats: the old nested loop vs CompanyAggregates.
+
+    python benchmarks/company_aggregates.py [contacts] [companies]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indexes import CompanyAggregates
+from synthetic import generate
+
+
+def nested_loop_row(company, contacts):
+    total = leads = professionals = 0
+    for contact in contacts:
+        if contact.get("company", "").lower() == company.get("name", "").lower():
+            total += 1
+            if contact.get("relationship_type") and "lead" in contact.get("relationship_type", "").lower():
+                leads += 1
+            elif contact.get("relationship_type") == "Professional Relationship":
+                professionals += 1
+    return total, leads, professionals
+
+
+def main(n_contacts=100_000, n_companies=5_000):
+    contacts, companies = generate(n_contacts, n_companies, history=0)
+
+    start = time.perf_counter()
+    aggregates = CompanyAggregates(contacts)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for company in companies:
+        aggregates.company_totals(company["name"])
+        aggregates.location_totals(company["name"], company["location"])
+    indexed = (time.perf_counter() - start) / len(companies)
+
+    sample = companies[:20]
+    start = time.perf_counter()
+    for company in sample:
+        assert nested_loop_row(company, contacts) == aggregates.company_totals(company["name"])
+    scan = (time.perf_counter() - start) / len(sample)
+
+    print(f"{n_contacts} contacts, {n_companies} companies")
+    print(f"  build index:        {build * 1000:10.1f} ms")
+    print(f"  per row (indexed):  {indexed * 1e6:10.2f} us")
+    print(f"  per row (scan):     {scan * 1e6:10.2f} us")
+    print(f"  full page (scan, extrapolated): {scan * n_companies:.1f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""Compare Data Search's Individuals filters: the per-contact loop vs ContactColumns.
+
+    python benchmarks/data_search.py [contacts]
+
+Runs with numpy if it is installed, otherwise with the stdlib bitmap fallback.
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import columns
+from columns import ContactColumns
+from synthetic import generate
+
+
+def loop_filter(contacts, state, relationship_type, company, career):
+    result = []
+    for contact in contacts:
+        if state != "All" and contact.get("state", "") != state:
+            continue
+        if relationship_type != "All" and contact.get("relationship_type", "") != relationship_type:
+            continue
+        if company != "All" and contact.get("company", "") != company:
+            continue
+        if career != "All" and contact.get("career", "") != career:
+            continue
+        result.append(contact)
+    return result
+
+
+def timed(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(n_contacts=1_000_000):
+    contacts, companies = generate(n_contacts, history=0, today=date(2025, 1, 1))
+    company = companies[len(companies) // 2]["name"]
+
+    start = time.perf_counter()
+    table = ContactColumns(contacts)
+    build = time.perf_counter() - start
+
+    loop, expected = timed(lambda: loop_filter(contacts, "Texas", "Lead", "All", "Consultant"), repeat=1)
+    query, result = timed(lambda: table.query(state="Texas", relationship_type="Lead", career="Consultant"))
+    assert result == expected
+    narrow, _ = timed(lambda: table.query(state="Texas", relationship_type="Lead", career="Consultant",
+                                          company=company))
+    dated, _ = timed(lambda: table.query(state="Texas", contacted_after=date(2024, 12, 1),
+                                         contacted_before=date(2024, 12, 31)))
+    group, _ = timed(lambda: table.count_by("relationship_type", table.mask(state="Texas")))
+
+    print(f"{n_contacts} contacts ({'numpy' if columns.np is not None else 'stdlib bitmaps'})")
+    print(f"  build columns:              {build * 1000:10.1f} ms")
+    print(f"  3 filters, loop:            {loop * 1000:10.1f} ms ({len(expected)} rows)")
+    print(f"  3 filters, columns:         {query * 1000:10.1f} ms")
+    print(f"  4 filters, columns:         {narrow * 1000:10.1f} ms")
+    print(f"  state + date range:         {dated * 1000:10.1f} ms")
+    print(f"  group-by relationship:      {group * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,52 @@
+"""Compare the memory held by a loaded contact book: plain dicts vs slotted records.
+
+    python benchmarks/record_memory.py [contacts]
+
+Contacts are parsed from JSON text, as they are at startup, so every string
+value starts out as its own object before interning.
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Contact, json_default
+from synthetic import generate
+
+
+def measure(build):
+    # Timed without tracing first: tracemalloc slows every allocation down
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main(n_contacts=100_000):
+    text = json.dumps(generate(n_contacts)[0])
+
+    dicts, dict_size, dict_time = measure(lambda: json.loads(text))
+    del dicts
+    records, record_size, record_time = measure(lambda: [Contact(contact) for contact in json.loads(text)])
+    # History entries are records too, which compare by identity: compare what would be saved
+    assert json.loads(json.dumps(records, default=json_default)) == json.loads(text)
+
+    print(f"{n_contacts} contacts")
+    print(f"  dicts:   {dict_size / 2**20:8.1f} MiB  ({dict_size / n_contacts:6.0f} B/contact, load {dict_time:.2f} s)")
+    print(f"  records: {record_size / 2**20:8.1f} MiB  ({record_size / n_contacts:6.0f} B/contact, load {record_time:.2f} s)")
+    print(f"  saved:   {(1 - record_size / dict_size) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""Compare snapshot formats: save time, file size and load time.
+
+    python benchmarks/snapshot_formats.py [contacts ...]
+
+Defaults to 10k, 100k and 1M contacts. Saves skip the fsync so the numbers
+reflect serialization rather than the disk; loads go through
+JournalStore.load, as at startup.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Company, Contact
+from storage import SNAPSHOT_FORMATS, JournalStore, write_snapshot
+from synthetic import generate
+
+
+def main(*sizes):
+    sizes = sizes or (10_000, 100_000, 1_000_000)
+    print(f"{'contacts':>9}  {'format':<9} {'save':>9} {'size':>10} {'load':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_contacts in sizes:
+            contacts, companies = generate(n_contacts)
+            contacts = [Contact(contact) for contact in contacts]
+            companies = [Company(company) for company in companies]
+            for snapshot_format in SNAPSHOT_FORMATS:
+                path = os.path.join(directory, f"contacts-{n_contacts}.{snapshot_format}")
+                start = time.perf_counter()
+                write_snapshot(path, contacts, companies, fsync=False, snapshot_format=snapshot_format)
+                save = time.perf_counter() - start
+                size = os.path.getsize(path)
+                start = time.perf_counter()
+                loaded, _ = JournalStore(path).load({"contacts": Contact.from_stored, "companies": Company})
+                load = time.perf_counter() - start
+                assert len(loaded) == n_contacts
+                print(f"{n_contacts:>9}  {snapshot_format:<9} {save:>8.2f}s {size / 2**20:>7.1f} MiB {load:>8.2f}s")
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,164 @@
+"""Time and peak memory of the app's heavy operations on synthetic books.
+
+    python benchmarks/suite.py [contacts ...] [--json results.json] [--backend json|sqlite]
+                               [--format json|jsonl|jsonl.gz] [--repeat N] [--seed N] [--no-memory]
+
+Defaults to 1k, 10k, 100k and 1M contacts. Each book comes from synthetic.py
+and every operation runs headless through core.ContactBook, the same calls
+the app's views make:
+
+    load_data             cold load: snapshot + journal, then every index built
+    load_data_cached      load with the search index and derived cache saved at close
+    refresh_companies     a Companies table row for every company
+    refresh_tasks         the follow-up list re-sorted after an edit
+    update_analytics      Data Search, Businesses (one state) and Individuals (its company
+                          filter's options, then one state + career)
+    search                a two-word Contacts search
+    save_data             a full snapshot rewrite, with backups and fsync as the app saves
+
+Times are the best of --repeat runs. Peak memory is measured in a separate
+run under tracemalloc (which slows the code down, so it never overlaps the
+timed runs): the most memory allocated at once while the operation ran, on
+top of what was already held. --json writes the results together with the
+commit and environment they were measured on, for tracking over time.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columns import np
+from core import ContactBook
+from storage import SNAPSHOT_FORMATS
+from synthetic import generate, write_book
+
+
+def measure(run, repeat, memory, setup=None):
+    """Best time of repeat runs of run() and, with memory, its traced peak in bytes."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+def discard(book):
+    # Unlike close(), leaves no search index or derived cache behind for the next load
+    book.writer.close()
+    book.store.close()
+
+
+def bench_book(path, backend, snapshot_format, repeat, memory):
+    """Yield (operation, seconds, peak bytes) for each operation on the book at path."""
+    def open_book():
+        return ContactBook.open(path, backend, snapshot_format)
+
+    loads = []
+    yield ("load_data",) + measure(lambda: loads.append(open_book().load()), repeat, memory,
+                                   setup=lambda: loads and discard(loads.pop()))
+    book = loads.pop()
+    book.close()
+    yield ("load_data_cached",) + measure(lambda: loads.append(open_book().load()), repeat, memory,
+                                          setup=lambda: loads and discard(loads.pop()))
+    discard(loads.pop())
+
+    book = open_book().load()
+    try:
+        yield ("refresh_companies",) + measure(lambda: [book.company_row(c) for c in book.companies], repeat, memory)
+
+        # Any edit invalidates the sorted task list, as completing a follow-up does in the app
+        contact = book.contacts[len(book.contacts) // 2]
+
+        def edit():
+            book.update_contact(contact["id"], dict(contact))
+            book.flush(wait=True)
+        yield ("refresh_tasks",) + measure(lambda: (book.tasks(), book.overdue_count()), repeat, memory, setup=edit)
+
+        state = book.contacts[0]["state"]
+        filters = {"state": state, "sector": None, "type": None, "stage": None}
+        yield ("update_analytics_businesses",) + measure(lambda: book.business_rows(filters), repeat, memory)
+        career = book.contacts[0]["career"]
+        # The company filter's options are listed every time the Individuals view is built
+        yield ("update_analytics_individuals",) + measure(
+            lambda: (book.contact_company_names(),
+                     book.filter_contacts(state=state, relationship_type=None, company=None, career=career)),
+            repeat, memory)
+        yield ("search",) + measure(lambda: book.search_contacts("follow up"), repeat, memory)
+
+        book.flush(wait=True)
+        yield ("save_data",) + measure(book.save, repeat, memory)
+    finally:
+        discard(book)
+
+
+def environment():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the contact book's heavy operations.")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--format", choices=SNAPSHOT_FORMATS, default="json")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'contacts':>9}  {'operation':<30} {'time':>10} {'peak':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_contacts in args.sizes:
+            contacts, companies = generate(n_contacts, seed=args.seed)
+            path = os.path.join(directory, f"contacts-{n_contacts}." + ("db" if args.backend == "sqlite" else "json"))
+            write_book(path, contacts, companies, args.backend, args.format)
+            n_companies = len(companies)
+            del contacts, companies
+            for operation, seconds, peak in bench_book(path, args.backend, args.format, args.repeat,
+                                                       not args.no_memory):
+                results.append({"contacts": n_contacts, "companies": n_companies, "operation": operation,
+                                "seconds": seconds, "peak_bytes": peak})
+                peak_text = f"{peak / 2**20:7.1f} MiB" if peak is not None else ""
+                print(f"{n_contacts:>9}  {operation:<30} {seconds * 1000:>7.1f} ms {peak_text:>11}", flush=True)
+    if args.json:
+        settings = {name: getattr(args, name) for name in ("backend", "format", "repeat", "seed")}
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "settings": settings, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
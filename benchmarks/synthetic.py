@@ -0,0 +1,179 @@
+"""Reproducible synthetic contact books for benchmarks and manual testing.
+
+    python benchmarks/synthetic.py contacts.json contacts [companies] [seed]
+
+Writes a book the app can open (snapshot in the app's default format, or a
+SQLite database for a .db path). Values are drawn from the app's own option
+lists with skewed rather than uniform distributions: a few companies employ
+many of the contacts, cities and the front of each option list are the most
+common picks, most contacts were last reached recently, and history grows
+with the number of follow-ups a contact has been through. The same
+arguments always produce the same book.
+"""
+import os
+import random
+import sys
+from datetime import date, timedelta
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import (CAREER_OPTIONS, CITY_OPTIONS, COMPANY_SECTORS, COMPANY_STAGES, COMPANY_TYPES, JOB_TITLE_OPTIONS,
+                  LEAD_STAGES, RELATIONSHIP_TYPE_OPTIONS, US_STATES)
+from storage import open_store
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth", "William",
+    "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Wei", "Priya",
+    "Carlos", "Fatima", "Hiroshi", "Aisha", "Mateo", "Olga", "Kwame", "Ana",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez", "Hernandez",
+    "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Chen", "Patel",
+    "Kim", "Nguyen", "Singh", "Cohen", "Okafor", "Silva", "Novak",
+]
+COMPANY_WORDS = [
+    "Summit", "Harbor", "Granite", "Northwind", "Bluebird", "Redwood", "Meridian", "Atlas", "Beacon", "Cobalt",
+    "Evergreen", "Falcon", "Horizon", "Ironclad", "Juniper", "Keystone", "Lakeshore", "Monarch", "Oakridge", "Pinnacle",
+]
+COMPANY_SUFFIXES = {
+    "Investment Bank": "Partners", "Private Equity": "Capital", "Venture Capital": "Ventures", "Startup": "Labs",
+    "Corporate": "Corporation", "Family Office": "Family Office", "Hedge Fund": "Asset Management",
+    "Real Estate": "Properties", "Other": "Group",
+}
+# Percentage of contacts in each of RELATIONSHIP_TYPE_OPTIONS
+RELATIONSHIP_WEIGHTS = {
+    "Lead": 4, "Passive Friendship": 25, "Lead - First Outreach": 12, "Lead - First Follow-up": 8,
+    "Lead - Second Follow-up": 5, "Lead - Third Follow-up": 3, "Professional Relationship": 30, "Dead Lead": 13,
+}
+# Most populous states are the most common; the rest share what is left
+STATE_WEIGHTS = {"California": 12, "Texas": 9, "Florida": 7, "New York": 8, "Illinois": 4, "Pennsylvania": 4,
+                 "Massachusetts": 4, "Washington": 3, "Georgia": 3, "International": 3, "Global": 1}
+TAGS = ["alumni", "conference", "referral", "investor", "mentor", "recruiter", "priority", "coffee chat"]
+NOTES = [
+    "Met at the {city} meetup, interested in {sector} deals.",
+    "Introduced by a former colleague; follow up about {sector}.",
+    "Asked for an intro to someone at {company}.",
+    "Working on a new fund, wants to stay in touch.",
+    "Good contact for {sector} questions in {city}.",
+]
+HISTORY_NOTES = [
+    "Sent an intro email", "Followed up on LinkedIn", "Left a voicemail", "Had a call about {sector}",
+    "Caught up over coffee in {city}", "Shared a deck from {company}",
+]
+
+
+def zipf_weights(n, s=1.1):
+    """Cumulative weights for picking the k-th of n items with probability ~ 1 / k**s."""
+    return list(accumulate(1 / (k + 1) ** s for k in range(n)))
+
+
+def _cumulative(options, weights, default=1):
+    return list(accumulate(weights.get(option, default) for option in options))
+
+
+def generate(n_contacts, n_companies=None, history=2.0, seed=0, today=None):
+    """Return (contacts, companies) as plain dicts, as they are stored.
+
+    n_companies defaults to one company location per 25 contacts; about one
+    company in eight has offices in several cities. history is the mean number
+    of history entries per contact that has been followed up at least once.
+    """
+    rng = random.Random(seed)
+    today = today or date(2025, 1, 1)
+    n_companies = max(1, n_contacts // 25) if n_companies is None else n_companies
+
+    def new_id():
+        return f"{rng.getrandbits(128):032x}"
+
+    city_weights = zipf_weights(len(CITY_OPTIONS), 0.8)
+    state_weights = _cumulative(US_STATES, STATE_WEIGHTS)
+    companies = []
+    while len(companies) < n_companies:
+        company_type = rng.choices(COMPANY_TYPES, cum_weights=zipf_weights(len(COMPANY_TYPES), 0.6))[0]
+        index = len(companies)
+        name = f"{COMPANY_WORDS[index % len(COMPANY_WORDS)]} {COMPANY_SUFFIXES[company_type]}"
+        if index >= len(COMPANY_WORDS):
+            name += f" {index // len(COMPANY_WORDS)}"
+        base = {
+            "name": name,
+            "stage": rng.choice(COMPANY_STAGES),
+            "type": company_type,
+            "sector": rng.choices(COMPANY_SECTORS, cum_weights=zipf_weights(len(COMPANY_SECTORS), 0.7))[0],
+            "website": f"https://www.{name.lower().replace(' ', '')}.com",
+            "description": "",
+        }
+        n_locations = rng.choice((2, 2, 3, 5)) if rng.random() < 0.125 else 1
+        for location in rng.choices(CITY_OPTIONS, cum_weights=city_weights, k=n_locations)[:n_companies - index]:
+            companies.append(dict(base, location=location, id=new_id(),
+                                  state=rng.choices(US_STATES, cum_weights=state_weights)[0]))
+
+    # A few large employers and a long tail of small ones
+    employers = rng.choices(companies, cum_weights=zipf_weights(len(companies), 0.8), k=n_contacts)
+    relationship_weights = _cumulative(RELATIONSHIP_TYPE_OPTIONS, RELATIONSHIP_WEIGHTS)
+    job_weights = zipf_weights(len(JOB_TITLE_OPTIONS), 0.7)
+    career_weights = zipf_weights(len(CAREER_OPTIONS), 0.9)
+    contacts = []
+    for i, company in enumerate(employers):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        relationship = rng.choices(RELATIONSHIP_TYPE_OPTIONS, cum_weights=relationship_weights)[0]
+        # Most contacts were reached in the last few months, a few years back at most
+        last_contact = today - timedelta(days=min(int(rng.expovariate(1 / 90)), 3 * 365))
+        at_office = rng.random() < 0.7
+        words = {"city": company["location"], "sector": company["sector"], "company": company["name"]}
+        contact = {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "phone": f"({rng.randrange(200, 1000)}) 555-{rng.randrange(10_000):04}",
+            "company": company["name"],
+            "tags": ", ".join(rng.sample(TAGS, rng.choice((0, 0, 0, 1, 1, 2)))),
+            "notes": rng.choice(NOTES).format(**words) if rng.random() < 0.4 else "",
+            "job_title": rng.choices(JOB_TITLE_OPTIONS, cum_weights=job_weights)[0],
+            "career": rng.choices(CAREER_OPTIONS, cum_weights=career_weights)[0],
+            "relationship_type": relationship,
+            "relationship_level": min(5, max(0, round(rng.gauss(2.5, 1.2)))),
+            "state": company["state"] if at_office else rng.choices(US_STATES, cum_weights=state_weights)[0],
+            "city": company["location"] if at_office else rng.choices(CITY_OPTIONS, cum_weights=city_weights)[0],
+            "last_contact": last_contact.isoformat() if rng.random() < 0.95 else "",
+            "id": new_id(),
+        }
+        if rng.random() < 0.3:
+            contact["birthday"] = date(rng.randrange(1950, 2003), rng.randrange(1, 13), rng.randrange(1, 29)).isoformat()
+        for stage in LEAD_STAGES:
+            if relationship.endswith(stage):
+                contact["lead_stage"] = stage
+        # Contacts further along have been followed up more often
+        followed_up = relationship not in ("Lead", "Lead - First Outreach", "Passive Friendship")
+        n_entries = int(rng.expovariate(1 / history)) + 1 if followed_up and history > 0 else 0
+        if n_entries:
+            entries = []
+            when = last_contact
+            for _ in range(n_entries):
+                stage = rng.choice(LEAD_STAGES)
+                entries.append({"date": f"{when.isoformat()} {rng.randrange(8, 19):02}:{rng.randrange(60):02}",
+                                "type": stage, "stage": stage, "note": rng.choice(HISTORY_NOTES).format(**words)})
+                when -= timedelta(days=rng.randrange(7, 60))
+            contact["history"] = entries[::-1]
+        contacts.append(contact)
+    return contacts, companies
+
+
+def write_book(path, contacts, companies, backend=None, snapshot_format="json"):
+    """Write a generated book as a fresh store at path (SQLite for a .db path unless backend says otherwise)."""
+    backend = backend or ("sqlite" if path.endswith(".db") else "json")
+    store = open_store(path, backend, snapshot_format)
+    if backend == "json":
+        # Nothing to keep: no fsyncs, and no backups of a book that can be generated again
+        store.fsync = False
+        store.backups = 0
+    store.write_snapshot(contacts, companies)
+    store.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4, 5):
+        sys.exit("usage: python benchmarks/synthetic.py contacts.json contacts [companies] [seed]")
+    contacts, companies = generate(int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else None,
+                                   seed=int(sys.argv[4]) if len(sys.argv) > 4 else 0)
+    write_book(sys.argv[1], contacts, companies)
+    print(f"Wrote {len(contacts)} contacts and {len(companies)} companies to {sys.argv[1]}")
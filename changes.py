@@ -0,0 +1,22 @@
+from collections import namedtuple
+
+# inserted/updated hold the affected records, deleted holds record ids
+Change = namedtuple("Change", "kind inserted updated deleted")
+
+
+class ChangeFeed:
+    """Row-level change notifications from the data layer to the UI."""
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def publish(self, kind, inserted=(), updated=(), deleted=()):
+        change = Change(kind, tuple(inserted), tuple(updated), tuple(deleted))
+        for callback in list(self._subscribers):
+            callback(change)
@@ -0,0 +1,262 @@
+from array import array
+from datetime import date, datetime
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the bitmap fallback needs only the stdlib
+    np = None
+
+CATEGORICAL_COLUMNS = ("state", "relationship_type", "company", "career")
+# Compact the columns once more than this share of rows are deleted
+MAX_DEAD_FRACTION = 0.5
+# With bitmaps, extend rebuilds them once for a batch of at least BULK_EXTEND_ROWS rows that is
+# also at least BULK_EXTEND_SHARE of the table. Setting a row's bits copies each bitmap, so adding
+# rows one by one costs batch x table size, while a rebuild costs the table size but more per row
+BULK_EXTEND_ROWS = 10_000
+BULK_EXTEND_SHARE = 0.5
+
+
+def day_number(value):
+    """last_contact as a date ordinal, or 0 if it is missing or malformed."""
+    if not value:
+        return 0
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+def _bitmap(rows, size):
+    bits = bytearray((size + 7) // 8)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _bitmap_rows(mask):
+    # bin() is little-endian once reversed, so string positions are row numbers
+    bits = bin(mask)[:1:-1]
+    row = bits.find("1")
+    while row != -1:
+        yield row
+        row = bits.find("1", row + 1)
+
+
+class ContactColumns:
+    """Column-oriented copy of the contact list for Data Search filters.
+
+    state, relationship_type, company and career are dictionary-encoded: each
+    row stores a small integer code and ``values[column]`` maps codes back to
+    strings. last_contact is stored as a day number. A query turns each
+    filter into a boolean mask over all rows and ANDs them, so a multi-filter
+    search never touches the contact dicts until the matching rows are read.
+
+    With numpy the masks are arrays; without it, each (column, value) keeps a
+    bitmap of its rows in a Python int and masks are combined with ``&``.
+    Deleted rows are tombstoned and the columns are compacted once they pile
+    up. Each code also keeps a count of its live rows, so the values in use
+    (``present``) are known without a query. Call add/update/remove around
+    every contact mutation.
+    """
+
+    def __init__(self, contacts=()):
+        self.rebuild(contacts)
+
+    def rebuild(self, contacts):
+        self.records = []
+        self.values = {column: [] for column in CATEGORICAL_COLUMNS}
+        self._codes = {column: {} for column in CATEGORICAL_COLUMNS}
+        self._columns = {column: array("l") for column in CATEGORICAL_COLUMNS}
+        self._counts = {column: array("l") for column in CATEGORICAL_COLUMNS}
+        self._days = array("l")
+        self._live = array("b")
+        self._rows = {}
+        self._dead = 0
+        self._arrays = None
+        self._bitmaps = None
+        for contact in contacts:
+            self._append_row(contact)
+        if np is None:
+            self._build_bitmaps()
+
+    def _code(self, column, value):
+        value = value or ""
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.values[column])
+            self.values[column].append(value)
+            self._counts[column].append(0)
+            if self._bitmaps is not None:
+                self._bitmaps[column].append(0)
+        return code
+
+    def _append_row(self, contact):
+        row = len(self.records)
+        self.records.append(contact)
+        self._rows[contact["id"]] = row
+        for column in CATEGORICAL_COLUMNS:
+            code = self._code(column, contact.get(column))
+            self._columns[column].append(code)
+            self._counts[column][code] += 1
+        self._days.append(day_number(contact.get("last_contact")))
+        self._live.append(1)
+        return row
+
+    def _build_bitmaps(self):
+        size = len(self.records)
+        self._bitmaps = {}
+        for column in CATEGORICAL_COLUMNS:
+            rows_by_code = [[] for _ in self.values[column]]
+            for row, code in enumerate(self._columns[column]):
+                if self._live[row]:
+                    rows_by_code[code].append(row)
+            self._bitmaps[column] = [_bitmap(rows, size) for rows in rows_by_code]
+        self._live_bitmap = _bitmap((row for row, live in enumerate(self._live) if live), size)
+
+    def add(self, contact):
+        if contact["id"] in self._rows:
+            self.update(contact)
+            return
+        row = self._append_row(contact)
+        self._arrays = None
+        if np is None:
+            bit = 1 << row
+            for column in CATEGORICAL_COLUMNS:
+                self._bitmaps[column][self._columns[column][row]] |= bit
+            self._live_bitmap |= bit
+
+    def extend(self, contacts):
+        """Add many contacts at once; with bitmaps, a large batch (see BULK_EXTEND_ROWS) rebuilds them once instead of per row."""
+        contacts = list(contacts)
+        if np is not None or len(contacts) < max(BULK_EXTEND_ROWS, BULK_EXTEND_SHARE * len(self.records)):
+            for contact in contacts:
+                self.add(contact)
+            return
+        for contact in contacts:
+            if contact["id"] in self._rows:
+                self.update(contact)
+            else:
+                self._append_row(contact)
+        self._arrays = None
+        if np is None:
+            self._build_bitmaps()
+
+    def update(self, contact):
+        row = self._rows.get(contact["id"])
+        if row is None:
+            self.add(contact)
+            return
+        self.records[row] = contact
+        for column in CATEGORICAL_COLUMNS:
+            old = self._columns[column][row]
+            new = self._code(column, contact.get(column))
+            if new != old:
+                self._columns[column][row] = new
+                self._counts[column][old] -= 1
+                self._counts[column][new] += 1
+                if np is None:
+                    bit = 1 << row
+                    self._bitmaps[column][old] &= ~bit
+                    self._bitmaps[column][new] |= bit
+        self._days[row] = day_number(contact.get("last_contact"))
+        self._arrays = None
+
+    def remove(self, contact_id):
+        row = self._rows.pop(contact_id, None)
+        if row is None:
+            return
+        self._live[row] = 0
+        self.records[row] = None
+        self._dead += 1
+        self._arrays = None
+        for column in CATEGORICAL_COLUMNS:
+            self._counts[column][self._columns[column][row]] -= 1
+        if np is None:
+            bit = 1 << row
+            for column in CATEGORICAL_COLUMNS:
+                self._bitmaps[column][self._columns[column][row]] &= ~bit
+            self._live_bitmap &= ~bit
+        if self._dead > len(self.records) * MAX_DEAD_FRACTION:
+            self.rebuild([record for record in self.records if record is not None])
+
+    def __len__(self):
+        return len(self._rows)
+
+    def present(self, column):
+        """The values of column that at least one contact has, in first-seen order."""
+        return [value for value, count in zip(self.values[column], self._counts[column]) if count]
+
+    def _numpy_arrays(self):
+        if self._arrays is None:
+            self._arrays = {column: np.frombuffer(self._columns[column], dtype=self._columns[column].typecode).copy()
+                            for column in CATEGORICAL_COLUMNS}
+            self._arrays["last_contact"] = np.frombuffer(self._days, dtype=self._days.typecode).copy()
+            self._arrays["live"] = np.frombuffer(self._live, dtype=np.int8).astype(bool)
+        return self._arrays
+
+    def mask(self, contacted_after=None, contacted_before=None, **filters):
+        """Rows matching every filter: column=value for the categorical columns,
+        plus an inclusive last_contact range given as dates. None skips a filter."""
+        if np is not None:
+            arrays = self._numpy_arrays()
+            mask = arrays["live"].copy()
+            for column, value in filters.items():
+                if value is not None:
+                    code = self._codes[column].get(value)
+                    if code is None:
+                        return np.zeros(len(self.records), dtype=bool)
+                    mask &= arrays[column] == code
+            if contacted_after is not None:
+                mask &= arrays["last_contact"] >= contacted_after.toordinal()
+            if contacted_before is not None:
+                mask &= arrays["last_contact"] <= contacted_before.toordinal()
+            return mask
+        mask = self._live_bitmap
+        for column, value in filters.items():
+            if value is not None:
+                code = self._codes[column].get(value)
+                if code is None:
+                    return 0
+                mask &= self._bitmaps[column][code]
+        if contacted_after is not None or contacted_before is not None:
+            # Dates are not bitmapped; check the rows that survived the other filters
+            low = contacted_after.toordinal() if contacted_after is not None else 1
+            high = contacted_before.toordinal() if contacted_before is not None else date.max.toordinal()
+            mask = _bitmap((row for row in _bitmap_rows(mask) if low <= self._days[row] <= high), len(self.records))
+        return mask
+
+    def rows(self, mask):
+        if np is not None:
+            return np.flatnonzero(mask).tolist()
+        return list(_bitmap_rows(mask))
+
+    def select(self, mask):
+        """The contacts in mask, in insertion order."""
+        records = self.records
+        return [records[row] for row in self.rows(mask)]
+
+    def count(self, mask):
+        if np is not None:
+            return int(np.count_nonzero(mask))
+        return bin(mask).count("1")
+
+    def count_by(self, column, mask):
+        """{value: number of rows in mask with that value}, omitting zeros."""
+        values = self.values[column]
+        if np is not None:
+            counts = np.bincount(self._numpy_arrays()[column][mask], minlength=len(values))
+            return {values[code]: int(n) for code, n in enumerate(counts) if n}
+        counts = {}
+        for code, bitmap in enumerate(self._bitmaps[column]):
+            n = bin(bitmap & mask).count("1")
+            if n:
+                counts[values[code]] = n
+        return counts
+
+    def query(self, **filters):
+        return self.select(self.mask(**filters))
@@ -0,0 +1,412 @@
+from datetime import datetime
+
+from changes import ChangeFeed
+from columns import ContactColumns
+from indexes import CompanyAggregates
+from profiling import TRACER
+from records import Company, Contact
+from scheduler import FollowUpScheduler
+from search import SearchIndex
+from startup import load_derived, save_derived
+from storage import new_id, open_store
+from writebehind import WriteBehind
+
+# Relationship types and their follow-up rules
+RELATIONSHIP_TYPES = {
+    "Passive Friendship": None,  # No reminders
+    "Lead": {
+        "stages": {
+            "First Outreach": 0,  # Immediate
+            "First Follow-up": 7,  # 7 days
+            "Second Follow-up": 7,  # 7 days after previous
+            "Third Follow-up": 7   # 7 days after previous (optional)
+        }
+    },
+    "Professional Relationship": {
+        "maintenance": 120,  # 120 days (4 months)
+        "recurring": True  # This will keep recurring every 4 months
+    }
+}
+LEAD_STAGES = list(RELATIONSHIP_TYPES["Lead"]["stages"])
+
+# Choices offered by the forms and filters
+JOB_TITLE_OPTIONS = [
+    "Intern", "Analyst", "Associate", "Senior Associate", "Vice President", "VP", "Director", "Senior Director", "Executive Director", "Managing Director", "MD", "Partner", "Principal", "CEO", "CFO", "COO", "CTO", "CIO", "CMO", "Chairman", "President", "Owner", "Founder", "Co-Founder", "Boss", "Manager", "Team Lead", "Head of", "Consultant", "Advisor", "Board Member", "Staff", "Engineer", "Developer", "Designer", "Product Manager", "Project Manager", "Business Development", "Sales", "Marketing", "Operations", "HR", "Legal", "Other"
+]
+CAREER_OPTIONS = [
+    "Entrepreneur", "Investment Banker", "Private Equity", "Venture Capital", "Startup Founder", "Corporate Executive", "Family Office", "Hedge Fund Manager", "Consultant", "Management Consultant", "Strategy Consultant", "Accountant", "Auditor", "Lawyer", "Attorney", "Engineer", "Software Engineer", "Product Manager", "Project Manager", "Sales", "Marketing", "Operations", "Human Resources", "Recruiter", "Real Estate", "Insurance", "Healthcare", "Doctor", "Nurse", "Pharmacist", "Scientist", "Researcher", "Professor", "Teacher", "Student", "Government", "Nonprofit", "Philanthropy", "Artist", "Musician", "Writer", "Designer", "Other"
+]
+US_STATES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming", "International", "Global"
+]
+COMPANY_STAGES = [
+    "Pre-Seed", "Seed", "Series A", "Series B", "Series C", "Series D", "Public", "Private"
+]
+COMPANY_TYPES = [
+    "Investment Bank", "Private Equity", "Venture Capital", "Startup", "Corporate", "Family Office", "Hedge Fund", "Real Estate", "Other"
+]
+COMPANY_SECTORS = [
+    "Technology", "Healthcare", "Finance", "Real Estate", "Consumer", "Energy", "Industrial", "Telecom", "Education", "Other"
+]
+CITY_OPTIONS = [
+    "New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose", "Austin", "Jacksonville", "Fort Worth", "Columbus", "Charlotte", "San Francisco", "Indianapolis", "Seattle", "Denver", "Washington", "Boston", "El Paso", "Nashville", "Detroit", "Oklahoma City", "Portland", "Las Vegas", "Memphis", "Louisville", "Baltimore", "Milwaukee", "Albuquerque", "Tucson", "Fresno", "Mesa", "Sacramento", "Atlanta", "Kansas City", "Colorado Springs", "Miami", "Raleigh", "Omaha", "Long Beach", "Virginia Beach", "Oakland", "Minneapolis", "Tulsa", "Arlington", "Tampa", "New Orleans", "Wichita", "Cleveland", "Bakersfield", "Aurora", "Anaheim", "Honolulu", "Santa Ana", "Riverside", "Corpus Christi", "Lexington", "Stockton", "Henderson", "Saint Paul", "St. Louis", "Cincinnati", "Pittsburgh", "Greensboro", "Anchorage", "Plano", "Lincoln", "Orlando", "Irvine", "Newark", "Toledo", "Durham", "Chula Vista", "Fort Wayne", "Jersey City", "St. Petersburg", "Laredo", "Madison", "Chandler", "Buffalo", "Lubbock", "Scottsdale", "Reno", "Glendale", "Gilbert", "Winston–Salem", "North Las Vegas", "Norfolk", "Chesapeake", "Garland", "Irving", "Hialeah", "Fremont", "Boise", "Richmond"
+]
+RELATIONSHIP_TYPE_OPTIONS = [
+    "Lead",
+    "Passive Friendship",
+    "Lead - First Outreach",
+    "Lead - First Follow-up",
+    "Lead - Second Follow-up",
+    "Lead - Third Follow-up",
+    "Professional Relationship",
+    "Dead Lead"
+]
+
+
+def is_lead(contact):
+    return contact.get("relationship_type", "").startswith("Lead")
+
+
+class ContactBook:
+    """The contact book and everything derived from it, without any UI.
+
+    Holds the contacts and companies, keeps the indexes (company counts,
+    Data Search columns, follow-up schedule, search index) in step with
+    every edit, persists edits through a write-behind queue and publishes
+    them on ``changes``. The Tk app is a client of this class; batch jobs
+    and benchmarks can use it directly:
+
+        book = ContactBook.open("contacts.json").load()
+        book.add_contact({"name": "Ada", "relationship_type": "Lead"})
+        book.close()
+
+    load() reads the book in one go. A UI that wants to stay responsive runs
+    read() and build_indexes() on a worker thread and install() on its own.
+    Edits raise ValueError for invalid data and KeyError for unknown ids.
+    """
+
+    def __init__(self, store, save_window=0.5):
+        self.store = store
+        self.writer = WriteBehind(store, save_window)
+        self.changes = ChangeFeed()
+        self.contacts = []
+        self.companies = []
+        self.contacts_by_id = {}
+        self.companies_by_id = {}
+        self.loaded = False
+        # Empty until the book is loaded
+        self.company_aggregates = CompanyAggregates()
+        self.contact_columns = ContactColumns()
+        self.follow_ups = FollowUpScheduler(RELATIONSHIP_TYPES)
+        self.search_index = SearchIndex()
+        # Data derived from the book last session stands in until it is loaded
+        self._derived_fingerprint = store.fingerprint()
+        self.derived = load_derived(self.derived_cache_path(), self._derived_fingerprint)
+
+    @classmethod
+    def open(cls, path, backend="json", snapshot_format="json", save_window=0.5):
+        return cls(open_store(path, backend, snapshot_format), save_window)
+
+    def derived_cache_path(self):
+        return self.store.path + ".cache"
+
+    def search_index_path(self):
+        # The search index is persisted next to the data it was built from
+        return self.store.path + ".search"
+
+    def load(self, on_contacts=None):
+        contacts, companies = self.read(on_contacts)
+        self.install(contacts, companies, self.build_indexes(contacts))
+        return self
+
+    @TRACER.traced("book.read")
+    def read(self, on_contacts=None):
+        """Replay snapshot + journal into (contacts, companies); legacy files are migrated in place.
+
+        on_contacts(batch) is called with the snapshot's contacts as they are parsed.
+        """
+        return self.store.load({"contacts": Contact.from_stored, "companies": Company}, on_contacts=on_contacts)
+
+    @TRACER.traced("book.build_indexes")
+    def build_indexes(self, contacts):
+        fingerprint = self.store.fingerprint()
+        search_index = SearchIndex.load(self.search_index_path(), fingerprint, contacts)
+        if search_index is None:
+            search_index = SearchIndex(contacts)
+        # Loading can rewrite the snapshot (e.g. to add ids), which also invalidates the cache
+        if self.derived is not None and fingerprint == self._derived_fingerprint:
+            aggregates = CompanyAggregates.from_state(self.derived["aggregates"])
+        else:
+            aggregates = CompanyAggregates(contacts)
+        return (aggregates, ContactColumns(contacts),
+                FollowUpScheduler(RELATIONSHIP_TYPES, contacts), search_index)
+
+    def install(self, contacts, companies, indexes):
+        self.contacts = contacts
+        self.companies = companies
+        self.contacts_by_id = {contact["id"]: contact for contact in contacts}
+        self.companies_by_id = {company["id"]: company for company in companies}
+        self.company_aggregates, self.contact_columns, self.follow_ups, self.search_index = indexes
+        self.loaded = True
+
+    def _check_loaded(self):
+        # Edits wait for the whole book (and its journal) to be loaded
+        if not self.loaded:
+            raise RuntimeError("The contact book is still loading")
+
+    # Contacts
+
+    def add_contact(self, data):
+        self._check_loaded()
+        if not data.get("name"):
+            raise ValueError("Name is required")
+        contact = Contact(data, id=new_id())
+        self.contacts.append(contact)
+        self.contacts_by_id[contact["id"]] = contact
+        self._commit_contact(contact)
+        return contact
+
+    def add_contacts(self, records):
+        """Add many contacts at once, e.g. from an import, and return them.
+
+        The indexes are extended in bulk and subscribers get one change for
+        the lot. Nothing is added if any record has no name.
+        """
+        self._check_loaded()
+        if not all(data.get("name") for data in records):
+            raise ValueError("Name is required")
+        contacts = [Contact(data, id=new_id()) for data in records]
+        self.contacts.extend(contacts)
+        for contact in contacts:
+            self.contacts_by_id[contact["id"]] = contact
+            self.company_aggregates.add(contact)
+            self.follow_ups.update(contact)
+            self.writer.put("contacts", contact)
+        self.contact_columns.extend(contacts)
+        self.search_index.extend(contacts)
+        self.changes.publish("contacts", inserted=contacts)
+        return contacts
+
+    def update_contact(self, contact_id, data):
+        self._check_loaded()
+        contact = self.contacts_by_id[contact_id]
+        if not data.get("name"):
+            raise ValueError("Name is required")
+        # Edit the record in place so every index holding it stays valid, field by field
+        # so a reader on another thread (e.g. an export) never sees it emptied
+        previous = contact.copy()
+        for key in [key for key in contact if key not in data and key != "id"]:
+            del contact[key]
+        contact.update(data, id=contact_id)
+        self._commit_contact(contact, previous)
+        return contact
+
+    def delete_contact(self, contact_id):
+        self._check_loaded()
+        contact = self.contacts_by_id.pop(contact_id)
+        self.contacts.remove(contact)
+        self.company_aggregates.remove(contact)
+        self.contact_columns.remove(contact_id)
+        self.follow_ups.remove(contact_id)
+        self.search_index.remove(contact_id)
+        self.writer.delete("contacts", contact_id)
+        self.changes.publish("contacts", deleted=[contact_id])
+
+    def _commit_contact(self, contact, previous=None):
+        # Persist a new or edited contact, keep the indexes in step and notify subscribers
+        if previous is not None:
+            self.company_aggregates.remove(previous)
+        self.company_aggregates.add(contact)
+        self.contact_columns.update(contact)
+        self.follow_ups.update(contact)
+        self.search_index.update(contact)
+        self.writer.put("contacts", contact)
+        if previous is None:
+            self.changes.publish("contacts", inserted=[contact])
+        else:
+            self.changes.publish("contacts", updated=[contact])
+
+    def complete_task(self, contact_id, responded=None):
+        """Mark the follow-up for a contact as done and return the contact.
+
+        A lead moves on by whether they responded: to a Professional
+        Relationship if they did, otherwise to the next lead stage, or to
+        Dead Lead after the last one. Other contacts are left as they are.
+        """
+        self._check_loaded()
+        contact = self.contacts_by_id[contact_id]
+        if not is_lead(contact):
+            return contact
+        if responded is None:
+            raise ValueError("Completing a lead's follow-up needs to know whether they responded")
+        for stage in LEAD_STAGES:
+            if stage in contact.get("relationship_type", ""):
+                current_stage = stage
+                break
+        else:
+            current_stage = LEAD_STAGES[0]
+        index = LEAD_STAGES.index(current_stage)
+        previous = dict(contact)
+        if responded:
+            contact["relationship_type"] = "Professional Relationship"
+            contact.pop("lead_stage", None)
+        elif index + 1 < len(LEAD_STAGES):
+            next_stage = LEAD_STAGES[index + 1]
+            contact["relationship_type"] = f"Lead - {next_stage}"
+            contact["lead_stage"] = next_stage
+        else:
+            contact["relationship_type"] = "Dead Lead"
+            contact.pop("lead_stage", None)
+        contact["last_contact"] = datetime.now().strftime("%Y-%m-%d")
+        self._commit_contact(contact, previous)
+        return contact
+
+    # Companies
+
+    def add_company(self, data):
+        self._check_loaded()
+        if not data.get("name"):
+            raise ValueError("Company name is required!")
+        company = Company(data, id=new_id())
+        self.companies.append(company)
+        self.companies_by_id[company["id"]] = company
+        self.writer.put("companies", company)
+        self.changes.publish("companies", inserted=[company])
+        return company
+
+    def update_company(self, company_id, data):
+        self._check_loaded()
+        company = self.companies_by_id[company_id]
+        if not data.get("name"):
+            raise ValueError("Company name is required!")
+        company.clear()
+        company.update(data, id=company_id)
+        self.writer.put("companies", company)
+        self.changes.publish("companies", updated=[company])
+        return company
+
+    def delete_company(self, company_id):
+        self._check_loaded()
+        company = self.companies_by_id.pop(company_id)
+        self.companies.remove(company)
+        self.writer.delete("companies", company_id)
+        self.changes.publish("companies", deleted=[company_id])
+
+    # Queries
+
+    def company_names(self):
+        return sorted({c.get("name", "") for c in self.companies if c.get("name")})
+
+    @TRACER.traced("book.search_contacts")
+    def search_contacts(self, query):
+        """Contacts matching every word of query, or all of them while it has
+        no word long enough to search for (e.g. one letter)."""
+        return self.search_index.search(query) if self.search_index.can_search(query) else self.contacts.copy()
+
+    @TRACER.traced("book.tasks")
+    def tasks(self, now=None):
+        """Follow-up entries, earliest due first: Overdue, then Upcoming, then Done."""
+        return self.follow_ups.ordered(now)
+
+    def overdue_count(self, now=None):
+        return self.follow_ups.overdue_count(now)
+
+    def company_row(self, company):
+        """Companies table row; stats for the company-location come from the maintained index."""
+        _, leads, professionals = self.company_aggregates.location_totals(company.get("name"), company.get("location"))
+        stats = f"Leads: {leads}, Professional Relationships: {professionals}"
+        return (
+            company.get("name", ""),
+            company.get("location", ""),
+            company.get("state", ""),
+            company.get("stage", ""),
+            company.get("type", ""),
+            company.get("sector", ""),
+            company.get("website", ""),
+            stats
+        )
+
+    @TRACER.traced("book.business_rows")
+    def business_rows(self, filters, companies=None):
+        """Data Search rows for the companies matching filters ({field: value or None}).
+
+        Safe to run on a worker thread over a copy of ``companies``.
+        """
+        rows = []
+        for company in self.companies if companies is None else companies:
+            if any(value is not None and company.get(name, "") != value for name, value in filters.items()):
+                continue
+            # Contact counts across all of the company's locations
+            total_contacts, leads, professionals = self.company_aggregates.company_totals(company.get("name"))
+            rows.append((
+                company.get("name", ""),
+                company.get("state", ""),
+                company.get("location", ""),
+                company.get("sector", ""),
+                company.get("type", ""),
+                company.get("stage", ""),
+                company.get("website", ""),
+                total_contacts,
+                leads,
+                professionals
+            ))
+        return rows
+
+    def contact_company_names(self):
+        """The companies named by at least one contact, sorted (Data Search's company filter)."""
+        return sorted(name for name in self.contact_columns.present("company") if name)
+
+    @property
+    def filters_in_store(self):
+        """Whether filter_contacts queries the store (which may wait on disk) rather than the columns."""
+        return hasattr(self.store, "query_contact_ids")
+
+    @TRACER.traced("book.filter_contacts")
+    def filter_contacts(self, **filters):
+        """Contacts matching the column filters (state, relationship_type, company,
+        career; None skips one) and their counts by relationship type.
+
+        A store that can query its own indexes (SQLite) answers once every edit
+        has been written to it; otherwise the contact columns do.
+        """
+        if self.filters_in_store and self.flush(wait=True):
+            by_id = self.contacts_by_id
+            ids = self.store.query_contact_ids(**{column: value for column, value in filters.items() if value is not None})
+            # May run on a worker: a contact deleted since the query is left out
+            contacts = [contact for contact in map(by_id.get, ids) if contact is not None]
+            by_type = {}
+            for contact in contacts:
+                relationship_type = contact.get("relationship_type") or ""
+                by_type[relationship_type] = by_type.get(relationship_type, 0) + 1
+            return contacts, by_type
+        mask = self.contact_columns.mask(**filters)
+        return self.contact_columns.select(mask), self.contact_columns.count_by("relationship_type", mask)
+
+    # Persistence
+
+    def flush(self, wait=False):
+        return self.writer.flush(wait)
+
+    def save(self):
+        """Rewrite the whole snapshot from the book as it is now.
+
+        Serializes the live records, so it runs on the thread that edits the
+        book; edits still queued for the writer are kept by the store.
+        """
+        with TRACER.span("book.snapshot", contacts=len(self.contacts)):
+            self.store.write_snapshot(self.contacts, self.companies)
+
+    def close(self):
+        """Write queued edits, close the store and cache what was derived from
+        the book for next time. Returns True if every edit was written."""
+        written = self.writer.close()
+        self.store.close()
+        if self.loaded:
+            fingerprint = self.store.fingerprint()
+            self.search_index.save(self.search_index_path(), fingerprint)
+            save_derived(self.derived_cache_path(), fingerprint, {
+                "company_names": self.company_names(),
+                "aggregates": self.company_aggregates.to_state(),
+                "overdue_count": self.follow_ups.overdue_count(),
+            })
+        return written
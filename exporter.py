@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".xlsx": "xlsx"}
+# Contacts are exported with the headings importer.py reads back
+CONTACT_FIELDS = (
+    "name", "email", "phone", "company", "job_title", "career", "relationship_type", "relationship_level",
+    "state", "city", "last_contact", "birthday", "tags", "notes",
+)
+# In the order of ContactBook.business_rows
+BUSINESS_FIELDS = (
+    "name", "state", "location", "sector", "type", "stage", "website", "total_contacts", "leads", "professionals",
+)
+
+
+def heading(field):
+    return field.replace("_", " ").title()
+
+
+def export_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Can only export to {', '.join(EXPORT_FORMATS)} files, not {os.path.basename(path)}")
+    return EXPORT_FORMATS[extension]
+
+
+def export_rows(path, fields, rows):
+    """Write rows (sequences in the order of fields) to path as CSV, JSON Lines or
+    XLSX, chosen by its extension, and return how many were written.
+
+    Rows are written as they are taken from the iterable, so memory use does
+    not grow with their number; the file appears only once it is complete.
+    """
+    writer = _WRITERS[export_format(path)]
+    tmp_path = path + ".tmp"
+    try:
+        count = writer(tmp_path, fields, rows)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def export_records(path, fields, records):
+    """export_rows for records (e.g. contacts), one row of the fields of each."""
+    return export_rows(path, fields, (tuple(record.get(field, "") for field in fields) for record in records))
+
+
+def _write_csv(path, fields, rows):
+    count = 0
+    # utf-8-sig so spreadsheet programs detect the encoding
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([heading(field) for field in fields])
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_jsonl(path, fields, rows):
+    count = 0
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(encode(dict(zip(fields, row))))
+            f.write("\n")
+            count += 1
+    return count
+
+
+# The smallest workbook Excel, LibreOffice and Numbers open: one sheet of inline strings
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Results" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+# XML 1.0 has no way to write most control characters
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return "<c/>"
+    if type(value) in (int, float):
+        return f"<c><v>{value}</v></c>"
+    text = _XML_ILLEGAL.sub("", escape(str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _write_xlsx(path, fields, rows):
+    count = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as workbook:
+        for name, xml in _XLSX_PARTS.items():
+            workbook.writestr(name, xml)
+        # Streamed into the archive; force_zip64 because the sheet's size is not known up front
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as raw:
+            sheet = io.TextIOWrapper(raw, encoding="utf-8")
+            sheet.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            sheet.write("<row>" + "".join(_xlsx_cell(heading(field)) for field in fields) + "</row>")
+            for row in rows:
+                sheet.write("<row>" + "".join(_xlsx_cell(value) for value in row) + "</row>")
+                count += 1
+            sheet.write("</sheetData></worksheet>")
+            sheet.flush()
+            sheet.detach()
+    return count
+
+
+_WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "xlsx": _write_xlsx}
@@ -0,0 +1,221 @@
+import csv
+import re
+from datetime import datetime
+
+from core import CAREER_OPTIONS, CITY_OPTIONS, JOB_TITLE_OPTIONS, RELATIONSHIP_TYPE_OPTIONS, US_STATES
+
+# Column headings (lowercased, "_" and "-" read as spaces) recognised for each contact field
+COLUMN_ALIASES = {
+    "name": ("name", "full name", "display name", "contact name"),
+    "first_name": ("first name", "given name"),
+    "last_name": ("last name", "family name", "surname"),
+    "email": ("email", "e mail", "email address", "e mail address", "e mail 1 value", "email 1"),
+    "phone": ("phone", "phone number", "mobile", "mobile phone", "business phone", "telephone", "phone 1 value"),
+    "company": ("company", "organization", "organisation", "organization 1 name", "employer"),
+    "job_title": ("job title", "title", "position", "role", "organization 1 title"),
+    "career": ("career", "industry", "profession"),
+    "relationship_type": ("relationship", "relationship type"),
+    "relationship_level": ("relationship level", "level"),
+    "state": ("state", "region", "province", "business state", "home state"),
+    "city": ("city", "business city", "home city", "locality"),
+    "last_contact": ("last contact", "last contacted"),
+    "birthday": ("birthday", "birth date", "date of birth"),
+    "tags": ("tags", "labels", "categories", "group membership"),
+    "notes": ("notes", "note", "comments"),
+}
+_FIELDS_BY_HEADING = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+STATE_ABBREVIATIONS = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California", "CO": "Colorado",
+    "CT": "Connecticut", "DE": "Delaware", "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana",
+    "ME": "Maine", "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York", "NC": "North Carolina",
+    "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania",
+    "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas",
+    "UT": "Utah", "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+    "WI": "Wisconsin", "WY": "Wyoming",
+}
+# Imported values are matched to the app's own spelling of these, ignoring case
+_CANONICAL = {
+    field: {option.lower(): option for option in options}
+    for field, options in (("job_title", JOB_TITLE_OPTIONS), ("career", CAREER_OPTIONS),
+                           ("relationship_type", RELATIONSHIP_TYPE_OPTIONS), ("state", US_STATES),
+                           ("city", CITY_OPTIONS))
+}
+_CANONICAL["state"].update((abbreviation.lower(), state) for abbreviation, state in STATE_ABBREVIATIONS.items())
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y%m%d", "%d.%m.%Y", "%b %d, %Y", "%B %d, %Y")
+
+
+def _heading_key(heading):
+    return " ".join(re.sub(r"[_\-]", " ", heading.strip().lower()).split())
+
+
+def _iso_date(value):
+    # Unrecognised dates are kept as they were written
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return value
+
+
+def normalize(contact):
+    """Tidy an imported contact in place and return it: trimmed values, the
+    app's spelling of known options (state abbreviations too) and ISO dates."""
+    first = contact.pop("first_name", "")
+    last = contact.pop("last_name", "")
+    for field, value in list(contact.items()):
+        value = value.strip()
+        if not value:
+            del contact[field]
+            continue
+        canonical = _CANONICAL.get(field)
+        if canonical is not None:
+            value = canonical.get(value.lower(), value)
+        elif field in ("last_contact", "birthday"):
+            value = _iso_date(value)
+        contact[field] = value
+    if not contact.get("name"):
+        name = " ".join(part.strip() for part in (first, last) if part.strip())
+        if name:
+            contact["name"] = name
+    return contact
+
+
+def read_csv(f):
+    """Contacts from CSV text, one per row; columns are matched by heading (see COLUMN_ALIASES)."""
+    reader = csv.reader(f)
+    headings = next(reader, [])
+    columns = [(i, _FIELDS_BY_HEADING[_heading_key(heading)]) for i, heading in enumerate(headings)
+               if _heading_key(heading) in _FIELDS_BY_HEADING]
+    for row in reader:
+        contact = {}
+        for i, field in columns:
+            if i < len(row) and row[i] and field not in contact:
+                contact[field] = row[i]
+        yield normalize(contact)
+
+
+def _unfolded_lines(f):
+    # vCard continues a long line on the next one, indented by a space or tab
+    line = None
+    for raw in f:
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw
+    if line is not None:
+        yield line
+
+
+def _vcard_text(value):
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _vcard_parts(value):
+    return [_vcard_text(part) for part in re.split(r"(?<!\\);", value)]
+
+
+def read_vcard(f):
+    """Contacts from vCard (2.1-4.0) text, one per BEGIN:VCARD ... END:VCARD block."""
+    contact = None
+    for line in _unfolded_lines(f):
+        name, _, value = line.partition(":")
+        # Drop a group prefix ("item1.EMAIL") and parameters ("TEL;TYPE=cell")
+        prop = name.split(";")[0].rsplit(".", 1)[-1].upper()
+        if prop == "BEGIN" and value.upper() == "VCARD":
+            contact = {}
+        elif contact is None:
+            continue
+        elif prop == "END":
+            yield normalize(contact)
+            contact = None
+        elif prop == "FN":
+            contact.setdefault("name", _vcard_text(value))
+        elif prop == "N":
+            parts = _vcard_parts(value) + [""] * 2
+            contact.setdefault("last_name", parts[0])
+            contact.setdefault("first_name", parts[1])
+        elif prop == "EMAIL":
+            contact.setdefault("email", value)
+        elif prop == "TEL":
+            contact.setdefault("phone", value)
+        elif prop == "ORG":
+            contact.setdefault("company", _vcard_parts(value)[0])
+        elif prop == "TITLE":
+            contact.setdefault("job_title", _vcard_text(value))
+        elif prop == "ADR":
+            parts = _vcard_parts(value) + [""] * 7
+            contact.setdefault("city", parts[3])
+            contact.setdefault("state", parts[4])
+        elif prop == "BDAY":
+            contact.setdefault("birthday", value)
+        elif prop == "CATEGORIES":
+            contact.setdefault("tags", ", ".join(_vcard_parts(value.replace(",", ";"))))
+        elif prop == "NOTE":
+            contact.setdefault("notes", _vcard_text(value))
+
+
+def read_contacts(path):
+    """Stream the contacts in a CSV or vCard (.vcf/.vcard) file."""
+    reader = read_vcard if path.lower().endswith((".vcf", ".vcard")) else read_csv
+    # utf-8-sig drops the byte order mark spreadsheet programs put at the start of a CSV
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        yield from reader(f)
+
+
+def duplicate_key(contact):
+    """Contacts with the same email, or without one the same name and company, are duplicates."""
+    email = (contact.get("email") or "").strip().lower()
+    if email:
+        return email
+    return ((contact.get("name") or "").strip().lower(), (contact.get("company") or "").strip().lower())
+
+
+def plan_import(path, existing=(), on_progress=None, progress_every=5000):
+    """Read the contacts to import from path, leaving out duplicates of existing
+    contacts and of earlier rows and rows without a name.
+
+    Returns (contacts, stats) with stats counting "rows", "duplicates" and
+    "skipped". on_progress(rows) is called every progress_every rows; the
+    whole plan may run on a worker thread.
+    """
+    seen = {duplicate_key(contact) for contact in existing}
+    contacts = []
+    stats = {"rows": 0, "duplicates": 0, "skipped": 0}
+    for contact in read_contacts(path):
+        stats["rows"] += 1
+        if on_progress is not None and stats["rows"] % progress_every == 0:
+            on_progress(stats["rows"])
+        if not contact.get("name"):
+            stats["skipped"] += 1
+            continue
+        key = duplicate_key(contact)
+        if key in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(key)
+        contacts.append(contact)
+    return contacts, stats
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from core import ContactBook
+    if len(sys.argv) != 3:
+        sys.exit("usage: python importer.py contacts.json people.csv|people.vcf")
+    started = time.perf_counter()
+    book = ContactBook.open(sys.argv[1]).load()
+    contacts, stats = plan_import(sys.argv[2], book.contacts)
+    book.add_contacts(contacts)
+    if not book.close():
+        sys.exit(f"Some contacts could not be saved: {book.writer.error}")
+    print(f"Imported {len(contacts)} of {stats['rows']} contacts ({stats['duplicates']} duplicates, "
+          f"{stats['skipped']} without a name) in {time.perf_counter() - started:.1f}s")
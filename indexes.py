@@ -0,0 +1,85 @@
+def normalize(value):
+    return (value or "").strip().lower()
+
+
+def company_key(name, location):
+    return (normalize(name), normalize(location))
+
+
+def contact_company_key(contact):
+    return company_key(contact.get("company"), contact.get("city") or contact.get("location"))
+
+
+def contact_category(contact):
+    """Classify a contact for company stats: "lead", "professional" or None."""
+    relationship_type = contact.get("relationship_type") or ""
+    if "lead" in relationship_type.lower():
+        return "lead"
+    if relationship_type == "Professional Relationship":
+        return "professional"
+    return None
+
+
+class CompanyAggregates:
+    """Contact counts per company and per (company, location), kept incrementally.
+
+    Each bucket holds the total number of contacts plus how many are leads and
+    professional relationships. Call add/remove around every contact mutation;
+    the Companies page and Data Search then read a row's numbers in O(1).
+    """
+
+    def __init__(self, contacts=()):
+        self.rebuild(contacts)
+
+    def rebuild(self, contacts):
+        self._by_company = {}
+        self._by_location = {}
+        for contact in contacts:
+            self.add(contact)
+
+    def add(self, contact):
+        self._adjust(contact, 1)
+
+    def remove(self, contact):
+        self._adjust(contact, -1)
+
+    def _adjust(self, contact, delta):
+        key = contact_company_key(contact)
+        category = contact_category(contact)
+        for buckets, bucket_key in ((self._by_company, key[0]), (self._by_location, key)):
+            counts = buckets.get(bucket_key)
+            if counts is None:
+                counts = buckets[bucket_key] = {"total": 0, "lead": 0, "professional": 0}
+            counts["total"] += delta
+            if category is not None:
+                counts[category] += delta
+
+    def to_state(self):
+        """JSON-friendly copy of the counts, for the startup cache."""
+        return {
+            "companies": {name: self._as_tuple(counts) for name, counts in self._by_company.items()},
+            "locations": [[name, location, *self._as_tuple(counts)] for (name, location), counts in self._by_location.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        aggregates = cls()
+        for name, (total, leads, professionals) in state["companies"].items():
+            aggregates._by_company[name] = {"total": total, "lead": leads, "professional": professionals}
+        for name, location, total, leads, professionals in state["locations"]:
+            aggregates._by_location[(name, location)] = {"total": total, "lead": leads, "professional": professionals}
+        return aggregates
+
+    @staticmethod
+    def _as_tuple(counts):
+        if counts is None:
+            return 0, 0, 0
+        return counts["total"], counts["lead"], counts["professional"]
+
+    def company_totals(self, name):
+        """Return (total, leads, professionals) across every location of a company."""
+        return self._as_tuple(self._by_company.get(normalize(name)))
+
+    def location_totals(self, name, location):
+        """Return (total, leads, professionals) for a company at one location."""
+        return self._as_tuple(self._by_location.get(company_key(name, location)))
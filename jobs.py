@@ -0,0 +1,112 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import TRACER
+
+
+def _run(key, work):
+    if not TRACER.enabled:
+        return work()
+    with TRACER.span(f"job {key}"):
+        return work()
+
+
+class Job:
+    """A piece of work submitted to an Executor under a key."""
+
+    __slots__ = ("key", "done", "error", "future", "cancelled")
+
+    def __init__(self, key, done, error):
+        self.key = key
+        self.done = done
+        self.error = error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop the job's result; the work is skipped entirely if it has not started."""
+        self.cancelled = True
+        self.future.cancel()
+
+
+class Executor:
+    """Runs work on worker threads and hands results back on the Tk thread.
+
+    ``submit(key, work, done)`` calls work() on a pool thread and then
+    done(result) from a ``root.after`` poll, so done may touch widgets. A
+    newer job under the same key supersedes the older one: the older job is
+    cancelled and its result dropped, so only the latest request for a view
+    ever reaches the screen. Exceptions go to error(exception) if given,
+    otherwise to Tk's report_callback_exception.
+    """
+
+    POLL_MS = 20
+
+    def __init__(self, root, workers=2):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker")
+        self._finished = queue.Queue()
+        self._latest = {}
+        self._outstanding = 0
+        self._poll_id = None
+
+    def submit(self, key, work, done=None, error=None):
+        self.cancel(key)
+        job = self._latest[key] = Job(key, done, error)
+        self._outstanding += 1
+        job.future = self._pool.submit(_run, key, work)
+        # Runs on the worker (or here, if the future is already done); the queue is the only hand-off
+        job.future.add_done_callback(lambda future: self._finished.put(job))
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+        return job
+
+    def cancel(self, key):
+        """Cancel the pending job under key. Returns True if there was one."""
+        job = self._latest.pop(key, None)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def pending(self, key):
+        return key in self._latest
+
+    def shutdown(self):
+        """Cancel pending jobs and wait for the ones already running."""
+        for key in list(self._latest):
+            self.cancel(key)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            self._deliver(job)
+        if self._outstanding:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def _deliver(self, job):
+        if self._latest.get(job.key) is job:
+            del self._latest[job.key]
+        if job.cancelled:
+            return
+        try:
+            exception = job.future.exception()
+            if exception is None:
+                if job.done is not None:
+                    job.done(job.future.result())
+            elif job.error is not None:
+                job.error(exception)
+            else:
+                raise exception
+        except Exception as e:
+            # One failing callback must not stop the others from being delivered
+            self.root.report_callback_exception(type(e), e, e.__traceback__)
@@ -0,0 +1,175 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Opt-in timing spans around the app's hot paths.
+
+    While ``enabled`` is False, span() hands back a shared no-op context
+    manager and traced() functions cost one attribute check, so the
+    instrumentation stays in place. Enabled, every span is kept in a ring
+    buffer of the last ``capacity`` events and folded into per-name totals
+    for the diagnostics panel; export() writes the buffer as Chrome
+    trace-event JSON (chrome://tracing or ui.perfetto.dev). Spans may be
+    recorded from any thread.
+    """
+
+    def __init__(self, enabled=False, capacity=100_000):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)
+        self._stats = {}
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def traced(self, name):
+        """Decorator recording a span named name around every call."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, start_ns, duration_ns, args=None):
+        thread = threading.get_ident()
+        with self._lock:
+            if thread not in self._thread_names:
+                self._thread_names[thread] = threading.current_thread().name
+            self.events.append(("X", name, thread, start_ns, duration_ns, args))
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = [1, duration_ns, duration_ns, duration_ns]
+            else:
+                stats[0] += 1
+                stats[1] += duration_ns
+                stats[2] = max(stats[2], duration_ns)
+                stats[3] = duration_ns
+
+    def counter(self, name, value):
+        with self._lock:
+            self.events.append(("C", name, threading.get_ident(), time.perf_counter_ns(), 0, {name: value}))
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self._stats.clear()
+
+    def summary(self):
+        """(name, count, total ms, mean ms, max ms, last ms) per span name, largest total first."""
+        with self._lock:
+            stats = [(name, count, total / 1e6, total / count / 1e6, longest / 1e6, last / 1e6)
+                     for name, (count, total, longest, last) in self._stats.items()]
+        return sorted(stats, key=lambda row: row[2], reverse=True)
+
+    def export(self, path):
+        """Write the buffered events to path as Chrome trace-event JSON; returns how many."""
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+        pid = os.getpid()
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+                 for thread, name in thread_names.items()]
+        for phase, name, thread, start_ns, duration_ns, args in events:
+            event = {"name": name, "ph": phase, "pid": pid, "tid": thread, "ts": start_ns / 1000}
+            if phase == "X":
+                event["dur"] = duration_ns / 1000
+            if args:
+                event["args"] = args
+            trace.append(event)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, path)
+        return len(events)
+
+
+# Shared by the app, the book and the worker threads
+TRACER = Tracer()
+
+
+class LoopLagMonitor:
+    """Measures how late Tk runs a callback scheduled every ``interval_ms``.
+
+    The lag is how long the event loop was busy with something else: a
+    frozen window shows up as lag. Each tick records an "event loop lag"
+    counter and lags of at least ``stall_ms`` are also recorded as an
+    "event loop stall" span. Runs only while the tracer is enabled.
+    """
+
+    def __init__(self, root, tracer=TRACER, interval_ms=100, stall_ms=50):
+        self.root = root
+        self.tracer = tracer
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._after_id = None
+        self._due = None
+
+    def start(self):
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def reset(self):
+        self.last_lag_ms = self.max_lag_ms = 0.0
+
+    def _schedule(self):
+        self._due = time.perf_counter_ns() + self.interval_ms * 1_000_000
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if not self.tracer.enabled:
+            return
+        lag_ns = max(0, time.perf_counter_ns() - self._due)
+        self.last_lag_ms = lag_ns / 1e6
+        self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+        self.tracer.counter("event loop lag (ms)", round(self.last_lag_ms, 3))
+        if self.last_lag_ms >= self.stall_ms:
+            self.tracer.record("event loop stall", self._due, lag_ns)
+        self._schedule()
@@ -0,0 +1,220 @@
+import json
+import sys
+from collections.abc import MutableMapping
+from datetime import date
+
+_MISSING = object()
+
+
+class Deferred:
+    """A stored value kept as JSON text until it is first read."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def load(self):
+        return json.loads(self.text)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _to_date(value):
+    # Only canonical YYYY-MM-DD strings are parsed, so anything else round-trips untouched
+    if type(value) is str and len(value) == 10:
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            return value
+        if parsed.isoformat() == value:
+            return parsed
+    return value
+
+
+class Record(MutableMapping):
+    """Base for the slotted record types.
+
+    A record behaves like the dict it was loaded from: known keys live in
+    slots (an unset slot is a missing key) and any other key goes to
+    ``_extra``, so every record written back out has the same keys and
+    values it was read with. Subclasses list their keys in ``FIELDS`` and
+    may name fields whose values are interned or stored as ``date``.
+    Dates read back through the mapping interface as YYYY-MM-DD strings;
+    attribute access returns the parsed value. A ``Deferred`` value is
+    decoded the first time it is read through the mapping interface.
+    Records compare by identity, not by their keys and values as a dict would.
+    """
+
+    __slots__ = ("_extra",)
+    # Mapping's __eq__ compares every key, which made list.remove scan and decode the whole book
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    FIELDS = ()
+    INTERNED = ()
+    DATES = ()
+    CONVERTERS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(cls.FIELDS)
+        converters = {field: _intern for field in cls.INTERNED}
+        converters.update((field, _to_date) for field in cls.DATES)
+        converters.update(cls.CONVERTERS)
+        cls._converters = converters
+
+    def __init__(self, data=(), **kwargs):
+        self._extra = None
+        data = dict(data, **kwargs)
+        # Inlined __setitem__: this runs once per field of every record at load time
+        fields = self._fields
+        converters = self._converters
+        for key, value in data.items():
+            if key in fields:
+                converter = converters.get(key)
+                setattr(self, key, converter(value) if converter is not None else value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return self._export(key, value)
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._fields:
+            return self._export(key, getattr(self, key, default))
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def peek(self, key, default=None):
+        """Like get(), but a value not decoded yet comes back as its ``Deferred``."""
+        if key in self._fields:
+            value = getattr(self, key, default)
+            return value.isoformat() if type(value) is date else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def _export(self, key, value):
+        if type(value) is date:
+            return value.isoformat()
+        if type(value) is Deferred:
+            self[key] = value.load()
+            return getattr(self, key)
+        return value
+
+    def _stored(self, key):
+        # Like self[key], but leaves deferred values undecoded
+        if key in self._fields:
+            value = getattr(self, key)
+            return value.isoformat() if type(value) is date else value
+        return self._extra[key]
+
+    def copy(self):
+        """The record as a plain dict, like dict(record) but without going key by key."""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                data[field] = self._export(field, value)
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+    def __setitem__(self, key, value):
+        if key in self._fields:
+            converter = self._converters.get(key)
+            setattr(self, key, converter(value) if converter is not None else value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._fields:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._fields:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class HistoryEntry(Record):
+    __slots__ = FIELDS = ("date", "type", "stage", "note")
+    INTERNED = ("type", "stage")
+
+
+def _to_history(value):
+    # Converted in place so callers holding the list (e.g. via setdefault) see the same object
+    if type(value) is list:
+        for i, entry in enumerate(value):
+            if type(entry) is dict:
+                value[i] = HistoryEntry(entry)
+    return value
+
+
+class Contact(Record):
+    __slots__ = FIELDS = (
+        "name", "email", "phone", "company", "tags", "notes", "job_title", "career",
+        "relationship_type", "relationship_level", "state", "city", "last_contact",
+        "birthday", "lead_stage", "history", "id",
+    )
+    # relationship_level is a string in older files and an int once edited; interning keeps either as read
+    INTERNED = ("company", "job_title", "career", "relationship_type", "relationship_level", "state", "city",
+                "lead_stage")
+    DATES = ("last_contact", "birthday")
+    CONVERTERS = {"history": _to_history}
+
+    @classmethod
+    def from_stored(cls, data):
+        """Build a contact from stored data, keeping its history as JSON text until it is first read."""
+        history = data.get("history")
+        if history:
+            data["history"] = Deferred(json.dumps(history, separators=(",", ":")))
+        return cls(data)
+
+
+class Company(Record):
+    __slots__ = FIELDS = ("name", "location", "state", "stage", "type", "sector", "website", "description", "id")
+    INTERNED = ("location", "state", "stage", "type", "sector")
+
+
+def json_default(value):
+    """``default`` hook for json.dump(s): write records as the dicts they stand for."""
+    if isinstance(value, Record):
+        return {key: value._stored(key) for key in value}
+    if isinstance(value, Deferred):
+        # Decoded just for this write; the record keeps the JSON text
+        return value.load()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
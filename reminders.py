@@ -0,0 +1,51 @@
+import threading
+from datetime import datetime
+
+# Longest single wait: Condition.wait overflows past threading.TIMEOUT_MAX (about 49 days on Windows)
+MAX_WAIT = 3600
+
+
+class ReminderEngine:
+    """Background thread that announces follow-ups as they come due.
+
+    The thread sleeps on the scheduler's ``changed`` condition until the next
+    due date (or until a contact edit changes the schedule), then hands the
+    entries that came due to ``notify``. ``notify`` runs on the engine thread
+    without the scheduler's lock held; a GUI should only queue the entries
+    there and pick them up from its own thread.
+    """
+
+    def __init__(self, scheduler, notify):
+        self.scheduler = scheduler
+        self.notify = notify
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        self.scheduler.track_fired()
+        self.scheduler.take_fired()
+        self._thread = threading.Thread(target=self._run, name="ReminderEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self.scheduler.changed:
+            self._stopped = True
+            self.scheduler.changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self.scheduler.changed:
+                if self._stopped:
+                    return
+                fired = self.scheduler.take_fired(datetime.now())
+                if not fired:
+                    next_due = self.scheduler.next_due_date(datetime.now())
+                    timeout = MAX_WAIT
+                    if next_due is not None:
+                        timeout = min(MAX_WAIT, max(0.0, (next_due - datetime.now()).total_seconds()))
+                    # Returns early when the schedule changes; otherwise right as the next entry comes due
+                    self.scheduler.changed.wait(timeout)
+                    continue
+            self.notify([entry for _, entry in fired])
@@ -0,0 +1,213 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+
+class FollowUp:
+    __slots__ = ("contact_id", "name", "task_type", "notes", "anchor", "interval", "due", "recurring")
+
+    def __init__(self, contact_id, name, task_type, notes, anchor, interval, recurring):
+        self.contact_id = contact_id
+        self.name = name
+        self.task_type = task_type
+        self.notes = notes
+        self.anchor = anchor
+        self.interval = interval
+        self.recurring = recurring
+        self.due = anchor + interval
+
+    def next_due(self, now):
+        """First occurrence strictly after now, in closed form (anchor + k * interval)."""
+        if self.anchor > now:
+            return self.anchor
+        periods = (now - self.anchor) // self.interval + 1
+        return self.anchor + periods * self.interval
+
+    def status(self, now):
+        days_left = (self.due - now).days
+        if self.due < now:
+            return "Overdue", days_left
+        if days_left <= 2:
+            return "Upcoming", days_left
+        return "Done", days_left
+
+
+class FollowUpScheduler:
+    """Due-date min-heap of follow-up tasks, one entry per contact id.
+
+    Entries are recomputed only when a contact changes (update/remove). Heap
+    items for replaced entries are left in place and skipped when they reach
+    the top. Once an entry comes due it leaves the heap: one-off lead
+    follow-ups move to the overdue set, and recurring maintenance check-ins
+    are rolled forward to their next occurrence, in O(log n) each. The heap
+    top is therefore always the next future due date.
+
+    All methods are safe to call from any thread. ``changed`` is notified on
+    every update/remove so a waiting thread can recompute its deadline.
+    """
+
+    def __init__(self, relationship_types, contacts=()):
+        self.lead_stages = list(relationship_types["Lead"]["stages"].keys())
+        self.lead_interval = timedelta(days=7)
+        self.maintenance_interval = timedelta(days=relationship_types["Professional Relationship"]["maintenance"])
+        self._lock = threading.RLock()
+        self.changed = threading.Condition(self._lock)
+        self._fired = None
+        # Bumped whenever ordered() would return something different
+        self.version = 0
+        self.rebuild(contacts)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rebuild(self, contacts):
+        with self._lock:
+            self._entries = {}
+            self._overdue = {}
+            self._heap = []
+            self._counter = itertools.count()
+            self._ordered = None
+            self.version += 1
+            now = datetime.now()
+            for contact in contacts:
+                entry = self._make_entry(contact, now)
+                if entry is None:
+                    continue
+                self._entries[entry.contact_id] = entry
+                if entry.due <= now:
+                    self._overdue[entry.contact_id] = entry
+                else:
+                    self._heap.append((entry.due, next(self._counter), entry))
+            heapq.heapify(self._heap)
+            self.changed.notify_all()
+
+    def update(self, contact):
+        with self._lock:
+            entry = self._make_entry(contact, datetime.now())
+            self._discard(contact["id"])
+            if entry is not None:
+                self._entries[entry.contact_id] = entry
+                heapq.heappush(self._heap, (entry.due, next(self._counter), entry))
+            self._ordered = None
+            self.version += 1
+            self.changed.notify_all()
+
+    def remove(self, contact_id):
+        with self._lock:
+            self._discard(contact_id)
+            self._ordered = None
+            self.version += 1
+            self.changed.notify_all()
+
+    def _discard(self, contact_id):
+        self._entries.pop(contact_id, None)
+        self._overdue.pop(contact_id, None)
+
+    def _make_entry(self, contact, now):
+        last_contact = contact.get("last_contact")
+        if not last_contact:
+            return None
+        relationship_type = contact.get("relationship_type", "Passive Friendship")
+        try:
+            last_contact_date = datetime.strptime(last_contact, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return None
+        name = contact.get("name", "")
+        # Treat any relationship_type that starts with 'Lead' as a lead
+        if relationship_type.startswith("Lead"):
+            for stage in self.lead_stages:
+                if stage in relationship_type:
+                    current_stage = stage
+                    break
+            else:
+                current_stage = self.lead_stages[0]  # Default to First Outreach
+            # Due date is always 7 days after last_contact for the current stage
+            return FollowUp(contact["id"], name, current_stage, f"{current_stage} for {name}",
+                            last_contact_date, self.lead_interval, recurring=False)
+        if relationship_type == "Professional Relationship":
+            entry = FollowUp(contact["id"], name, "Maintenance", f"Regular check-in with {name}",
+                             last_contact_date, self.maintenance_interval, recurring=True)
+            entry.due = entry.next_due(now)
+            return entry
+        return None
+
+    def _is_live(self, entry):
+        return self._entries.get(entry.contact_id) is entry
+
+    def _roll(self, now):
+        # Pop everything that has come due: skip stale items, park one-off
+        # follow-ups as overdue and advance recurring check-ins
+        while self._heap and self._heap[0][0] <= now:
+            due, _, entry = heapq.heappop(self._heap)
+            if not self._is_live(entry) or due != entry.due:
+                continue
+            if self._fired is not None:
+                self._fired.append((due, entry))
+            if entry.recurring:
+                entry.due = entry.next_due(now)
+                heapq.heappush(self._heap, (entry.due, next(self._counter), entry))
+            else:
+                self._overdue[entry.contact_id] = entry
+            self._ordered = None
+            self.version += 1
+
+    def track_fired(self):
+        """Start recording entries as they come due, for take_fired()."""
+        with self._lock:
+            if self._fired is None:
+                self._fired = []
+
+    def take_fired(self, now=None):
+        """Return [(due, entry)] for entries that came due since the last call."""
+        with self._lock:
+            self._roll(now or datetime.now())
+            fired = self._fired or []
+            if self._fired is not None:
+                self._fired = []
+            return fired
+
+    def due_before(self, deadline, now=None):
+        """Entries due before deadline, earliest first, in O(k log n)."""
+        with self._lock:
+            now = now or datetime.now()
+            self._roll(now)
+            result = sorted((e for e in self._overdue.values() if e.due < deadline), key=lambda e: e.due)
+            popped = []
+            while self._heap and self._heap[0][0] < deadline:
+                item = heapq.heappop(self._heap)
+                if self._is_live(item[2]) and item[0] == item[2].due:
+                    popped.append(item)
+                    result.append(item[2])
+            for item in popped:
+                heapq.heappush(self._heap, item)
+            return result
+
+    def overdue(self, now=None):
+        now = now or datetime.now()
+        return self.due_before(now, now)
+
+    def overdue_count(self, now=None):
+        with self._lock:
+            self._roll(now or datetime.now())
+            return len(self._overdue)
+
+    def due_within(self, days, now=None):
+        now = now or datetime.now()
+        return self.due_before(now + timedelta(days=days), now)
+
+    def next_due_date(self, now=None):
+        """The next future due date, or None if nothing is scheduled."""
+        with self._lock:
+            self._roll(now or datetime.now())
+            while self._heap and not (self._is_live(self._heap[0][2]) and self._heap[0][0] == self._heap[0][2].due):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def ordered(self, now=None):
+        """All live entries, earliest due first (Overdue, then Upcoming, then Done)."""
+        with self._lock:
+            self._roll(now or datetime.now())
+            if self._ordered is None:
+                self._ordered = sorted(self._entries.values(), key=lambda entry: entry.due)
+            return self._ordered
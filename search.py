@@ -0,0 +1,186 @@
+import bisect
+import heapq
+import json
+import os
+import re
+
+from records import Deferred
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+# A token's score in a contact is the sum of the weights of the fields it appears in
+FIELD_WEIGHTS = {"name": 8, "email": 4, "company": 4, "tags": 3, "job_title": 2, "city": 2, "notes": 1}
+HISTORY_WEIGHT = 1
+# A prefix match counts for less than the whole word
+PREFIX_FACTOR = 0.5
+# Shorter terms prefix most of the vocabulary: they only narrow down what the longer terms match
+MIN_TERM_LENGTH = 2
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower()) if text else []
+
+
+def contact_tokens(contact):
+    tokens = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in set(tokenize(contact.get(field))):
+            tokens[token] = tokens.get(token, 0) + weight
+    history = contact.peek("history")
+    if type(history) is Deferred:
+        # Decoded just for its notes; the contact keeps the JSON text until the history is read
+        history = history.load()
+    history_tokens = set()
+    for entry in history or ():
+        history_tokens.update(tokenize(entry.get("note")))
+    for token in history_tokens:
+        tokens[token] = tokens.get(token, 0) + HISTORY_WEIGHT
+    return tokens
+
+
+class SearchIndex:
+    """Token-based inverted index over contact text fields, notes and history notes.
+
+    ``postings`` maps token -> {contact id: score} and ``vocabulary`` keeps the
+    tokens sorted so a query term matches every token it is a prefix of with
+    two bisects. Every query term must match (AND); results are ranked by the
+    summed scores. add/remove keep it current as contacts change.
+    """
+
+    def __init__(self, contacts=()):
+        self.documents = {}
+        self.postings = {}
+        self.vocabulary = []
+        self.records = {}
+        for contact in contacts:
+            self.records[contact["id"]] = contact
+            self.documents[contact["id"]] = contact_tokens(contact)
+        self._build_postings()
+
+    def _build_postings(self):
+        # Bulk path: fill postings first and sort the vocabulary once
+        for contact_id, tokens in self.documents.items():
+            for token, score in tokens.items():
+                self.postings.setdefault(token, {})[contact_id] = score
+        self.vocabulary = sorted(self.postings)
+
+    def add(self, contact):
+        contact_id = contact["id"]
+        if contact_id in self.documents:
+            self.remove(contact_id)
+        self.records[contact_id] = contact
+        tokens = contact_tokens(contact)
+        self.documents[contact_id] = tokens
+        self._post(contact_id, tokens)
+
+    def extend(self, contacts):
+        """Add many contacts at once, sorting new tokens into the vocabulary in one go."""
+        new_tokens = set()
+        for contact in contacts:
+            contact_id = contact["id"]
+            if contact_id in self.documents:
+                self.remove(contact_id)
+            self.records[contact_id] = contact
+            tokens = self.documents[contact_id] = contact_tokens(contact)
+            for token, score in tokens.items():
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = {}
+                    new_tokens.add(token)
+                posting[contact_id] = score
+        if new_tokens:
+            self.vocabulary = sorted(self.vocabulary + list(new_tokens))
+
+    def _post(self, contact_id, tokens):
+        for token, score in tokens.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                bisect.insort(self.vocabulary, token)
+            posting[contact_id] = score
+
+    def remove(self, contact_id):
+        self.records.pop(contact_id, None)
+        for token in self.documents.pop(contact_id, {}):
+            posting = self.postings[token]
+            posting.pop(contact_id, None)
+            if not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def update(self, contact):
+        self.add(contact)
+
+    def _term_scores(self, term):
+        scores = {}
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + "\U0010ffff", start)
+        for token in self.vocabulary[start:end]:
+            factor = 1.0 if token == term else PREFIX_FACTOR
+            for contact_id, score in self.postings[token].items():
+                score *= factor
+                if score > scores.get(contact_id, 0):
+                    scores[contact_id] = score
+        return scores
+
+    def can_search(self, query):
+        """Whether query has a term long enough to look up (see MIN_TERM_LENGTH)."""
+        return any(len(term) >= MIN_TERM_LENGTH for term in tokenize(query))
+
+    def search(self, query, limit=None):
+        """Return the contacts matching every term of query, best first.
+
+        Needs a term of at least MIN_TERM_LENGTH characters (see can_search);
+        shorter terms only filter its matches and add nothing to the ranking.
+        """
+        terms = set(tokenize(query))
+        short_terms = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+        terms.difference_update(short_terms)
+        if not terms:
+            return []
+        per_term = sorted((self._term_scores(term) for term in terms), key=len)
+        totals = dict(per_term[0])
+        for scores in per_term[1:]:
+            totals = {contact_id: total + scores[contact_id] for contact_id, total in totals.items() if contact_id in scores}
+            if not totals:
+                return []
+        if short_terms:
+            documents = self.documents
+            totals = {contact_id: total for contact_id, total in totals.items()
+                      if all(any(token.startswith(term) for token in documents[contact_id]) for term in short_terms)}
+        if limit is None:
+            ranked = sorted(totals, key=totals.get, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, totals, key=totals.get)
+        return [self.records[contact_id] for contact_id in ranked]
+
+    def matches(self, contact_id, query):
+        """True if the contact matches every term of query."""
+        tokens = self.documents.get(contact_id)
+        if tokens is None:
+            return False
+        return all(any(token.startswith(term) for token in tokens) for term in tokenize(query))
+
+    def save(self, path, fingerprint):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fingerprint": fingerprint, "documents": self.documents}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, fingerprint, contacts):
+        """Load a saved index if it was built from the same data, else return None."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("fingerprint") != fingerprint:
+            return None
+        index = cls()
+        index.documents = data["documents"]
+        index.records = {contact["id"]: contact for contact in contacts}
+        if index.records.keys() != index.documents.keys():
+            return None
+        index._build_postings()
+        return index
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+import time
+
+
+class StartupTimer:
+    """Wall-clock marks from process start until the book is loaded.
+
+    Marks may be recorded from any thread. ``report()`` prints them to stderr
+    when enabled (NETWORKING_RECORDER_STARTUP_REPORT=1).
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.start))
+
+    def format(self):
+        lines = ["Startup:"]
+        previous = 0.0
+        for name, elapsed in self.marks:
+            lines.append(f"  {name:<24} {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:.1f})")
+            previous = elapsed
+        return "\n".join(lines)
+
+    def report(self):
+        if self.enabled:
+            print(self.format(), file=sys.stderr)
+
+
+def load_derived(path, fingerprint):
+    """Return the cached derived data if it was saved for the same book, else None."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != fingerprint:
+        return None
+    return data.get("derived")
+
+
+def save_derived(path, fingerprint, derived):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"fingerprint": fingerprint, "derived": derived}, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
@@ -0,0 +1,824 @@
+import contextlib
+import gzip
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import uuid
+
+from records import json_default
+
+# Snapshots and their backups are compressed on every save, so favour speed over ratio
+COMPRESSLEVEL = 1
+# "json" is the indented contacts.json layout; "jsonl" is one compact [kind, record]
+# line per record after JSONL_HEADER; "jsonl.gz" is the same, gzipped
+SNAPSHOT_FORMATS = ("json", "jsonl", "jsonl.gz")
+JSONL_HEADER = b'{"format":"contacts.jsonl","version":1}\n'
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def new_id():
+    return uuid.uuid4().hex
+
+
+def ensure_ids(records):
+    """Give every record a stable id. Returns True if any id was added."""
+    added = False
+    for record in records:
+        if not record.get("id"):
+            record["id"] = new_id()
+            added = True
+    return added
+
+
+def detect_format(path):
+    """The snapshot format of an existing file, judged from its first bytes."""
+    with open(path, "rb") as f:
+        head = f.read(len(JSONL_HEADER))
+    if head.startswith(_GZIP_MAGIC):
+        return "jsonl.gz"
+    if head == JSONL_HEADER:
+        return "jsonl"
+    return "json"
+
+
+def read_snapshot(path):
+    """Read a snapshot in any format, accepting the legacy JSON layouts."""
+    if not os.path.exists(path):
+        return [], []
+    if detect_format(path) != "json":
+        contacts, companies = [], []
+        for kind, record in iter_snapshot(path):
+            (contacts if kind == "contacts" else companies).append(record)
+        return contacts, companies
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data, []
+    contacts = data.get("contacts", [])
+    # Convert old company format (list of strings) to new format (list of dicts)
+    companies = [{"name": c} if isinstance(c, str) else c for c in data.get("companies", [])]
+    return contacts, companies
+
+
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+class _StreamReader:
+    """Decodes JSON values one at a time from a file read in chunks."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """The next non-whitespace character, or "" at the end of the file."""
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if not self._fill():
+                return ""
+
+    def take(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the buffered snapshot")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off by the chunk boundary; read on and retry
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self, close):
+        """Iterate over an array (close="]") or object (close="}") already opened."""
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == close:
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or {close!r} in the snapshot, got {char!r}")
+
+
+def iter_snapshot(path, chunk_size=1 << 20):
+    """Yield ("contacts" | "companies", record) from a snapshot as it is read.
+
+    Records are decoded one at a time (from a sliding buffer for the JSON
+    format), so the first contacts are available long before a large file
+    is fully parsed. Accepts every format and the legacy JSON layouts.
+    """
+    if not os.path.exists(path):
+        return
+    snapshot_format = detect_format(path)
+    if snapshot_format != "json":
+        with (gzip.open if snapshot_format == "jsonl.gz" else open)(path, "rb") as f:
+            f.readline()
+            while True:
+                # About chunk_size bytes of lines per json.loads call
+                lines = f.readlines(chunk_size)
+                if not lines:
+                    return
+                for kind, record in json.loads(b"[" + b",".join(lines) + b"]"):
+                    yield kind, record
+    with open(path, "r") as f:
+        reader = _StreamReader(f, chunk_size)
+        char = reader.peek()
+        if char == "[":
+            reader.take("[")
+            for _ in reader.items("]"):
+                yield "contacts", reader.value()
+            return
+        reader.take("{")
+        for _ in reader.items("}"):
+            key = reader.value()
+            reader.take(":")
+            if key not in ("contacts", "companies") or reader.peek() != "[":
+                reader.value()
+                continue
+            reader.take("[")
+            for _ in reader.items("]"):
+                record = reader.value()
+                if key == "companies" and isinstance(record, str):
+                    record = {"name": record}
+                yield key, record
+
+
+class _Tee:
+    """Write-only file object that copies every write to several files."""
+
+    def __init__(self, *files):
+        self.files = files
+
+    def write(self, data):
+        for f in self.files:
+            f.write(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class _BlockWriter:
+    """File-like sink for json.dump that writes in blocks of about ``block_size``
+    characters, to the snapshot and optionally a gzip backup of the same bytes."""
+
+    def __init__(self, f, backup=None, block_size=1 << 20):
+        self.f = f
+        self.backup = backup
+        self.block_size = block_size
+        self.chunks = []
+        self.size = 0
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.size >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        data = "".join(self.chunks).encode()
+        self.chunks = []
+        self.size = 0
+        self.f.write(data)
+        if self.backup is not None:
+            self.backup.write(data)
+
+
+def _sync(f, fsync):
+    f.flush()
+    if fsync:
+        os.fsync(f.fileno())
+
+
+def backup_path(path, generation):
+    return f"{path}.{generation}.gz"
+
+
+def _dump_jsonl(contacts, companies, out):
+    encode = json.JSONEncoder(separators=(",", ":"), default=json_default).encode
+    out.write(JSONL_HEADER.decode())
+    for kind, records in (("contacts", contacts), ("companies", companies)):
+        for record in records:
+            out.write(encode([kind, record]))
+            out.write("\n")
+
+
+def write_snapshot(path, contacts, companies, backups=0, fsync=True, snapshot_format="json"):
+    """Atomically replace the snapshot: write a temp file, fsync, then rename.
+
+    With backups, the bytes are gzipped into a backup while they are written
+    (or, for jsonl.gz, copied as compressed), so the last ``backups``
+    snapshots are kept as ``<path>.1.gz`` (newest) to ``<path>.<backups>.gz``
+    without serializing the book a second time.
+    """
+    if snapshot_format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format: {snapshot_format}")
+    tmp_path = path + ".tmp"
+    backup_tmp = path + ".gz.tmp"
+    with contextlib.ExitStack() as stack:
+        f = stack.enter_context(open(tmp_path, "wb"))
+        raw = backup = None
+        if backups:
+            raw = stack.enter_context(open(backup_tmp, "wb"))
+        if snapshot_format == "jsonl.gz":
+            out = stack.enter_context(gzip.GzipFile(fileobj=_Tee(f, raw) if raw else f, mode="wb", compresslevel=COMPRESSLEVEL))
+        else:
+            out = f
+            if raw is not None:
+                backup = stack.enter_context(gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=COMPRESSLEVEL))
+        writer = _BlockWriter(out, backup)
+        if snapshot_format == "json":
+            json.dump({"contacts": contacts, "companies": companies}, writer, indent=2, default=json_default)
+        else:
+            _dump_jsonl(contacts, companies, writer)
+        writer.flush()
+        for compressed in (out, backup):
+            if compressed is not None and compressed is not f:
+                compressed.close()
+        _sync(f, fsync)
+        if raw is not None:
+            _sync(raw, fsync)
+    os.replace(tmp_path, path)
+    if backups:
+        # The snapshot is in place first: a crash before the rotation only loses the newest backup
+        for generation in range(backups, 1, -1):
+            if os.path.exists(backup_path(path, generation - 1)):
+                os.replace(backup_path(path, generation - 1), backup_path(path, generation))
+        os.replace(backup_tmp, backup_path(path, 1))
+
+
+def list_backups(path):
+    """[(generation, modified timestamp, size in bytes)] of the rolling backups, newest first."""
+    backups = []
+    generation = 1
+    while os.path.exists(backup_path(path, generation)):
+        stat = os.stat(backup_path(path, generation))
+        backups.append((generation, stat.st_mtime, stat.st_size))
+        generation += 1
+    return backups
+
+
+def restore_backup(path, generation=1, fsync=True):
+    """Replace the snapshot with rolling backup ``generation`` and drop the journal.
+
+    Edits journaled since that backup was taken are discarded. The backup is
+    decompressed straight into place; nothing is parsed. A jsonl.gz snapshot
+    comes back as plain jsonl, which loads the same way.
+    """
+    source = backup_path(path, generation)
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    tmp_path = path + ".tmp"
+    with gzip.open(source, "rb") as backup, open(tmp_path, "wb") as f:
+        shutil.copyfileobj(backup, f, 1 << 20)
+        _sync(f, fsync)
+    os.replace(tmp_path, path)
+    for stale in (path + ".journal", path + ".journal.compacting"):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def replay(records_by_kind, journal_path, record_types=None):
+    """Apply the entries of a journal file to {kind: {id: record}} in place.
+
+    record_types optionally maps a kind to a callable that builds its records.
+    Returns (entries applied, byte length of the valid prefix of the file).
+    """
+    if not os.path.exists(journal_path):
+        return 0, 0
+    applied = 0
+    valid_length = 0
+    with open(journal_path, "rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn trailing line from a crash mid-append; nothing after it was acknowledged
+                break
+            if not line.endswith(b"\n"):
+                break
+            valid_length += len(line)
+            applied += 1
+            records = records_by_kind.get(entry.get("kind"))
+            if records is None:
+                continue
+            if entry.get("op") == "put":
+                record = entry["record"]
+                if record_types and entry["kind"] in record_types:
+                    record = record_types[entry["kind"]](record)
+                records[record["id"]] = record
+            elif entry.get("op") == "delete":
+                records.pop(entry.get("id"), None)
+    return applied, valid_length
+
+
+class JournalStore:
+    """Snapshot + write-ahead journal storage for the contact book.
+
+    The snapshot keeps the contacts.json layout, so existing files load as-is.
+    Every mutation appends one line to ``<path>.journal``; once the journal
+    reaches ``compact_fraction`` of the snapshot's size (and at least
+    ``compact_min_bytes``) it is rotated and merged into a new snapshot on a
+    background thread, so the cost of rewriting the snapshot is spread over a
+    number of edits that grows with the book. Every snapshot written also becomes
+    the newest of ``backups`` rolling gzip backups (see restore_backup);
+    ``fsync=False`` skips the fsyncs for speed at the cost of durability.
+    Snapshots are written in ``snapshot_format`` and read in whichever
+    format the file is in, so switching formats converts on the next save.
+    """
+
+    def __init__(self, path, compact_fraction=0.5, compact_min_bytes=1 << 20, backups=5, fsync=True,
+                 snapshot_format="json"):
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format: {snapshot_format}")
+        self.path = path
+        self.snapshot_format = snapshot_format
+        self.backups = backups
+        self.fsync = fsync
+        self.journal_path = path + ".journal"
+        self.compacting_path = path + ".journal.compacting"
+        self.compact_fraction = compact_fraction
+        self.compact_min_bytes = compact_min_bytes
+        self._lock = threading.Lock()
+        self._journal = None
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+        self._compactor = None
+
+    def load(self, record_types=None, on_contacts=None, batch_size=1000):
+        """Read the snapshot and replay the journal; returns (contacts, companies).
+
+        record_types optionally maps "contacts"/"companies" to a callable that
+        builds a record from its dict. on_contacts(batch) is called with each
+        batch of snapshot contacts as it is parsed, before the journal is
+        applied, so a caller can show them while the rest of the file loads.
+        """
+        records_by_kind = {"contacts": {}, "companies": {}}
+        needs_rewrite = False
+        batch = []
+        for kind, record in iter_snapshot(self.path):
+            if record_types and kind in record_types:
+                record = record_types[kind](record)
+            if not record.get("id"):
+                record["id"] = new_id()
+                needs_rewrite = True
+            records_by_kind[kind][record["id"]] = record
+            if on_contacts is not None and kind == "contacts":
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    on_contacts(batch)
+                    batch = []
+        if batch:
+            on_contacts(batch)
+        # A leftover .compacting file means a merge was interrupted; replay it before the live journal
+        if os.path.exists(self.compacting_path):
+            replay(records_by_kind, self.compacting_path, record_types)
+            needs_rewrite = True
+        _, valid_length = replay(records_by_kind, self.journal_path, record_types)
+        self._journal_bytes = valid_length
+        self._snapshot_bytes = _file_size(self.path)
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > valid_length:
+            # Drop the torn tail so new entries start on a clean line
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(valid_length)
+        contacts = list(records_by_kind["contacts"].values())
+        companies = list(records_by_kind["companies"].values())
+        if needs_rewrite:
+            self.write_snapshot(contacts, companies)
+        return contacts, companies
+
+    def fingerprint(self):
+        """Identifies the persisted state, for validating caches derived from it."""
+        return [_file_signature(self.path), _file_signature(self.journal_path)]
+
+    def put(self, kind, record):
+        self.apply([("put", kind, record)])
+
+    def delete(self, kind, record_id):
+        self.apply([("delete", kind, record_id)])
+
+    def apply(self, ops):
+        """Journal ("put", kind, record) / ("delete", kind, id) ops with a single write and fsync."""
+        lines = []
+        for op, kind, value in ops:
+            if op == "put":
+                if not value.get("id"):
+                    value["id"] = new_id()
+                entry = {"op": "put", "kind": kind, "record": value}
+            else:
+                entry = {"op": "delete", "kind": kind, "id": value}
+            lines.append(json.dumps(entry, separators=(",", ":"), default=json_default) + "\n")
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a")
+            size = os.fstat(self._journal.fileno()).st_size
+            try:
+                self._journal.write("".join(lines))
+                _sync(self._journal, self.fsync)
+            except BaseException:
+                self._discard_journal_tail(size)
+                raise
+            self._journal_bytes = os.fstat(self._journal.fileno()).st_size
+            should_compact = self._journal_bytes >= max(self.compact_min_bytes,
+                                                        self.compact_fraction * self._snapshot_bytes)
+        if should_compact:
+            self.compact()
+
+    def _discard_journal_tail(self, size):
+        # A failed write (e.g. a full disk) can leave part of a line behind, and replay stops
+        # at a broken line: cut the journal back so a retry appends after the last whole entry
+        journal, self._journal = self._journal, None
+        try:
+            # Closing drops whatever the failed write left buffered, if need be by writing it out first
+            journal.close()
+        except OSError:
+            pass
+        os.truncate(self.journal_path, size)
+
+    def compact(self, wait=False):
+        """Rotate the journal and merge it into the snapshot in the background."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if not os.path.exists(self.journal_path) or os.path.exists(self.compacting_path):
+                return
+            os.replace(self.journal_path, self.compacting_path)
+            self._journal_bytes = 0
+            self._compactor = threading.Thread(target=self._merge, daemon=True)
+            self._compactor.start()
+        if wait:
+            self._compactor.join()
+
+    def _merge(self):
+        contacts, companies = read_snapshot(self.path)
+        records_by_kind = {
+            "contacts": {c["id"]: c for c in contacts},
+            "companies": {c["id"]: c for c in companies},
+        }
+        replay(records_by_kind, self.compacting_path)
+        write_snapshot(self.path, list(records_by_kind["contacts"].values()), list(records_by_kind["companies"].values()),
+                       self.backups, self.fsync, self.snapshot_format)
+        self._snapshot_bytes = _file_size(self.path)
+        os.remove(self.compacting_path)
+
+    def write_snapshot(self, contacts, companies):
+        """Write the full book as a new snapshot and discard the journal.
+
+        Runs on the calling thread, which must not be editing contacts or
+        companies meanwhile; journal writes from other threads wait for it.
+        """
+        self._wait_for_compactor()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            write_snapshot(self.path, contacts, companies, self.backups, self.fsync, self.snapshot_format)
+            # Also drops what an interrupted compaction set aside: the snapshot has it all
+            for path in (self.journal_path, self.compacting_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._journal_bytes = 0
+            self._snapshot_bytes = _file_size(self.path)
+
+    def close(self):
+        self._wait_for_compactor()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _wait_for_compactor(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+
+# Contact/Company columns follow frontend/prisma/schema.prisma; keys the Prisma
+# models don't have are extra columns, and anything unknown goes into "extra" as JSON.
+CONTACT_COLUMNS = {
+    "name": "name", "email": "email", "phone": "phone", "company": "company",
+    "job_title": "title", "notes": "notes", "career": "career",
+    "relationship_type": "relationship_type", "relationship_level": "relationship_level",
+    "state": "state", "city": "city", "birthday": "birthday",
+    "last_contact": "last_contact", "tags": "tags", "lead_stage": "lead_stage",
+}
+COMPANY_COLUMNS = {
+    "name": "name", "sector": "industry", "stage": "stage", "type": "type",
+    "location": "location", "state": "state", "website": "website", "description": "description",
+}
+HISTORY_COLUMNS = ("date", "type", "stage", "note")
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Contact (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    email TEXT, phone TEXT, company TEXT, title TEXT, notes TEXT,
+    career TEXT, relationship_type TEXT, relationship_level, state TEXT, city TEXT,
+    birthday TEXT, last_contact TEXT, tags TEXT, lead_stage TEXT, extra TEXT,
+    createdAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updatedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS Contact_name_idx ON Contact(name);
+CREATE INDEX IF NOT EXISTS Contact_company_idx ON Contact(company);
+CREATE INDEX IF NOT EXISTS Contact_state_idx ON Contact(state);
+CREATE INDEX IF NOT EXISTS Contact_relationship_type_idx ON Contact(relationship_type);
+CREATE INDEX IF NOT EXISTS Contact_last_contact_idx ON Contact(last_contact);
+CREATE TABLE IF NOT EXISTS Company (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    industry TEXT, stage TEXT, type TEXT, location TEXT, state TEXT,
+    website TEXT, description TEXT, extra TEXT,
+    createdAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updatedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS Company_name_idx ON Company(name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS ContactHistory (
+    contact_id TEXT NOT NULL REFERENCES Contact(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    date TEXT, type TEXT, stage TEXT, note TEXT, extra TEXT,
+    PRIMARY KEY (contact_id, seq)
+);
+"""
+
+
+class SQLiteStore:
+    """SQLite storage for the contact book, laid out like the frontend's Prisma schema.
+
+    Offers the same load/put/delete/apply/write_snapshot/close interface as
+    JournalStore, plus ``query_contacts``/``query_contact_ids`` for filtering
+    through the indexes without materializing the whole book.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        # Books created before the company index lost COLLATE NOCASE (which company = ? could not use)
+        index_sql = self._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'Contact_company_idx'").fetchone()
+        if index_sql and "NOCASE" in index_sql[0]:
+            self._conn.execute("DROP INDEX Contact_company_idx")
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def load(self, record_types=None, on_contacts=None, batch_size=1000):
+        record_types = record_types or {}
+        make_contact = record_types.get("contacts", dict)
+        make_company = record_types.get("companies", dict)
+        with self._lock:
+            history = {}
+            for row in self._conn.execute("SELECT * FROM ContactHistory ORDER BY contact_id, seq"):
+                history.setdefault(row["contact_id"], []).append(self._history_from_row(row))
+            contacts = []
+            for row in self._conn.execute("SELECT * FROM Contact ORDER BY position"):
+                contacts.append(make_contact(self._contact_from_row(row, history)))
+                if on_contacts is not None and len(contacts) % batch_size == 0:
+                    on_contacts(contacts[-batch_size:])
+            if on_contacts is not None and len(contacts) % batch_size:
+                on_contacts(contacts[-(len(contacts) % batch_size):])
+            companies = [make_company(self._company_from_row(row)) for row in self._conn.execute("SELECT * FROM Company ORDER BY position")]
+        return contacts, companies
+
+    def fingerprint(self):
+        # The -wal file comes and goes with the connection, so fold it into the database
+        # first and sign the database file alone; once closed, SQLite has already done so
+        with self._lock:
+            if not self._closed:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return _file_signature(self.path)
+
+    def query_contacts(self, **filters):
+        """Return contacts whose fields equal the given values, e.g. query_contacts(state="Arizona")."""
+        where, params = self._contact_filters(filters)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM Contact{where} ORDER BY position", params).fetchall()
+            ids = [row["id"] for row in rows]
+            history = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for h in self._conn.execute(f"SELECT * FROM ContactHistory WHERE contact_id IN ({marks}) ORDER BY contact_id, seq", chunk):
+                    history.setdefault(h["contact_id"], []).append(self._history_from_row(h))
+        return [self._contact_from_row(row, history) for row in rows]
+
+    def query_contact_ids(self, **filters):
+        """Like query_contacts, but only the ids, for finding the matches among records already loaded."""
+        where, params = self._contact_filters(filters)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(f"SELECT id FROM Contact{where} ORDER BY position", params)]
+
+    @staticmethod
+    def _contact_filters(filters):
+        # Plain equality, so the single-column indexes in SQLITE_SCHEMA apply
+        clauses = [f"{CONTACT_COLUMNS[key]} = ?" for key in filters]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), list(filters.values())
+
+    def put(self, kind, record):
+        self.apply([("put", kind, record)])
+
+    def delete(self, kind, record_id):
+        self.apply([("delete", kind, record_id)])
+
+    def apply(self, ops):
+        """Apply ("put", kind, record) / ("delete", kind, id) ops in one transaction."""
+        with self._lock, self._conn:
+            for op, kind, value in ops:
+                if op == "put":
+                    if not value.get("id"):
+                        value["id"] = new_id()
+                    self._put(kind, value)
+                else:
+                    self._delete(kind, value)
+
+    def write_snapshot(self, contacts, companies):
+        """Replace every row with the given book, in one transaction."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ContactHistory")
+            self._conn.execute("DELETE FROM Contact")
+            self._conn.execute("DELETE FROM Company")
+            ensure_ids(contacts)
+            ensure_ids(companies)
+            for contact in contacts:
+                self._put_contact(contact)
+            for company in companies:
+                self._put_company(company)
+
+    def _put(self, kind, record):
+        if kind == "contacts":
+            self._put_contact(record)
+        else:
+            self._put_company(record)
+
+    def _delete(self, kind, record_id):
+        table = "Contact" if kind == "contacts" else "Company"
+        self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+            self._closed = True
+
+    def _put_contact(self, record):
+        values, extra = _split_record(record, CONTACT_COLUMNS, ("id", "history"))
+        history = record.get("history")
+        if history == []:
+            extra["history"] = []
+        self._upsert("Contact", record["id"], record.get("name", ""), values, extra)
+        self._conn.execute("DELETE FROM ContactHistory WHERE contact_id = ?", (record["id"],))
+        for seq, entry in enumerate(history or []):
+            entry_extra = {k: v for k, v in entry.items() if k not in HISTORY_COLUMNS}
+            self._conn.execute(
+                "INSERT INTO ContactHistory (contact_id, seq, date, type, stage, note, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record["id"], seq, *(entry.get(k) for k in HISTORY_COLUMNS), json.dumps(entry_extra) if entry_extra else None),
+            )
+
+    def _put_company(self, record):
+        values, extra = _split_record(record, COMPANY_COLUMNS, ("id",))
+        self._upsert("Company", record["id"], record.get("name", ""), values, extra)
+
+    def _upsert(self, table, record_id, name, values, extra):
+        columns = ["id", "name"] + list(values) + ["extra"]
+        params = [record_id, name] + list(values.values()) + [json.dumps(extra) if extra else None]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+        self._conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}, updatedAt = CURRENT_TIMESTAMP",
+            params,
+        )
+
+    @staticmethod
+    def _history_from_row(row):
+        entry = {k: row[k] for k in HISTORY_COLUMNS if row[k] is not None}
+        if row["extra"]:
+            entry.update(json.loads(row["extra"]))
+        return entry
+
+    @staticmethod
+    def _contact_from_row(row, history):
+        record = _join_record(row, CONTACT_COLUMNS)
+        if row["id"] in history:
+            record["history"] = history[row["id"]]
+        return record
+
+    @staticmethod
+    def _company_from_row(row):
+        return _join_record(row, COMPANY_COLUMNS)
+
+
+def _split_record(record, columns, skip):
+    # Every mapped column gets a value so an upsert clears keys the record no longer has
+    values = {column: None for key, column in columns.items() if key != "name"}
+    extra = {}
+    for key, value in record.items():
+        if key in skip or key == "name":
+            continue
+        if key in columns:
+            values[columns[key]] = value
+        else:
+            extra[key] = value
+    return values, extra
+
+
+def _join_record(row, columns):
+    record = {"id": row["id"], "name": row["name"]}
+    for key, column in columns.items():
+        if key != "name" and row[column] is not None:
+            record[key] = row[column]
+    if row["extra"]:
+        record.update(json.loads(row["extra"]))
+    return record
+
+
+def open_store(path, backend="json", snapshot_format="json"):
+    if backend == "sqlite":
+        return SQLiteStore(path)
+    if backend == "json":
+        return JournalStore(path, snapshot_format=snapshot_format)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def migrate_json_to_sqlite(json_path, db_path):
+    """One-shot import of a contacts.json book (plus any journal) into a SQLite database."""
+    contacts, companies = JournalStore(json_path).load()
+    store = SQLiteStore(db_path)
+    store.write_snapshot(contacts, companies)
+    store.close()
+    return len(contacts), len(companies)
+
+
+if __name__ == "__main__":
+    import sys
+    from datetime import datetime
+    usage = ("usage: python storage.py migrate contacts.json contacts.db\n"
+             "       python storage.py backups contacts.json\n"
+             "       python storage.py restore contacts.json [generation]")
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "migrate" and len(sys.argv) == 4:
+        n_contacts, n_companies = migrate_json_to_sqlite(sys.argv[2], sys.argv[3])
+        print(f"Migrated {n_contacts} contacts and {n_companies} companies to {sys.argv[3]}")
+    elif command == "backups" and len(sys.argv) == 3:
+        for generation, modified, size in list_backups(sys.argv[2]):
+            print(f"{generation:3}  {datetime.fromtimestamp(modified):%Y-%m-%d %H:%M:%S}  {size:>12,} bytes")
+    elif command == "restore" and len(sys.argv) in (3, 4):
+        generation = int(sys.argv[3]) if len(sys.argv) == 4 else 1
+        restore_backup(sys.argv[2], generation)
+        print(f"Restored {sys.argv[2]} from {backup_path(sys.argv[2], generation)}; journaled edits since then were discarded")
+    else:
+        sys.exit(usage)
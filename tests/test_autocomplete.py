@@ -0,0 +1,49 @@
+import random
+
+from autocomplete import AutocompleteIndex
+
+WORDS = ["acme", "harbor", "granite", "north", "wind", "blue", "bird", "Zq", "capital", "partners"]
+
+
+def live_options(index):
+    return [option for option in index.options if option is not None]
+
+
+def test_lookup_finds_exact_prefix_and_substring_matches():
+    index = AutocompleteIndex(["Acme Capital", "Blue Harbor", "Harbor Partners", "Northwind", "acme capital"], limit=10)
+    assert index.lookup("acme capital") == ["Acme Capital"]
+    assert index.lookup("harb") == ["Harbor Partners", "Blue Harbor"]
+    assert index.lookup("rt") == ["Harbor Partners", "Northwind"]
+    assert index.lookup("w") == ["Northwind"]
+    assert index.lookup("zzz") == index.lookup("") == live_options(index)
+
+
+def test_add_and_remove_match_a_rebuilt_index():
+    rng = random.Random(4)
+    names = [" ".join(rng.sample(WORDS, 2)).title() if rng.random() < 0.9 else rng.choice(WORDS) for _ in range(300)]
+    index = AutocompleteIndex(sorted(names[:150]), limit=20)
+    present = list(names[:150])
+    for _ in range(1000):
+        if rng.random() < 0.5 or not present:
+            name = rng.choice(names)
+            index.add(name)
+            present.append(name)
+        else:
+            name = present.pop(rng.randrange(len(present)))
+            index.remove(name)
+    assert sorted(live_options(index)) == sorted(set(present))
+    rebuilt = AutocompleteIndex(live_options(index), limit=20)
+    for query in ["", "a", "zq", "ar", "acm", "harbor", "nd bl", "wind blue", "Bird Granite", "x"]:
+        assert index.lookup(query) == rebuilt.lookup(query), query
+
+
+def test_a_name_shared_by_several_companies_stays_until_the_last_is_removed():
+    index = AutocompleteIndex(["Acme", "Acme", "Bolt"])
+    index.remove("Acme")
+    assert index.lookup("acm") == ["Acme"]
+    index.remove("Acme")
+    assert "Acme" not in index.lookup("")
+    index.add("ACME")
+    index.add("acme")
+    index.remove("ACME")
+    assert index.lookup("acme") == ["acme"]
@@ -0,0 +1,182 @@
+import random
+from datetime import date
+
+import pytest
+
+import columns
+from columns import ContactColumns
+from records import Contact, Deferred
+from search import SearchIndex, tokenize
+
+STATES = ["California", "Texas", "New York", "Ohio"]
+COMPANIES = ["Acme Capital", "Blue Harbor Partners", "Cobalt Labs", ""]
+CAREERS = ["Finance", "Engineering", "Law"]
+RELATIONSHIPS = ["Lead", "Lead - First Follow-up", "Professional Relationship", "Passive Friendship"]
+WORDS = ["alpha", "alpine", "beta", "bravo", "charlie", "delta", "deltoid", "echo"]
+
+
+def random_contact(rng, contact_id):
+    contact = {
+        "id": contact_id,
+        "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}",
+        "company": rng.choice(COMPANIES),
+        "state": rng.choice(STATES),
+        "career": rng.choice(CAREERS),
+        "relationship_type": rng.choice(RELATIONSHIPS),
+        "notes": " ".join(rng.sample(WORDS, 2)),
+        "last_contact": f"2024-{rng.randrange(1, 13):02}-{rng.randrange(1, 29):02}",
+    }
+    if rng.random() < 0.5:
+        contact["history"] = [{"date": "2024-01-01", "note": rng.choice(WORDS)}]
+    # The book indexes its contacts as records
+    return Contact(contact)
+
+
+def edited_book(seed, n_contacts=300, n_edits=400):
+    """Yield (contacts by id, event) while contacts are added, changed and deleted at random."""
+    rng = random.Random(seed)
+    by_id = {}
+    next_id = 0
+    for _ in range(n_edits):
+        roll = rng.random()
+        if roll < 0.5 or len(by_id) < n_contacts // 4:
+            contact = random_contact(rng, str(next_id))
+            next_id += 1
+            by_id[contact["id"]] = contact
+            yield by_id, ("add", contact)
+        elif roll < 0.8:
+            contact_id = rng.choice(sorted(by_id))
+            by_id[contact_id] = random_contact(rng, contact_id)
+            yield by_id, ("update", by_id[contact_id])
+        else:
+            contact_id = rng.choice(sorted(by_id))
+            del by_id[contact_id]
+            yield by_id, ("remove", contact_id)
+
+
+def brute_force_search(contacts, query):
+    terms = tokenize(query)
+    matches = []
+    for contact in contacts:
+        text = [contact.get(field) for field in ("name", "email", "company", "tags", "job_title", "city", "notes")]
+        text += [entry.get("note") for entry in contact.get("history") or ()]
+        tokens = {token for value in text for token in tokenize(value)}
+        if all(any(token.startswith(term) for token in tokens) for term in terms):
+            matches.append(contact["id"])
+    return sorted(matches)
+
+
+QUERIES = ["alp", "alpha", "delta bravo", "cobalt", "capital echo", "delta b", "zzz"]
+
+
+def test_search_index_after_updates_and_deletes():
+    index = SearchIndex()
+    for by_id, (op, value) in edited_book(seed=3):
+        if op == "remove":
+            index.remove(value)
+        elif op == "update":
+            index.update(value)
+        else:
+            index.add(value)
+    for query in QUERIES:
+        results = index.search(query)
+        assert sorted(contact["id"] for contact in results) == brute_force_search(by_id.values(), query), query
+        assert all(index.matches(contact["id"], query) for contact in results)
+    assert sorted(index.vocabulary) == index.vocabulary == sorted(index.postings)
+    # One letter matches too much to look up on its own
+    assert not index.can_search("e") and not index.can_search(" a b ")
+    assert index.search("e") == []
+
+
+def test_search_index_ranks_name_matches_first_and_limits():
+    contacts = [
+        Contact(id="1", name="Someone Else", notes="delta"),
+        Contact(id="2", name="Delta Person"),
+        Contact.from_stored({"id": "3", "name": "Other", "history": [{"note": "delta"}]}),
+    ]
+    index = SearchIndex(contacts)
+    assert [contact["id"] for contact in index.search("delta")] == ["2", "1", "3"]
+    assert [contact["id"] for contact in index.search("delta", limit=1)] == ["2"]
+    # Indexing a history note leaves the history itself undecoded
+    assert type(contacts[2].history) is Deferred
+    index.extend([Contact(id="4", name="Delta Two"), Contact(id="1", name="Someone Else")])
+    assert sorted(contact["id"] for contact in index.search("delta")) == ["2", "3", "4"]
+
+
+@pytest.fixture(params=["bitmaps", "numpy"])
+def column_mode(request, monkeypatch):
+    if request.param == "numpy":
+        if columns.np is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(columns, "np", None)
+    return request.param
+
+
+def expected_rows(contacts, **filters):
+    return [contact["id"] for contact in contacts
+            if all(value is None or (contact.get(column) or "") == value for column, value in filters.items())]
+
+
+def test_contact_columns_after_updates_and_deletes(column_mode):
+    table = ContactColumns()
+    for by_id, (op, value) in edited_book(seed=5):
+        if op == "remove":
+            table.remove(value)
+        elif op == "update":
+            table.update(value)
+        else:
+            table.add(value)
+    # Rows come back in insertion order, as the book holds its contacts
+    contacts = sorted(by_id.values(), key=lambda contact: int(contact["id"]))
+    assert len(table) == len(contacts)
+    for state in STATES + [None]:
+        for career in CAREERS + [None]:
+            for company in COMPANIES + [None, "Nobody"]:
+                filters = {"state": state, "career": career, "company": company}
+                mask = table.mask(**filters)
+                selected = [contact["id"] for contact in table.select(mask)]
+                assert selected == expected_rows(contacts, **filters), filters
+                assert table.count(mask) == len(selected)
+    by_type = {}
+    for contact in contacts:
+        by_type[contact["relationship_type"]] = by_type.get(contact["relationship_type"], 0) + 1
+    assert table.count_by("relationship_type", table.mask()) == by_type
+    assert sorted(table.present("company")) == sorted({contact["company"] for contact in contacts})
+
+
+@pytest.mark.parametrize("initial", [0, 30, 100])
+def test_contact_columns_extend_matches_adding_one_by_one(column_mode, monkeypatch, initial):
+    # Small enough that batches take the bulk rebuild until the table outgrows them
+    monkeypatch.setattr(columns, "BULK_EXTEND_ROWS", 20)
+    rng = random.Random(initial)
+    contacts = [random_contact(rng, str(i)) for i in range(initial + 100)]
+    extended = ContactColumns(contacts[:initial])
+    added = ContactColumns(contacts[:initial])
+    for start in range(initial, len(contacts), 40):
+        extended.extend(contacts[start:start + 40])
+        for contact in contacts[start:start + 40]:
+            added.add(contact)
+    # An extend that repeats a contact updates it rather than adding a second row
+    changed = Contact(contacts[0], state="Ohio")
+    extended.extend([changed] + [random_contact(rng, f"new{i}") for i in range(30)])
+    added.update(changed)
+    for contact in extended.records[-30:]:
+        added.add(contact)
+    for state in STATES:
+        for company in COMPANIES:
+            mask = extended.mask(state=state, company=company)
+            assert [contact["id"] for contact in extended.select(mask)] == \
+                [contact["id"] for contact in added.select(added.mask(state=state, company=company))]
+    for column in columns.CATEGORICAL_COLUMNS:
+        assert sorted(extended.present(column)) == sorted(added.present(column))
+
+
+def test_contact_columns_date_range(column_mode):
+    rng = random.Random(2)
+    contacts = [random_contact(rng, str(i)) for i in range(200)]
+    table = ContactColumns(contacts)
+    low, high = date(2024, 3, 1), date(2024, 6, 30)
+    selected = [contact["id"] for contact in table.select(table.mask(contacted_after=low, contacted_before=high))]
+    assert selected == [contact["id"] for contact in contacts
+                        if low.isoformat() <= contact["last_contact"] <= high.isoformat()]
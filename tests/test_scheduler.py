@@ -0,0 +1,111 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core import RELATIONSHIP_TYPES, RELATIONSHIP_TYPE_OPTIONS
+from scheduler import FollowUpScheduler
+
+
+def reference_tasks(contacts, now):
+    """{contact id: (due, task type)} as the Tasks page computed it, one contact at a time, before the scheduler."""
+    stages = list(RELATIONSHIP_TYPES["Lead"]["stages"].keys())
+    tasks = {}
+    for contact in contacts:
+        last_contact = contact.get("last_contact")
+        if not last_contact:
+            continue
+        relationship_type = contact.get("relationship_type", "Passive Friendship")
+        if relationship_type == "Passive Friendship":
+            continue
+        try:
+            last_contact_date = datetime.strptime(last_contact, "%Y-%m-%d")
+        except Exception:
+            continue
+        if relationship_type.startswith("Lead"):
+            for stage in stages:
+                if stage in relationship_type:
+                    current_stage = stage
+                    break
+            else:
+                current_stage = stages[0]
+            tasks[contact["id"]] = (last_contact_date + timedelta(days=7), current_stage)
+        elif relationship_type == "Professional Relationship":
+            next_maintenance = last_contact_date
+            while next_maintenance <= now:
+                next_maintenance += timedelta(days=RELATIONSHIP_TYPES["Professional Relationship"]["maintenance"])
+            tasks[contact["id"]] = (next_maintenance, "Maintenance")
+    return tasks
+
+
+def scheduled_tasks(scheduler, now):
+    return {entry.contact_id: (entry.due, entry.task_type) for entry in scheduler.ordered(now)}
+
+
+def random_contact(rng, contact_id, today):
+    contact = {"id": contact_id, "name": f"Contact {contact_id}",
+               "relationship_type": rng.choice(RELATIONSHIP_TYPE_OPTIONS)}
+    roll = rng.random()
+    if roll < 0.9:
+        contact["last_contact"] = (today - timedelta(days=rng.randrange(-30, 800))).isoformat()
+    elif roll < 0.95:
+        contact["last_contact"] = "not a date"
+    return contact
+
+
+@pytest.fixture
+def contacts():
+    rng = random.Random(7)
+    today = datetime.now().date()
+    return [random_contact(rng, str(i), today) for i in range(2000)]
+
+
+def test_due_dates_match_the_per_contact_loop(contacts):
+    now = datetime.now()
+    scheduler = FollowUpScheduler(RELATIONSHIP_TYPES, contacts)
+    expected = reference_tasks(contacts, now)
+    assert scheduled_tasks(scheduler, now) == expected
+    assert scheduler.overdue_count(now) == sum(1 for due, _ in expected.values() if due < now)
+    # Earliest due first
+    dues = [entry.due for entry in scheduler.ordered(now)]
+    assert dues == sorted(dues)
+
+
+def test_due_dates_match_after_updates_and_removals(contacts):
+    rng = random.Random(11)
+    today = datetime.now().date()
+    scheduler = FollowUpScheduler(RELATIONSHIP_TYPES, contacts)
+    by_id = {contact["id"]: contact for contact in contacts}
+    for contact_id in rng.sample(sorted(by_id), 500):
+        if rng.random() < 0.3:
+            del by_id[contact_id]
+            scheduler.remove(contact_id)
+        else:
+            by_id[contact_id] = random_contact(rng, contact_id, today)
+            scheduler.update(by_id[contact_id])
+    now = datetime.now()
+    assert scheduled_tasks(scheduler, now) == reference_tasks(by_id.values(), now)
+
+
+def test_check_ins_roll_forward_as_they_come_due():
+    now = datetime(2025, 1, 1)
+    contact = {"id": "a", "name": "Ada", "relationship_type": "Professional Relationship", "last_contact": "2024-12-01"}
+    scheduler = FollowUpScheduler(RELATIONSHIP_TYPES)
+    scheduler.update(contact)
+    first_due = scheduler.next_due_date(now)
+    later = first_due + timedelta(days=1)
+    assert scheduled_tasks(scheduler, later) == reference_tasks([contact], later)
+    assert scheduler.next_due_date(later) == first_due + timedelta(days=120)
+    assert scheduler.overdue_count(later) == 0
+
+
+def test_fired_entries_are_taken_once():
+    scheduler = FollowUpScheduler(RELATIONSHIP_TYPES)
+    scheduler.track_fired()
+    scheduler.update({"id": "a", "name": "Ada", "relationship_type": "Lead - First Follow-up",
+                      "last_contact": (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")})
+    assert scheduler.take_fired(datetime.now()) == []
+    later = datetime.now() + timedelta(days=9)
+    assert [entry.contact_id for _, entry in scheduler.take_fired(later)] == ["a"]
+    assert scheduler.take_fired(later) == []
+    assert scheduler.overdue_count(later) == 1
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+
+import pytest
+
+from records import Company, Contact
+from storage import (SNAPSHOT_FORMATS, JournalStore, detect_format, list_backups, read_snapshot, replay,
+                     restore_backup, write_snapshot)
+
+
+def contact(contact_id, name, **fields):
+    return dict(fields, id=contact_id, name=name)
+
+
+def names(contacts):
+    return sorted(record["name"] for record in contacts)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "contacts.json")
+
+
+def open_store(path, **kwargs):
+    kwargs.setdefault("fsync", False)
+    kwargs.setdefault("backups", 0)
+    return JournalStore(path, **kwargs)
+
+
+def test_replay_stops_at_a_torn_last_line(path):
+    write_snapshot(path, [contact("a", "Ada")], [], fsync=False)
+    whole = [
+        json.dumps({"op": "put", "kind": "contacts", "record": contact("b", "Bob")}) + "\n",
+        json.dumps({"op": "delete", "kind": "contacts", "id": "a"}) + "\n",
+    ]
+    torn = json.dumps({"op": "put", "kind": "contacts", "record": contact("c", "Cy")})[:20]
+    with open(path + ".journal", "w") as f:
+        f.write("".join(whole) + torn)
+
+    records_by_kind = {"contacts": {"a": contact("a", "Ada")}, "companies": {}}
+    applied, valid_length = replay(records_by_kind, path + ".journal")
+    assert applied == 2
+    assert valid_length == len("".join(whole).encode())
+    assert list(records_by_kind["contacts"]) == ["b"]
+
+    store = open_store(path)
+    contacts, _ = store.load()
+    assert names(contacts) == ["Bob"]
+    # The torn tail is cut off, so the next entry starts on a line of its own
+    assert os.path.getsize(path + ".journal") == valid_length
+    store.put("contacts", contact("d", "Dee"))
+    store.close()
+    contacts, _ = open_store(path).load()
+    assert names(contacts) == ["Bob", "Dee"]
+
+
+def test_a_journal_line_without_its_newline_is_not_replayed(path):
+    entry = json.dumps({"op": "put", "kind": "contacts", "record": contact("a", "Ada")})
+    with open(path + ".journal", "w") as f:
+        f.write(entry)
+    records_by_kind = {"contacts": {}, "companies": {}}
+    assert replay(records_by_kind, path + ".journal") == (0, 0)
+    assert records_by_kind["contacts"] == {}
+
+
+def test_compaction_while_writes_continue(path):
+    write_snapshot(path, [], [], fsync=False)
+    # Compact on (nearly) every write, so merges overlap the writes that follow them
+    store = open_store(path, compact_fraction=0, compact_min_bytes=1)
+    store.load()
+
+    def write(prefix):
+        for i in range(200):
+            store.put("contacts", contact(f"{prefix}{i}", f"{prefix} {i}", notes="first"))
+            store.put("contacts", contact(f"{prefix}{i}", f"{prefix} {i}", notes="second"))
+            if i % 3 == 0:
+                store.delete("contacts", f"{prefix}{i}")
+
+    threads = [threading.Thread(target=write, args=(prefix,)) for prefix in ("x", "y")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    contacts, _ = open_store(path).load()
+    expected = {f"{prefix}{i}" for prefix in ("x", "y") for i in range(200) if i % 3}
+    assert {record["id"] for record in contacts} == expected
+    assert {record["notes"] for record in contacts} == {"second"}
+
+    # Merging what is left into the snapshot loses nothing either
+    store = open_store(path)
+    store.load()
+    store.compact(wait=True)
+    store.close()
+    assert not os.path.exists(path + ".journal")
+    contacts, _ = read_snapshot(path)
+    assert {record["id"] for record in contacts} == expected
+
+
+def test_an_interrupted_compaction_is_replayed_before_the_journal(path):
+    write_snapshot(path, [contact("a", "Ada")], [], fsync=False)
+    with open(path + ".journal.compacting", "w") as f:
+        f.write(json.dumps({"op": "put", "kind": "contacts", "record": contact("a", "Ada", notes="old")}) + "\n")
+    with open(path + ".journal", "w") as f:
+        f.write(json.dumps({"op": "put", "kind": "contacts", "record": contact("a", "Ada", notes="new")}) + "\n")
+    contacts, _ = open_store(path).load()
+    assert [record["notes"] for record in contacts] == ["new"]
+    assert not os.path.exists(path + ".journal.compacting")
+
+
+@pytest.mark.parametrize("snapshot_format", SNAPSHOT_FORMATS)
+def test_snapshot_formats_are_detected_when_read(path, snapshot_format):
+    contacts = [contact("a", "Ada", history=[{"date": "2024-01-01", "note": "Met"}]), contact("b", "Bob")]
+    companies = [{"id": "c", "name": "Acme"}]
+    write_snapshot(path, contacts, companies, fsync=False, snapshot_format=snapshot_format)
+    assert detect_format(path) == snapshot_format
+    assert read_snapshot(path) == (contacts, companies)
+
+    # A store set to another format reads the file as it is and converts it on the next save
+    other = "jsonl" if snapshot_format == "json" else "json"
+    store = open_store(path, snapshot_format=other)
+    assert store.load() == (contacts, companies)
+    store.write_snapshot(contacts, companies)
+    assert detect_format(path) == other
+    assert read_snapshot(path) == (contacts, companies)
+
+
+def test_legacy_layouts_are_read(path):
+    with open(path, "w") as f:
+        json.dump({"contacts": [contact("a", "Ada")], "companies": ["Acme"]}, f)
+    assert read_snapshot(path) == ([contact("a", "Ada")], [{"name": "Acme"}])
+    with open(path, "w") as f:
+        json.dump([contact("a", "Ada")], f)
+    assert read_snapshot(path) == ([contact("a", "Ada")], [])
+
+
+def test_records_are_written_back_as_they_were_read(path):
+    contacts = [contact("a", "Ada", relationship_level="3", last_contact="2024-01-05", birthday="1/2/1990",
+                        history=[{"date": "2024-01-01", "note": "Met"}], custom="kept"),
+                contact("b", "Bob", relationship_level=4, last_contact="")]
+    write_snapshot(path, contacts, [{"id": "c", "name": "Acme"}], fsync=False)
+    store = open_store(path)
+    loaded, companies = store.load({"contacts": Contact.from_stored, "companies": Company})
+    store.write_snapshot(loaded, companies)
+    store.close()
+    assert read_snapshot(path) == (contacts, [{"id": "c", "name": "Acme"}])
+
+
+@pytest.mark.parametrize("snapshot_format", SNAPSHOT_FORMATS)
+def test_restore_backup(path, snapshot_format):
+    for i in range(3):
+        write_snapshot(path, [contact("a", f"Version {i}")], [], backups=2, fsync=False,
+                       snapshot_format=snapshot_format)
+    assert [generation for generation, _, _ in list_backups(path)] == [1, 2]
+
+    store = open_store(path, snapshot_format=snapshot_format)
+    store.load()
+    store.put("contacts", contact("b", "Journaled"))
+    store.close()
+
+    # Generation 1 is the snapshot as it was last written, generation 2 the one before
+    restore_backup(path, 2, fsync=False)
+    assert not os.path.exists(path + ".journal")
+    contacts, _ = open_store(path).load()
+    assert names(contacts) == ["Version 1"]
+    restore_backup(path, 1, fsync=False)
+    assert names(open_store(path).load()[0]) == ["Version 2"]
+
+    with pytest.raises(FileNotFoundError):
+        restore_backup(path, 3, fsync=False)
@@ -0,0 +1,43 @@
+import errno
+
+from storage import JournalStore
+from writebehind import WriteBehind
+
+
+class TornWrite:
+    """A journal file whose first write stops partway with a full disk."""
+
+    def __init__(self, f, written=15):
+        self.f = f
+        self.written = written
+        self.failed = False
+
+    def write(self, text):
+        if self.failed:
+            return self.f.write(text)
+        self.failed = True
+        self.f.write(text[:self.written])
+        self.f.flush()
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+
+def test_retry_after_a_torn_journal_write_keeps_the_edits(tmp_path):
+    path = str(tmp_path / "contacts.json")
+    store = JournalStore(path, fsync=False, backups=0)
+    store.write_snapshot([], [])
+    store._journal = TornWrite(open(store.journal_path, "a"))
+    writer = WriteBehind(store, window=60)
+    writer.put("contacts", {"id": "a", "name": "Ada"})
+    writer.put("contacts", {"id": "b", "name": "Bob"})
+    assert writer.flush(wait=True) is False
+    assert isinstance(writer.error, OSError)
+    assert writer.flush(wait=True) is True
+    assert writer.error is None
+    writer.close()
+    store.close()
+
+    contacts, _ = JournalStore(path, fsync=False, backups=0).load()
+    assert sorted(contact["name"] for contact in contacts) == ["Ada", "Bob"]
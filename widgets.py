@@ -0,0 +1,309 @@
+import tkinter as tk
+from tkinter import ttk
+from collections.abc import Sequence
+
+
+class MappedRows(Sequence):
+    """Lazy sequence of table rows: row i is row_func(items[i]), computed on access."""
+
+    def __init__(self, items, row_func):
+        self.items = items
+        self.row_func = row_func
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row_func(item) for item in self.items[index]]
+        return self.row_func(self.items[index])
+
+
+class VirtualTreeview(ttk.Treeview):
+    """A Treeview that only materializes the visible window of a row sequence.
+
+    Rows come from ``set_rows`` as any sequence of value tuples (a list, or a
+    MappedRows view over the data). A fixed pool of items, one per visible row
+    plus ``overscan`` extra, is reused as the view scrolls, so opening a table
+    with a million rows costs the same as opening one with fifty.
+
+    Selection is tracked as an index into the row sequence: use
+    ``selected_index()`` instead of ``selection()``/``index()``.
+    ``<<TreeviewSelect>>`` only reaches the caller's bindings when that index
+    actually changes, not when scrolling reuses items.
+    """
+
+    DEFAULT_ROWHEIGHT = 20
+
+    def __init__(self, master=None, overscan=5, **kw):
+        self._yscrollcommand = kw.pop("yscrollcommand", None)
+        super().__init__(master, selectmode="browse", **kw)
+        self.overscan = overscan
+        self._rows = ()
+        self._row_tags = None
+        self._first = 0
+        self._visible = int(kw.get("height", 10))
+        self._slots = []
+        self._selected_index = None
+        # Our bindings run before the widget's own, so they can swallow scroll/selection events
+        tag = self._class_tag = f"VirtualTreeview{id(self)}"
+        self.bindtags((tag,) + self.bindtags())
+        bindings = (
+            ("<<TreeviewSelect>>", self._on_select),
+            ("<Configure>", self._on_configure),
+            ("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1, 3)),
+            ("<Button-4>", lambda e: self._scroll(-1, 3)),
+            ("<Button-5>", lambda e: self._scroll(1, 3)),
+            ("<Up>", lambda e: self._move_selection(-1)),
+            ("<Down>", lambda e: self._move_selection(1)),
+            ("<Prior>", lambda e: self._move_selection(-self._visible)),
+            ("<Next>", lambda e: self._move_selection(self._visible)),
+            ("<Home>", lambda e: self._move_selection(-len(self._rows))),
+            ("<End>", lambda e: self._move_selection(len(self._rows))),
+        )
+        self._class_bindings = [(sequence, self.bind_class(tag, sequence, func)) for sequence, func in bindings]
+
+    def destroy(self):
+        # Class bindings belong to the interpreter, not the widget: without this their
+        # commands (and through them this widget and its rows) would outlive it
+        for sequence, command in self._class_bindings:
+            self.unbind_class(self._class_tag, sequence)
+            self.deletecommand(command)
+        self._class_bindings = []
+        self._rows = ()
+        super().destroy()
+
+    def configure(self, cnf=None, **kw):
+        # The scrollbar tracks the whole row sequence, not the materialized items
+        if "yscrollcommand" in kw:
+            self._yscrollcommand = kw.pop("yscrollcommand")
+            self._update_scrollbar()
+            if not kw and not cnf:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def set_rows(self, rows, row_tags=None, keep_view=False):
+        """Show a new row sequence. row_tags(index) may return the tags for a row.
+
+        With keep_view the scroll position and selected index stay as they
+        were (within the new rows), e.g. for a table refreshed by polling.
+        """
+        self._rows = rows
+        self._row_tags = row_tags
+        if not keep_view:
+            self._selected_index = None
+            self._first = 0
+        elif self._selected_index is not None and self._selected_index >= len(rows):
+            self._selected_index = None
+        self._render()
+
+    def refresh_row(self, index):
+        """Redraw one row in place if it is on screen."""
+        slot = index - self._first
+        if 0 <= slot < len(self._slots):
+            tags = self._row_tags(index) if self._row_tags else ()
+            self.item(self._slots[slot], values=self._rows[index], tags=tags)
+
+    def refresh_visible(self):
+        self._render()
+
+    def rows_inserted(self, index, count=1):
+        """The backing sequence grew by count rows at index; keep the view and selection on the same rows."""
+        if self._selected_index is not None and self._selected_index >= index:
+            self._selected_index += count
+        if index < self._first:
+            self._first += count
+        self._render()
+
+    def rows_deleted(self, index, count=1):
+        """count rows were removed from the backing sequence at index."""
+        if self._selected_index is not None:
+            if index <= self._selected_index < index + count:
+                self._selected_index = None
+            elif self._selected_index >= index + count:
+                self._selected_index -= count
+        if index < self._first:
+            self._first -= min(count, self._first - index)
+        self._render()
+
+    def clear_selection(self):
+        self._selected_index = None
+        self._render()
+
+    def row(self, index):
+        return self._rows[index]
+
+    def row_count(self):
+        return len(self._rows)
+
+    def selected_index(self):
+        return self._selected_index
+
+    def select_index(self, index):
+        """Select a row by index, scrolling it into view and notifying bindings."""
+        self.see_index(index)
+        slot = index - self._first
+        self.selection_set(self._slots[slot])
+        self.focus(self._slots[slot])
+
+    def see_index(self, index):
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + self._visible:
+            self._first = index - self._visible + 1
+        self._render()
+
+    def yview(self, *args):
+        total = len(self._rows)
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            self._first = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self._first += int(args[1]) * step
+        self._render()
+        return None
+
+    def _scroll(self, direction, amount):
+        self._first += direction * amount
+        self._render()
+        return "break"
+
+    def _move_selection(self, delta):
+        if not self._rows:
+            return "break"
+        if self._selected_index is None:
+            index = self._first
+        else:
+            index = max(0, min(len(self._rows) - 1, self._selected_index + delta))
+        self.select_index(index)
+        return "break"
+
+    def _fractions(self):
+        total = len(self._rows)
+        if not total:
+            return 0.0, 1.0
+        return self._first / total, min(1.0, (self._first + self._visible) / total)
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self._fractions())
+
+    def _render(self):
+        total = len(self._rows)
+        self._first = max(0, min(self._first, total - self._visible))
+        window = min(self._visible + self.overscan, total - self._first)
+        while len(self._slots) < window:
+            self._slots.append(super().insert("", tk.END))
+        while len(self._slots) > window:
+            self.delete(self._slots.pop())
+        for slot, iid in enumerate(self._slots):
+            index = self._first + slot
+            tags = self._row_tags(index) if self._row_tags else ()
+            self.item(iid, values=self._rows[index], tags=tags)
+        # Keep the highlighted item in step with the selected row as items are reused
+        slot = None if self._selected_index is None else self._selected_index - self._first
+        target = (self._slots[slot],) if slot is not None and 0 <= slot < window else ()
+        if self.selection() != target:
+            self.selection_set(target)
+        super().yview_moveto(0)
+        self._update_scrollbar()
+
+    def _on_configure(self, event):
+        style = self.cget("style") or "Treeview"
+        try:
+            rowheight = int(ttk.Style(self).lookup(style, "rowheight") or self.DEFAULT_ROWHEIGHT)
+        except (tk.TclError, ValueError):
+            rowheight = self.DEFAULT_ROWHEIGHT
+        # One row's worth of height goes to the headings
+        visible = max(1, event.height // rowheight - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _on_select(self, event):
+        selection = self.selection()
+        if not selection or selection[0] not in self._slots:
+            return "break"
+        index = self._first + self._slots.index(selection[0])
+        if index == self._selected_index:
+            return "break"
+        self._selected_index = index
+        return None
+
+
+class TableController:
+    """Keeps a VirtualTreeview showing a list of records in step with a ChangeFeed.
+
+    The controller owns ``records`` (the rows being shown, in order) and applies
+    each Change with the minimal row operations instead of rebuilding the table.
+    If ``filter`` is set, only records it accepts are kept in the view.
+    """
+
+    def __init__(self, tree, records, row_func, kind, row_tags=None):
+        self.tree = tree
+        self.row_func = row_func
+        self.kind = kind
+        self.row_tags = row_tags
+        self.filter = None
+        self.reset(records)
+
+    def reset(self, records):
+        self.records = records
+        self._positions = None
+        self.tree.set_rows(MappedRows(records, self.row_func), self.row_tags)
+
+    def extend(self, records):
+        """Append records in bulk, e.g. as a large book streams in."""
+        start = len(self.records)
+        self.records.extend(records)
+        self._positions = None
+        self.tree.rows_inserted(start, len(records))
+
+    def selected_record(self):
+        index = self.tree.selected_index()
+        return None if index is None else self.records[index]
+
+    def position(self, record_id):
+        if self._positions is None:
+            self._positions = {record["id"]: i for i, record in enumerate(self.records)}
+        return self._positions.get(record_id)
+
+    def apply(self, change):
+        if change.kind != self.kind:
+            return
+        for record_id in change.deleted:
+            self._remove(record_id)
+        for record in change.updated:
+            if self.filter is not None and not self.filter(record):
+                self._remove(record["id"])
+                continue
+            index = self.position(record["id"])
+            if index is None:
+                self._append(record)
+            else:
+                self.records[index] = record
+                self.tree.refresh_row(index)
+        inserted = [record for record in change.inserted if self.filter is None or self.filter(record)]
+        if len(inserted) == 1:
+            self._append(inserted[0])
+        elif inserted:
+            # A bulk insert (e.g. an import) redraws the table once
+            self.extend(inserted)
+
+    def _remove(self, record_id):
+        index = self.position(record_id)
+        if index is None:
+            return
+        del self.records[index]
+        self._positions = None
+        self.tree.rows_deleted(index)
+
+    def _append(self, record):
+        self.records.append(record)
+        if self._positions is not None:
+            self._positions[record["id"]] = len(self.records) - 1
+        self.tree.rows_inserted(len(self.records) - 1)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+from profiling import TRACER
+
+
+class WriteBehind:
+    """Coalesces store writes and applies them in batches on a background thread.
+
+    put/delete queue the latest operation for each record, so a record edited
+    several times within ``window`` seconds is written once. The first queued
+    operation opens the window; when it closes, everything queued goes to
+    ``store.apply`` as one durable write. flush() writes without waiting for
+    the window and close() flushes and stops the thread. A failed batch stays
+    queued (behind anything newer) and is retried after another window, with
+    the exception kept in ``error`` until a write succeeds.
+    """
+
+    def __init__(self, store, window=0.5):
+        self.store = store
+        self.window = window
+        self.error = None
+        self._pending = {}
+        self._writing = 0
+        self._opened = None
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def put(self, kind, record):
+        # Copied now, so edits made to the record after this call wait for their own put
+        self._queue(kind, record["id"], ("put", kind, record.copy()))
+
+    def delete(self, kind, record_id):
+        self._queue(kind, record_id, ("delete", kind, record_id))
+
+    def _queue(self, kind, record_id, op):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind queue is closed")
+            if not self._pending:
+                self._opened = time.monotonic()
+            self._pending[(kind, record_id)] = op
+            self._cond.notify_all()
+
+    def pending(self):
+        """Number of queued or in-flight record writes."""
+        with self._cond:
+            return len(self._pending) + self._writing
+
+    def flush(self, wait=False):
+        """Write everything queued now. With wait, block until it is written
+        (or has failed) and return True if nothing is left unwritten."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            if not wait:
+                return not (self._pending or self._writing)
+            while (self._pending or self._writing) and self._flush_requested:
+                self._cond.wait()
+            return not (self._pending or self._writing)
+
+    def close(self):
+        """Flush and stop the writer thread. Returns True if everything was written."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        return not self._pending
+
+    def _run(self):
+        with self._cond:
+            while True:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                while not (self._flush_requested or self._closed):
+                    remaining = self._opened + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, {}
+                self._writing = len(batch)
+                self._cond.release()
+                try:
+                    with TRACER.span("write-behind batch", records=len(batch)):
+                        self.store.apply(list(batch.values()))
+                    error = None
+                except Exception as e:
+                    error = e
+                finally:
+                    self._cond.acquire()
+                self._writing = 0
+                self.error = error
+                if error is not None:
+                    # Anything queued since the batch was taken is newer and wins
+                    for key, op in batch.items():
+                        self._pending.setdefault(key, op)
+                    self._opened = time.monotonic()
+                    if self._closed:
+                        self._cond.notify_all()
+                        return
+                if not self._pending or error is not None:
+                    self._flush_requested = False
+                self._cond.notify_all()